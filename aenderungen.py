@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# aenderungen.py
+
+# Importiere notwendige Module und Klassen
+import argparse  # Für Kommandozeilenargumente
+import contextlib  # Für die Umleitung der Lade-Meldungen auf stderr
+import os  # Für das atomare Ersetzen der Datenstand-Datei
+import pickle  # Für das Speichern des Datenstands
+import sys  # Für die Ausgabe auf stdout und stderr
+import pandas as pd  # Für die vektorisierten Zeilen-Hashes
+
+# Schlüsselspalte je Tabelle; alle Zeilen mit demselben Schlüssel werden zu einem Hash zusammengefasst
+SCHLUESSEL = {
+    "modul.csv": "modul_code",
+    "modulbuchung.csv": "student_code",
+    "semester.csv": "semester_code",
+    "semester_modul.csv": "semester_code",
+    "student.csv": "student_code",
+    "student_studiengang.csv": "student_code",
+    "studiengang.csv": "studiengang_code",
+    "studiengang_semester.csv": "studiengang_code"
+}
+
+# Tabellen, deren Zeilenreihenfolge über die Schlüssel hinweg in die Ausgabe eingeht
+# (die offenen Module werden in der Reihenfolge von modul.csv angezeigt)
+REIHENFOLGE_RELEVANT = ["modul.csv"]
+
+# Version des Datenstand-Formats; bei Änderungen an der Hash-Berechnung erhöhen
+DATENSTAND_FORMAT = 1
+
+
+def schluessel_hashes(data: pd.DataFrame, spalte: str, reihenfolge: bool = True):
+    """
+    Berechnet je Schlüssel einen Hash über alle Zeilen mit diesem Schlüssel. Der Zeilen-Hash umfasst alle Spalten
+    und, falls gewünscht, die Position der Zeile unter den Zeilen desselben Schlüssels. Die Zeilen-Hashes eines
+    Schlüssels werden modulo 2**64 addiert, die Reihenfolge verschiedener Schlüssel spielt daher keine Rolle.
+
+    :param data: Die Tabelle.
+    :param spalte: Schlüsselspalte.
+    :param reihenfolge: Ob die Reihenfolge der Zeilen innerhalb eines Schlüssels in den Hash eingeht.
+    :return: Pandas Series Schlüssel -> Hash (uint64); Zeilen ohne Schlüssel werden übergangen.
+    """
+    if reihenfolge:
+        data = data.assign(_rang=data.groupby(spalte, sort=False, dropna=False).cumcount())
+    zeilen = pd.util.hash_pandas_object(data, index=False)
+    return zeilen.groupby(data[spalte], sort=False).sum()
+
+
+def notenverteilung_hashes(modulbuchung_data: pd.DataFrame):
+    """
+    Berechnet je Modul einen Hash über alle vergebenen Noten. Ändert er sich, ändern sich die Perzentile
+    der Noten dieses Moduls (siehe Modulstatistik) bei allen Studenten, die das Modul abgeschlossen haben.
+
+    :param modulbuchung_data: DataFrame aus modulbuchung.csv.
+    :return: Pandas Series modul_code -> Hash (uint64).
+    """
+    bewertet = modulbuchung_data.loc[modulbuchung_data["note"].notna(), ["modul_code", "note"]]
+    return schluessel_hashes(bewertet, "modul_code", reihenfolge=False)
+
+
+def _geaendert(alt: pd.Series, neu: pd.Series):
+    """
+    Vergleicht die Hashes zweier Datenstände einer Tabelle.
+
+    :param alt: Hashes des früheren Datenstands (None, falls die Tabelle fehlte).
+    :param neu: Hashes des aktuellen Datenstands (None, falls die Tabelle fehlt).
+    :return: Menge der Schlüssel, die hinzugekommen, entfallen oder verändert sind.
+    """
+    if alt is None or neu is None:
+        vorhanden = alt if alt is not None else neu
+        return set(vorhanden.index.tolist()) if vorhanden is not None else set()
+    gemeinsam = alt.index.intersection(neu.index)
+    verschieden = alt.loc[gemeinsam].to_numpy() != neu.loc[gemeinsam].to_numpy()
+    return set(alt.index.difference(neu.index).tolist()) | set(neu.index.difference(alt.index).tolist()) \
+        | set(gemeinsam[verschieden].tolist())
+
+
+def _gleiche_reihenfolge(alt: list, neu: list):
+    """
+    Prüft, ob die Zeilen, deren Schlüssel in beiden Datenständen vorkommen, in derselben Reihenfolge stehen.
+    Neue oder entfallene Schlüssel verschieben die übrigen nicht.
+
+    :param alt: Schlüssel des früheren Datenstands in Zeilenreihenfolge (None, falls die Tabelle fehlte).
+    :param neu: Schlüssel des aktuellen Datenstands in Zeilenreihenfolge (None, falls die Tabelle fehlt).
+    :return: True, falls die gemeinsamen Schlüssel gleich angeordnet sind.
+    """
+    if alt is None or neu is None:
+        return True
+    alte_schluessel, neue_schluessel = set(alt), set(neu)
+    return [s for s in alt if s in neue_schluessel] == [s for s in neu if s in alte_schluessel]
+
+
+class Datenstand:
+    """
+    Momentaufnahme der geladenen Tabellen als Hash je Schlüssel (siehe SCHLUESSEL). Zwei Datenstände lassen sich
+    vergleichen, ohne die Tabellen selbst aufzubewahren; aus den geänderten Schlüsseln ermittelt
+    betroffene_studenten die Studenten, deren Dashboard-Daten neu berechnet werden müssen.
+    """
+    def __init__(self, data: dict):
+        """
+        Berechnet die Hashes aller Tabellen.
+
+        :param data: Dictionary mit den geladenen CSV-Daten (z. B. von DBZugriff.read_data).
+        """
+        self.format = DATENSTAND_FORMAT
+
+        # Dateiname -> Series Schlüssel -> Hash
+        self.hashes = {}
+        # Dateiname -> Schlüssel in Zeilenreihenfolge (nur für REIHENFOLGE_RELEVANT)
+        self.reihenfolge = {}
+        for file_name, spalte in SCHLUESSEL.items():
+            tabelle = data.get(file_name)
+            if tabelle is None or spalte not in tabelle.columns:
+                continue
+            self.hashes[file_name] = schluessel_hashes(tabelle, spalte)
+            if file_name in REIHENFOLGE_RELEVANT:
+                self.reihenfolge[file_name] = tabelle[spalte].dropna().tolist()
+
+        # modul_code -> Hash der vergebenen Noten
+        modulbuchung = data.get("modulbuchung.csv")
+        self.notenverteilung = notenverteilung_hashes(modulbuchung) \
+            if modulbuchung is not None and {"modul_code", "note"} <= set(modulbuchung.columns) else None
+
+    def geaenderte_schluessel(self, alt=None):
+        """
+        Vergleicht diesen Datenstand mit einem früheren.
+
+        :param alt: Früherer Datenstand oder None; ohne früheren Datenstand gelten alle Schlüssel als geändert.
+        :return: Dictionary Dateiname -> Menge geänderter Schlüssel, zusätzlich "notenverteilung" -> Menge
+                 der Module, deren Notenverteilung sich geändert hat.
+        """
+        geaendert = {}
+        for file_name in SCHLUESSEL:
+            alte_hashes = alt.hashes.get(file_name) if alt is not None else None
+            neue_hashes = self.hashes.get(file_name)
+            if file_name in REIHENFOLGE_RELEVANT and alt is not None \
+                    and not _gleiche_reihenfolge(alt.reihenfolge.get(file_name), self.reihenfolge.get(file_name)):
+                # Geänderte Reihenfolge: alle Schlüssel beider Stände gelten als geändert
+                geaendert[file_name] = _geaendert(None, alte_hashes) | _geaendert(None, neue_hashes)
+            else:
+                geaendert[file_name] = _geaendert(alte_hashes, neue_hashes)
+        geaendert["notenverteilung"] = _geaendert(alt.notenverteilung if alt is not None else None, self.notenverteilung)
+        return geaendert
+
+    def speichern(self, pfad: str):
+        """
+        Schreibt den Datenstand atomar (temporäre Datei und Umbenennen). Gespeichert werden nur die Attribute,
+        damit die Datei unabhängig davon lesbar bleibt, ob das Modul importiert oder direkt ausgeführt wurde.
+
+        :param pfad: Zieldatei.
+        """
+        try:
+            with open(pfad + ".tmp", "wb") as datei:
+                pickle.dump(vars(self), datei, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(pfad + ".tmp", pfad)
+        except Exception as e:
+            print(f"Datenstand konnte nicht nach {pfad} geschrieben werden: {e}")
+
+    @staticmethod
+    def laden(pfad: str):
+        """
+        Liest einen gespeicherten Datenstand.
+
+        :param pfad: Datei des Datenstands.
+        :return: Datenstand oder None, falls die Datei fehlt, unbrauchbar ist oder ein anderes Format hat.
+        """
+        try:
+            with open(pfad, "rb") as datei:
+                attribute = pickle.load(datei)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Datenstand {pfad} ist unbrauchbar und wird ignoriert: {e}")
+            return None
+        if not isinstance(attribute, dict) or attribute.get("format") != DATENSTAND_FORMAT:
+            print(f"Datenstand {pfad} hat ein veraltetes Format und wird ignoriert.")
+            return None
+        # Ohne erneute Hash-Berechnung aus den gespeicherten Attributen aufbauen
+        datenstand = Datenstand.__new__(Datenstand)
+        datenstand.__dict__.update(attribute)
+        return datenstand
+
+
+def _werte(data: dict, file_name: str, spalte: str, filter_spalte: str, schluessel: set):
+    """
+    Gibt die Werte einer Spalte in allen Zeilen zurück, deren Filterspalte einen der Schlüssel enthält.
+
+    :param data: Dictionary mit den geladenen CSV-Daten.
+    :param file_name: Dateiname der Tabelle.
+    :param spalte: Spalte, deren Werte geliefert werden.
+    :param filter_spalte: Spalte, die mit den Schlüsseln verglichen wird.
+    :param schluessel: Menge der gesuchten Schlüssel.
+    :return: Menge der gefundenen Werte.
+    """
+    tabelle = data.get(file_name)
+    if not schluessel or tabelle is None:
+        return set()
+    return set(tabelle.loc[tabelle[filter_spalte].isin(list(schluessel)), spalte].dropna().tolist())
+
+
+def betroffene_studenten(data: dict, geaendert: dict, notenverteilung: bool = True):
+    """
+    Ermittelt aus den geänderten Schlüsseln alle Studenten, deren Dashboard-Daten sich geändert haben können.
+    Änderungen am Lehrplan (modul, semester_modul, semester, studiengang_semester, studiengang) werden über die
+    aktuellen Zuordnungen bis zu den Studenten der betroffenen Studiengänge verfolgt. Zuordnungen, die sich selbst
+    geändert haben, sind bereits über ihren eigenen Schlüssel erfasst.
+
+    :param data: Dictionary mit den aktuellen CSV-Daten.
+    :param geaendert: Ergebnis von Datenstand.geaenderte_schluessel.
+    :param notenverteilung: Ob auch Studenten erfasst werden, deren Perzentile sich durch neue Noten anderer
+                            Studenten im selben Modul verschieben.
+    :return: Menge der Studenten-Codes (auch solcher, die nicht mehr existieren).
+    """
+    studenten = geaendert["student.csv"] | geaendert["student_studiengang.csv"] | geaendert["modulbuchung.csv"]
+
+    # Geänderte Module betreffen alle, die sie gebucht haben, und alle Lehrpläne, die sie enthalten
+    module = geaendert["modul.csv"]
+    studenten |= _werte(data, "modulbuchung.csv", "student_code", "modul_code", module)
+    semester = geaendert["semester.csv"] | geaendert["semester_modul.csv"] \
+        | _werte(data, "semester_modul.csv", "semester_code", "modul_code", module)
+    studiengaenge = geaendert["studiengang.csv"] | geaendert["studiengang_semester.csv"] \
+        | _werte(data, "studiengang_semester.csv", "studiengang_code", "semester_code", semester)
+    studenten |= _werte(data, "student_studiengang.csv", "student_code", "studiengang_code", studiengaenge)
+
+    # Perzentile werden nur für abgeschlossene Module angezeigt
+    modulbuchung = data.get("modulbuchung.csv")
+    if notenverteilung and geaendert["notenverteilung"] and modulbuchung is not None:
+        treffer = modulbuchung["modul_code"].isin(list(geaendert["notenverteilung"])) & modulbuchung["bestanden"]
+        studenten |= set(modulbuchung.loc[treffer, "student_code"].dropna().tolist())
+    return studenten
+
+
+def aenderungen_ermitteln(data: dict, alt: Datenstand = None, notenverteilung: bool = True):
+    """
+    Berechnet den aktuellen Datenstand und die seit einem früheren Datenstand betroffenen Studenten.
+
+    :param data: Dictionary mit den aktuellen CSV-Daten.
+    :param alt: Früherer Datenstand oder None (dann sind alle Studenten betroffen).
+    :param notenverteilung: Siehe betroffene_studenten.
+    :return: Tupel (Menge der betroffenen Studenten-Codes, aktueller Datenstand).
+    """
+    neu = Datenstand(data)
+    return betroffene_studenten(data, neu.geaenderte_schluessel(alt), notenverteilung), neu
+
+
+# Gibt die betroffenen Studenten aus, wenn die Datei direkt ausgeführt wird
+if __name__ == "__main__":
+    from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+    from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+
+    parser = argparse.ArgumentParser(description="Ermittelt die seit dem letzten Datenstand betroffenen Studenten")
+    parser.add_argument("datenstand", help="Datei des früheren Datenstands (fehlt sie, sind alle Studenten betroffen)")
+    parser.add_argument("--speichern", action="store_true", help="Aktuellen Datenstand anschließend in die Datei schreiben")
+    parser.add_argument("--ohne-notenverteilung", action="store_true",
+                        help="Verschobene Perzentile durch neue Noten anderer Studenten nicht berücksichtigen")
+    args = parser.parse_args()
+
+    # Meldungen beim Laden gehören nicht in die Ausgabe der Codes
+    with contextlib.redirect_stdout(sys.stderr):
+        data = DBZugriff(CSVZugriff()).read_data()
+        betroffene, datenstand = aenderungen_ermitteln(data, Datenstand.laden(args.datenstand),
+                                                       notenverteilung=not args.ohne_notenverteilung)
+    for student_code in sorted(betroffene):
+        print(student_code)
+    print(f"{len(betroffene)} betroffene Studenten", file=sys.stderr)
+    if args.speichern:
+        datenstand.speichern(args.datenstand)
@@ -0,0 +1,696 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# aequivalenz.py
+
+# Importiere notwendige Module und Klassen
+import argparse  # Für die Kommandozeilenparameter
+import contextlib  # Zum Unterdrücken der Debug-Ausgaben während der Vergleiche
+import io  # Puffer für die unterdrückten Ausgaben
+import json  # Für die Prüfung der exportierten JSON-Zeilen
+import os  # Für Dateipfade
+import shutil  # Für die Kopie des Datenbestands
+import subprocess  # Für den Aufruf des Exports als eigener Prozess
+import sys  # Für den Python-Interpreter des Exports
+import tempfile  # Für das Verzeichnis des erzeugten Datenbestands
+import time  # Für die Zeitmessung
+import numpy as np  # Für die Zufallsdaten
+import pandas as pd  # Für Datenverarbeitung
+from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe (optimierter Pfad)
+from student import Student  # Kennzahlen über das Objektmodell
+from dashboarddaten import dashboard_viewmodel, _zeilen, SEMESTER_FELDER  # Kennzahlen und Semesterdaten des Dashboards
+
+# Spalten der Modullisten, wie sie die Abfragen zurückgeben
+MODUL_SPALTEN = ["modul_code", "modul_name", "credits", "tutor", "pruefungsform"]
+
+
+# Student, der Buchungen hat, aber nicht in student.csv steht
+UNBEKANNTER_STUDENT = "77777"
+
+
+def student_codes_ziehen(rng, anzahl_studenten: int):
+    """
+    Zieht eindeutige, fünf- oder mehrstellige Studentencodes mit führenden Nullen. Der Wertebereich wächst
+    mit der Anzahl der Studenten, damit auch Datenbestände mit 100 000 und mehr Studenten erzeugt werden können.
+    Der Code des unbekannten Studenten wird nie vergeben.
+
+    :param rng: Zufallsgenerator (numpy.random.Generator).
+    :param anzahl_studenten: Anzahl der Codes.
+    :return: Liste der Studentencodes als Zeichenketten.
+    """
+    nummern = np.arange(1, max(100000, 2 * anzahl_studenten + 2))
+    nummern = nummern[nummern != int(UNBEKANNTER_STUDENT)]
+    return [f"{nummer:05d}" for nummer in rng.choice(nummern, anzahl_studenten, replace=False)]
+
+
+def datensatz_erzeugen(verzeichnis: str, anzahl_studenten: int = 300, seed: int = 0):
+    """
+    Erzeugt einen zufälligen, in sich stimmigen Datenbestand im Format der acht CSV-Dateien.
+    Enthalten sind gezielt Randfälle: Studenten ohne Studiengang, ohne Buchungen und ohne Namen,
+    Wiederholungsprüfungen, Buchungen unbekannter Module und von Studenten, die nicht in student.csv
+    stehen, ein doppelt vergebener Modulkode, ein Studiengang ohne Semester, Semester ohne Module
+    und Codes mit führenden Nullen. Buchungen unbekannter Module sind nie bestanden, da die Credits
+    des Studenten dafür auch in der Referenz nicht definiert sind.
+
+    :param verzeichnis: Zielverzeichnis (wird bei Bedarf angelegt).
+    :param anzahl_studenten: Anzahl der Studenten in student.csv.
+    :param seed: Startwert des Zufallsgenerators; gleicher Seed ergibt den gleichen Datenbestand.
+    :return: Dictionary mit den geschriebenen DataFrames je Dateiname.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(verzeichnis, exist_ok=True)
+
+    # Module, darunter ein Code mit führender Null und eine Dublette mit abweichenden Credits
+    anzahl_module = 40
+    modul_codes = ["0815"] + [str(100 + 7 * nummer) for nummer in range(1, anzahl_module)]
+    modul = pd.DataFrame({
+        "modul_code": modul_codes,
+        "modul_name": [f"Modul {code}" for code in modul_codes],
+        "tutor": rng.choice(["Karl Müller", "Anna Schmidt", "Eva Weber", "Jonas Wolf"], anzahl_module),
+        "pruefungsform": rng.choice(["Klausur", "Hausarbeit", "Portfolio", "Fallstudie", "Projektbericht"], anzahl_module),
+        "credits": rng.choice([5, 5, 5, 10], anzahl_module)
+    })
+    modul = pd.concat([modul, modul.iloc[[5]].assign(modul_name="Dublette", credits=10)], ignore_index=True)
+
+    # Studiengänge: "3" hat keine Semester
+    studiengang = pd.DataFrame({
+        "studiengang_code": ["1", "2", "3"],
+        "studiengang_name": ["Informatik", "Data Science", "Ohne Lehrplan"],
+        "benötigte_credits": [180, 120, 90],
+        "anzahl_semester": [6, 4, 3]
+    })
+
+    # Plansemester je Studiengang mit 0 bis 6 Modulen; Module können in mehreren Studiengängen vorkommen
+    semester_zeilen, studiengang_semester_zeilen, semester_modul_zeilen = [], [], []
+    for studiengang_code, anzahl in (("1", 6), ("2", 4)):
+        for nummer in range(1, anzahl + 1):
+            semester_code = f"PS{studiengang_code}_{nummer}"
+            semester_zeilen.append((semester_code, f"Plansemester {studiengang_code}.{nummer}"))
+            studiengang_semester_zeilen.append((studiengang_code, semester_code))
+            anzahl_semester_module = 0 if nummer == 2 else int(rng.integers(1, 7))
+            for modul_code in rng.choice(modul_codes, anzahl_semester_module, replace=False):
+                semester_modul_zeilen.append((semester_code, modul_code))
+    # Zuordnung eines unbekannten Moduls und ein Semester, das keinem Studiengang angehört
+    semester_modul_zeilen.append(("PS1_1", "9999"))
+    semester_zeilen.append(("PSX", "Ohne Studiengang"))
+    semester = pd.DataFrame(semester_zeilen, columns=["semester_code", "semester_name"])
+    studiengang_semester = pd.DataFrame(studiengang_semester_zeilen, columns=["studiengang_code", "semester_code"])
+    semester_modul = pd.DataFrame(semester_modul_zeilen, columns=["semester_code", "modul_code"])
+
+    # Studenten mit gelegentlich fehlendem Namen, Startdatum oder fehlender Zielnote
+    student_codes = student_codes_ziehen(rng, anzahl_studenten)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, anzahl_studenten), unit="D")
+    student = pd.DataFrame({
+        "student_code": student_codes,
+        "student_name": pd.Series([f"Student {code}" for code in student_codes], dtype=object)
+                          .where(rng.random(anzahl_studenten) > 0.03, None),
+        "start_studium": pd.Series(start).where(rng.random(anzahl_studenten) > 0.03),
+        "zielnote": pd.Series(rng.choice([1.3, 1.7, 2.0, 2.3, 3.0], anzahl_studenten))
+                      .where(rng.random(anzahl_studenten) > 0.05)
+    })
+
+    # Zuordnung zum Studiengang; etwa 8 % der Studenten haben keinen Studiengang
+    zuordnung = rng.random(anzahl_studenten)
+    student_studiengang = pd.DataFrame({
+        "student_code": [code for code, wert in zip(student_codes, zuordnung) if wert > 0.08],
+        "studiengang_code": rng.choice(["1", "1", "2", "3"], int((zuordnung > 0.08).sum()))
+    })
+
+    # Buchungen: etwa 10 % der Studenten ohne Buchung, sonst 1 bis 15 Module mit Wiederholungsprüfungen
+    buchungen = []
+    buchungsnummer = 0
+    buchende = [code for code in student_codes if rng.random() > 0.1] + [UNBEKANNTER_STUDENT]
+    for student_code in buchende:
+        for modul_code in rng.choice(modul_codes, int(rng.integers(1, 16)), replace=False):
+            versuche = 1 + int(rng.random() < 0.2)
+            for versuch in range(1, versuche + 1):
+                buchungsnummer += int(rng.integers(1, 4))
+                buchungsdatum = pd.Timestamp("2021-01-01") + pd.Timedelta(days=int(rng.integers(0, 1200)))
+                abgeschlossen = versuch < versuche or rng.random() < 0.7
+                bestanden = abgeschlossen and versuch == versuche and rng.random() < 0.9
+                note = float(rng.choice([1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0])) if bestanden else \
+                    (5.0 if abgeschlossen else np.nan)
+                buchungen.append((buchungsnummer, buchungsdatum,
+                                  "Bewertung abgeschlossen" if abgeschlossen else "offen",
+                                  versuch if abgeschlossen else 0,
+                                  buchungsdatum + pd.Timedelta(days=60), note, bestanden, modul_code, student_code))
+        if rng.random() < 0.05:
+            # Buchung eines unbekannten Moduls (nicht bestanden)
+            buchungsnummer += 1
+            buchungen.append((buchungsnummer, pd.Timestamp("2024-02-27"), "offen", 0, pd.NaT, np.nan, False,
+                              "4711", student_code))
+    modulbuchung = pd.DataFrame(buchungen, columns=["buchungsnummer", "buchungsdatum", "status", "pruefungsversuch",
+                                                   "pruefungsdatum", "note", "bestanden", "modul_code", "student_code"])
+    # Buchungen stehen in den Quelldateien nicht nach Buchungsnummer sortiert
+    modulbuchung = modulbuchung.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    tabellen = {
+        "modul.csv": modul,
+        "modulbuchung.csv": modulbuchung,
+        "semester.csv": semester,
+        "semester_modul.csv": semester_modul,
+        "student.csv": student,
+        "student_studiengang.csv": student_studiengang,
+        "studiengang.csv": studiengang,
+        "studiengang_semester.csv": studiengang_semester
+    }
+    csv_zugriff = CSVZugriff(data_dir=verzeichnis)
+    for file_name, data in tabellen.items():
+        csv_zugriff.write_table(file_name, data)
+    return tabellen
+
+
+class Referenz:
+    """
+    Referenzimplementierung der Abfragen, Kennzahlen und Semesterdaten in ihrer ursprünglichen, direkten
+    Form: boolesche Masken über die vollständigen Tabellen, pandas-Merges und zeilenweise Schleifen ohne
+    Indizes oder Caches. Optimierte Pfade müssen für jeden Datenbestand genau dieselben Ergebnisse liefern.
+    """
+    def __init__(self, data: dict):
+        """
+        Initialisiert die Referenz mit bereits geladenen Tabellen.
+
+        :param data: Dictionary mit den DataFrames je Dateiname.
+        """
+        self.data = data
+
+    def get_student(self, student_code: str):
+        student_data = self.data["student.csv"]
+        return student_data[student_data["student_code"] == student_code]
+
+    def get_studiengang(self, student_code: str):
+        return self.data["studiengang.csv"]
+
+    def get_modul(self, modul_code: str):
+        modul_data = self.data["modul.csv"]
+        modul_row = modul_data[modul_data["modul_code"] == modul_code]
+        return modul_row if not modul_row.empty else pd.DataFrame()
+
+    def get_modulbuchung(self, student_code: str):
+        modulbuchung_data = self.data["modulbuchung.csv"]
+        return modulbuchung_data[modulbuchung_data["student_code"] == student_code]
+
+    def get_semester(self, semester_code=None):
+        semester_data = self.data["semester.csv"]
+        if semester_code is None:
+            return semester_data
+        return semester_data[semester_data["semester_code"] == semester_code]
+
+    def get_semester_modul(self, semester_code: str):
+        semester_modul_data = self.data["semester_modul.csv"]
+        return semester_modul_data[semester_modul_data["semester_code"] == semester_code]
+
+    def get_student_studiengang(self, student_code: str):
+        student_studiengang_data = self.data["student_studiengang.csv"]
+        return student_studiengang_data[student_studiengang_data["student_code"] == student_code]
+
+    def get_studiengang_semester(self, studiengang_code: str):
+        studiengang_semester_data = self.data["studiengang_semester.csv"]
+        return studiengang_semester_data[studiengang_semester_data["studiengang_code"] == studiengang_code]
+
+    def get_completed_modules(self, student_code: str):
+        modulbuchung_data = self.data["modulbuchung.csv"]
+        completed_modules = modulbuchung_data[(modulbuchung_data["student_code"] == student_code) &
+                                              (modulbuchung_data["bestanden"] == True)]
+        details = completed_modules.merge(self.data["modul.csv"], on="modul_code", how="left")
+        return details[MODUL_SPALTEN + ["note"]]
+
+    def get_booked_but_not_completed_modules(self, student_code: str):
+        modulbuchung_data = self.data["modulbuchung.csv"]
+        booked_modules = modulbuchung_data[(modulbuchung_data["student_code"] == student_code) &
+                                           (modulbuchung_data["bestanden"] == False)]
+        details = booked_modules.merge(self.data["modul.csv"], on="modul_code", how="left")
+        return details[MODUL_SPALTEN]
+
+    def get_modules_not_booked_yet(self, student_code: str):
+        studiengang_code = self.get_student_studiengang(student_code)["studiengang_code"]
+        if studiengang_code.empty:
+            return None
+        semester_codes = self.get_studiengang_semester(studiengang_code.iloc[0])["semester_code"]
+        if semester_codes.empty:
+            return None
+        semester_modul_data = self.data["semester_modul.csv"]
+        all_modules = semester_modul_data[semester_modul_data["semester_code"].isin(semester_codes)]["modul_code"].unique()
+        booked_modules = self.get_modulbuchung(student_code)["modul_code"].unique()
+        not_booked_modules = [modul_code for modul_code in all_modules if modul_code not in booked_modules]
+        modul_data = self.data["modul.csv"]
+        return modul_data[modul_data["modul_code"].isin(not_booked_modules)][MODUL_SPALTEN]
+
+    def _studiengang_code(self, student_code: str):
+        """
+        :return: Code des (ersten) Studiengangs des Studenten oder None.
+        """
+        studiengang = self.get_student_studiengang(student_code)
+        return studiengang.iloc[0]["studiengang_code"] if not studiengang.empty else None
+
+    def get_credits_per_semester(self, student_code: str):
+        """
+        Credits je Plansemester wie im ursprünglichen Diagramm: Semester für Semester und Modul für Modul
+        über einzelne Abfragen summiert.
+
+        :return: Pandas DataFrame mit semester_name, gesamt_credits, bestandene_credits oder None.
+        """
+        studiengang_code = self._studiengang_code(student_code)
+        if studiengang_code is None:
+            return None
+        studiengang_semester_data = self.get_studiengang_semester(studiengang_code)
+        if studiengang_semester_data.empty:
+            return None
+        completed_modules = self.get_completed_modules(student_code)
+        if completed_modules.empty:
+            return None
+
+        semester_total_credits, semester_completed_credits = {}, {}
+        for _, semester_row in studiengang_semester_data.iterrows():
+            semester_code = semester_row["semester_code"]
+            semester_data = self.get_semester(semester_code)
+            semester_name = semester_data.iloc[0]["semester_name"] if not semester_data.empty else f"Semester {semester_code}"
+            total_credits, completed_credits = 0, 0
+            for _, module_row in self.get_semester_modul(semester_code).iterrows():
+                modul_data = self.get_modul(module_row["modul_code"])
+                if not modul_data.empty:
+                    credits = modul_data.iloc[0]["credits"]
+                    total_credits += credits
+                    if module_row["modul_code"] in completed_modules["modul_code"].values:
+                        completed_credits += credits
+            semester_total_credits[semester_name] = total_credits
+            semester_completed_credits[semester_name] = completed_credits
+
+        semesters = list(semester_total_credits.keys())
+        return pd.DataFrame({
+            "semester_name": semesters,
+            "gesamt_credits": [semester_total_credits[sem] for sem in semesters],
+            "bestandene_credits": [semester_completed_credits[sem] for sem in semesters]
+        })
+
+    def kennzahlen(self, student_code: str):
+        """
+        Kennzahlen wie im Objektmodell (Student): Credits und Noten der bestandenen Buchungen, die Credits
+        je Buchung aus der ersten Zeile des Moduls.
+
+        :return: Dictionary mit total_credits, average_grade und missing_credits oder None.
+        """
+        if self.get_student(student_code).empty:
+            return None
+        buchungen = self.get_modulbuchung(student_code)
+        bestanden = buchungen[buchungen["bestanden"] == True]
+        total_credits = sum(self.get_modul(modul_code).iloc[0]["credits"] for modul_code in bestanden["modul_code"])
+        noten = bestanden["note"].tolist()
+        average_grade = sum(noten) / len(noten) if noten else None
+
+        required_credits = 0
+        studiengang_code = self._studiengang_code(student_code)
+        if studiengang_code is not None:
+            studiengang_data = self.data["studiengang.csv"]
+            studiengang_row = studiengang_data[studiengang_data["studiengang_code"] == studiengang_code].iloc[0]
+            required_credits = studiengang_row["benötigte_credits"]
+        return {"total_credits": total_credits, "average_grade": average_grade,
+                "missing_credits": required_credits - total_credits}
+
+    def dashboard_kennzahlen(self, student_code: str):
+        """
+        Kennzahlen und Semesterdaten des Dashboards: Summen über die abgeschlossenen Module (inklusive
+        mehrfacher Treffer des Merges), Durchschnitt auf zwei Stellen gerundet.
+
+        :return: Tupel (erreichte_credits, notendurchschnitt, fehlende_credits, credits_pro_semester) oder None.
+        """
+        if self.get_student(student_code).empty:
+            return None
+        completed_modules = self.get_completed_modules(student_code)
+        erreichte_credits, notendurchschnitt = 0, None
+        if not completed_modules.empty:
+            erreichte_credits = completed_modules["credits"].sum().item()
+            notendurchschnitt = round(completed_modules["note"].mean(), 2).item()
+        erforderliche_credits = 0
+        studiengang_code = self._studiengang_code(student_code)
+        if studiengang_code is not None:
+            studiengang_data = self.data["studiengang.csv"]
+            studiengang_data = studiengang_data[studiengang_data["studiengang_code"] == studiengang_code]
+            if not studiengang_data.empty:
+                erforderliche_credits = studiengang_data.iloc[0]["benötigte_credits"].item()
+        return (erreichte_credits, notendurchschnitt, erforderliche_credits - erreichte_credits,
+                _zeilen(self.get_credits_per_semester(student_code), SEMESTER_FELDER))
+
+
+def _optimierte_kennzahlen(dbhandler: DBZugriff, student_code: str):
+    """
+    Kennzahlen über Student.aus_datenbank (optimierter Pfad zu Referenz.kennzahlen).
+    """
+    student = Student.aus_datenbank(dbhandler, student_code)
+    if student is None:
+        return None
+    return {"total_credits": student.calculate_total_credits(), "average_grade": student.calculate_average_grade(),
+            "missing_credits": student.calculate_missing_credits()}
+
+
+def _optimierte_dashboard_kennzahlen(dbhandler: DBZugriff, student_code: str):
+    """
+    Kennzahlen und Semesterdaten über das DashboardViewModel (optimierter Pfad zu Referenz.dashboard_kennzahlen).
+    """
+    viewmodel = dashboard_viewmodel(dbhandler, student_code)
+    if viewmodel is None:
+        return None
+    return (viewmodel.erreichte_credits, viewmodel.notendurchschnitt, viewmodel.fehlende_credits,
+            viewmodel.credits_pro_semester)
+
+
+def _ausfuehren(funktion, argument):
+    """
+    Führt eine Abfrage aus und misst ihre Laufzeit; Ausnahmen gelten als Ergebnis (Typ der Ausnahme).
+
+    :return: Tupel ((Art, Wert), Sekunden) mit Art "wert" oder "fehler".
+    """
+    start = time.perf_counter()
+    try:
+        ergebnis = ("wert", funktion(argument))
+    except Exception as e:
+        ergebnis = ("fehler", type(e).__name__)
+    return ergebnis, time.perf_counter() - start
+
+
+def _gleich(referenz, optimiert):
+    """
+    Vergleicht zwei Python-Werte exakt (None und NaN werden unterschieden, NumPy- und Python-Zahlen nicht).
+    """
+    if isinstance(referenz, dict) and isinstance(optimiert, dict):
+        return referenz.keys() == optimiert.keys() and all(_gleich(referenz[k], optimiert[k]) for k in referenz)
+    if isinstance(referenz, (list, tuple)) and isinstance(optimiert, (list, tuple)):
+        return len(referenz) == len(optimiert) and all(_gleich(a, b) for a, b in zip(referenz, optimiert))
+    if referenz is None or optimiert is None:
+        return referenz is None and optimiert is None
+    if isinstance(referenz, pd.DataFrame) or isinstance(optimiert, pd.DataFrame):
+        return False
+    return bool(referenz == optimiert) or bool(pd.isna(referenz) and pd.isna(optimiert))
+
+
+def unterschied(referenz, optimiert):
+    """
+    Beschreibt den Unterschied zweier Abfrageergebnisse. DataFrames müssen in Werten, Spaltentypen,
+    Spaltenreihenfolge und Index übereinstimmen.
+
+    :param referenz: Ergebnis der Referenz als Tupel (Art, Wert) aus _ausfuehren.
+    :param optimiert: Ergebnis des optimierten Pfads als Tupel (Art, Wert).
+    :return: Beschreibung des Unterschieds oder None, falls beide Ergebnisse gleich sind.
+    """
+    if referenz[0] != optimiert[0]:
+        return f"Referenz: {referenz[0]} {referenz[1] if referenz[0] == 'fehler' else ''}, " \
+               f"optimiert: {optimiert[0]} {optimiert[1] if optimiert[0] == 'fehler' else ''}"
+    a, b = referenz[1], optimiert[1]
+    if isinstance(a, pd.DataFrame) and isinstance(b, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(a, b, check_exact=True, obj="Ergebnis")
+            return None
+        except AssertionError as e:
+            return " ".join(str(e).split())
+    return None if _gleich(a, b) else f"Referenz: {a!r}, optimiert: {b!r}"
+
+
+def vergleichen(referenz: Referenz, dbhandler: DBZugriff, max_beispiele: int = 3):
+    """
+    Führt alle Abfragen auf der Referenz und auf dem optimierten Pfad aus, vergleicht jedes Ergebnis
+    und summiert die Laufzeiten je Abfrage (beim optimierten Pfad inklusive Aufbau der Indizes und Caches).
+
+    :param referenz: Referenz auf den Tabellen des Datenbestands.
+    :param dbhandler: Instanz von DBZugriff auf demselben Datenbestand.
+    :param max_beispiele: Anzahl der gemeldeten Abweichungen je Abfrage.
+    :return: Liste von Dictionaries mit abfrage, aufrufe, abweichungen, beispiele, zeit_referenz und zeit_optimiert.
+    """
+    data = referenz.data
+    student_codes = list(data["student.csv"]["student_code"]) + [UNBEKANNTER_STUDENT, "unbekannt"]
+    modul_codes = list(dict.fromkeys(data["modul.csv"]["modul_code"])) + ["4711", "9999"]
+    semester_codes = list(data["semester.csv"]["semester_code"]) + ["PS9_9"]
+    studiengang_codes = list(data["studiengang.csv"]["studiengang_code"]) + ["0"]
+
+    abfragen = [
+        ("get_student", student_codes, referenz.get_student, dbhandler.get_student),
+        ("get_studiengang", student_codes[:3], referenz.get_studiengang, dbhandler.get_studiengang),
+        ("get_modul", modul_codes, referenz.get_modul, dbhandler.get_modul),
+        ("get_modulbuchung", student_codes, referenz.get_modulbuchung, dbhandler.get_modulbuchung),
+        ("get_semester", [None] + semester_codes, referenz.get_semester, dbhandler.get_semester),
+        ("get_semester_modul", semester_codes, referenz.get_semester_modul, dbhandler.get_semester_modul),
+        ("get_student_studiengang", student_codes, referenz.get_student_studiengang, dbhandler.get_student_studiengang),
+        ("get_studiengang_semester", studiengang_codes, referenz.get_studiengang_semester,
+         dbhandler.get_studiengang_semester),
+        ("get_completed_modules", student_codes, referenz.get_completed_modules, dbhandler.get_completed_modules),
+        ("get_booked_but_not_completed_modules", student_codes, referenz.get_booked_but_not_completed_modules,
+         dbhandler.get_booked_but_not_completed_modules),
+        ("get_modules_not_booked_yet", student_codes, referenz.get_modules_not_booked_yet,
+         dbhandler.get_modules_not_booked_yet),
+        ("get_credits_per_semester", student_codes, referenz.get_credits_per_semester,
+         dbhandler.get_credits_per_semester),
+        ("Student-Kennzahlen", student_codes, referenz.kennzahlen,
+         lambda student_code: _optimierte_kennzahlen(dbhandler, student_code)),
+        ("Dashboard-Kennzahlen", student_codes, referenz.dashboard_kennzahlen,
+         lambda student_code: _optimierte_dashboard_kennzahlen(dbhandler, student_code)),
+    ]
+
+    ergebnisse = []
+    for name, argumente, referenz_funktion, optimierte_funktion in abfragen:
+        eintrag = {"abfrage": name, "aufrufe": len(argumente), "abweichungen": 0, "beispiele": [],
+                   "zeit_referenz": 0.0, "zeit_optimiert": 0.0}
+        for argument in argumente:
+            # Die Debug-Ausgaben beider Pfade werden verworfen
+            with contextlib.redirect_stdout(io.StringIO()):
+                erwartet, zeit_referenz = _ausfuehren(referenz_funktion, argument)
+                erhalten, zeit_optimiert = _ausfuehren(optimierte_funktion, argument)
+            eintrag["zeit_referenz"] += zeit_referenz
+            eintrag["zeit_optimiert"] += zeit_optimiert
+            beschreibung = unterschied(erwartet, erhalten)
+            if beschreibung is not None:
+                eintrag["abweichungen"] += 1
+                if len(eintrag["beispiele"]) < max_beispiele:
+                    eintrag["beispiele"].append(f"{argument!r}: {beschreibung}")
+        ergebnisse.append(eintrag)
+    return ergebnisse
+
+
+def tabellen_vergleichen(verzeichnis: str):
+    """
+    Vergleicht die eingelesenen Tabellen der optimierten Leseroute (pyarrow, falls installiert) mit der
+    C-Engine von pandas als Referenz.
+
+    :param verzeichnis: Verzeichnis des Datenbestands.
+    :return: Dictionary mit referenz (Tabellen der C-Engine), zeit_referenz, zeit_optimiert und
+             abweichungen (Dateiname -> Beschreibung).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        erwartet = CSVZugriff(engine="c", data_dir=verzeichnis).read_data()
+        zeit_referenz = time.perf_counter() - start
+        start = time.perf_counter()
+        erhalten = CSVZugriff(data_dir=verzeichnis).read_data()
+        zeit_optimiert = time.perf_counter() - start
+    abweichungen = {}
+    for file_name, data in erwartet.items():
+        beschreibung = unterschied(("wert", data), ("wert", erhalten.get(file_name)))
+        if beschreibung is not None:
+            abweichungen[file_name] = beschreibung
+    return {"referenz": erwartet, "zeit_referenz": zeit_referenz, "zeit_optimiert": zeit_optimiert,
+            "abweichungen": abweichungen}
+
+
+def schreibvorgaenge_ausfuehren(dbhandler: DBZugriff, anzahl: int, seed: int = 0):
+    """
+    Führt zufällige Buchungen, Prüfungsversuche und Noten über die Schreib-API aus und committet sie,
+    sodass Indizes, Fremdschlüssel und Caches inkrementell angepasst werden.
+
+    :param dbhandler: Instanz von DBZugriff mit geladenen Daten.
+    :param anzahl: Anzahl der Schreibvorgänge.
+    :param seed: Startwert des Zufallsgenerators.
+    """
+    rng = np.random.default_rng(seed + 1)
+    data = dbhandler.read_data()
+    student_codes = list(data["student.csv"]["student_code"])
+    modul_codes = list(dict.fromkeys(data["modul.csv"]["modul_code"]))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(anzahl):
+            student_code = student_codes[int(rng.integers(len(student_codes)))]
+            modul_code = modul_codes[int(rng.integers(len(modul_codes)))]
+            aktion = rng.random()
+            if aktion < 0.4:
+                dbhandler.modul_buchen(student_code, modul_code)
+            elif aktion < 0.6:
+                dbhandler.pruefungsversuch_erfassen(student_code, modul_code)
+            else:
+                note = float(rng.choice([1.0, 1.7, 2.3, 3.0, 4.0, 5.0]))
+                dbhandler.note_erfassen(student_code, modul_code, note)
+        dbhandler.commit()
+
+
+def journal_nachspielen_pruefen(verzeichnis: str):
+    """
+    Prüft, dass das Nachspielen des Journals nach einer unterbrochenen Kompaktierung (modulbuchung.csv ist
+    geschrieben, das Journal noch nicht geleert) den geschriebenen Stand nicht verändert. Dazu wird ein
+    Modul bewertet und danach erneut gebucht, sodass die Note nur über ihre Buchungsnummer richtig zugeordnet wird.
+
+    :param verzeichnis: Verzeichnis des Datenbestands; geprüft wird auf einer Kopie.
+    :return: Beschreibung der Abweichung oder None.
+    """
+    with tempfile.TemporaryDirectory() as kopie:
+        for datei_name in os.listdir(verzeichnis):
+            if datei_name.endswith(".csv"):
+                shutil.copy(os.path.join(verzeichnis, datei_name), kopie)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dbhandler = DBZugriff(kopie)
+            data = dbhandler.read_data()
+            student_code = data["student.csv"]["student_code"].iat[0]
+            modul_code = data["modul.csv"]["modul_code"].iat[0]
+            dbhandler.modul_buchen(student_code, modul_code)
+            dbhandler.pruefungsversuch_erfassen(student_code, modul_code)
+            dbhandler.note_erfassen(student_code, modul_code, 1.3)
+            dbhandler.modul_buchen(student_code, modul_code)
+            dbhandler.commit()
+
+            # Abbruch der Kompaktierung nach dem Schreiben der Tabelle, vor dem Leeren des Journals
+            dbhandler.db_handler.write_table("modulbuchung.csv", dbhandler.data["modulbuchung.csv"])
+            erwartet = CSVZugriff(data_dir=kopie).read_data()["modulbuchung.csv"]
+            nachgespielt = DBZugriff(kopie).read_data()["modulbuchung.csv"]
+    return unterschied(("wert", erwartet), ("wert", nachgespielt))
+
+
+def export_pruefen(verzeichnis: str):
+    """
+    Startet den Export (export.py) im Datenverzeichnis und prüft, dass jede Zeile auf stdout gültiges JSON ist.
+
+    :param verzeichnis: Verzeichnis des Datenbestands.
+    :return: Tupel (Anzahl der Zeilen, Liste der Beanstandungen).
+    """
+    skript = os.path.join(os.path.dirname(os.path.abspath(__file__)), "export.py")
+    ergebnis = subprocess.run([sys.executable, skript], cwd=verzeichnis, capture_output=True, text=True, encoding="utf-8")
+    zeilen = ergebnis.stdout.splitlines()
+    beanstandungen = []
+    for zeile in zeilen:
+        try:
+            json.loads(zeile)
+        except json.JSONDecodeError:
+            beanstandungen.append(f"Keine JSON-Zeile: {zeile[:80]!r}")
+    if ergebnis.returncode:
+        beanstandungen.append(f"Exit-Code {ergebnis.returncode}: {ergebnis.stderr.strip()[-200:]}")
+    return len(zeilen), beanstandungen
+
+
+def bericht_ausgeben(ergebnisse: list):
+    """
+    Gibt je Abfrage Anzahl der Aufrufe, Abweichungen, Laufzeiten und Beschleunigung aus.
+
+    :param ergebnisse: Liste aus vergleichen.
+    :return: Gesamtzahl der Abweichungen.
+    """
+    print(f"{'Abfrage':<38} {'Aufrufe':>8} {'Abw.':>5} {'Referenz':>10} {'Optimiert':>10} {'Faktor':>8}")
+    for eintrag in ergebnisse:
+        faktor = eintrag["zeit_referenz"] / eintrag["zeit_optimiert"] if eintrag["zeit_optimiert"] else float("inf")
+        print(f"{eintrag['abfrage']:<38} {eintrag['aufrufe']:>8} {eintrag['abweichungen']:>5} "
+              f"{eintrag['zeit_referenz']:>9.3f}s {eintrag['zeit_optimiert']:>9.3f}s {faktor:>7.1f}x")
+        for beispiel in eintrag["beispiele"]:
+            print(f"    {beispiel}")
+    return sum(eintrag["abweichungen"] for eintrag in ergebnisse)
+
+
+def zu_langsam(ergebnisse: list, mindestfaktor: float, mindestzeit: float = 0.01):
+    """
+    Ermittelt die Abfragen, deren Beschleunigung unter dem geforderten Faktor liegt. Abfragen, deren
+    Referenz insgesamt kürzer als mindestzeit läuft, werden nicht bewertet, da dort der einmalige Aufbau
+    der Indizes und die Messungenauigkeit überwiegen.
+
+    :param ergebnisse: Liste aus vergleichen.
+    :param mindestfaktor: Geforderte Beschleunigung (Referenz / optimiert), z. B. 1.0.
+    :param mindestzeit: Mindestlaufzeit der Referenz in Sekunden, ab der eine Abfrage bewertet wird.
+    :return: Liste von Tupeln (abfrage, faktor).
+    """
+    langsam = []
+    for eintrag in ergebnisse:
+        if eintrag["zeit_referenz"] < mindestzeit:
+            continue
+        faktor = eintrag["zeit_referenz"] / eintrag["zeit_optimiert"] if eintrag["zeit_optimiert"] else float("inf")
+        if faktor < mindestfaktor:
+            langsam.append((eintrag["abfrage"], faktor))
+    return langsam
+
+
+def langsame_ausgeben(ergebnisse: list, mindestfaktor: float):
+    """
+    Gibt die Abfragen unter dem geforderten Faktor aus.
+
+    :param ergebnisse: Liste aus vergleichen.
+    :param mindestfaktor: Geforderte Beschleunigung.
+    :return: Anzahl der zu langsamen Abfragen.
+    """
+    langsam = zu_langsam(ergebnisse, mindestfaktor)
+    for abfrage, faktor in langsam:
+        print(f"    Zu langsam: {abfrage} mit {faktor:.1f}x (gefordert {mindestfaktor:.1f}x)")
+    return len(langsam)
+
+
+# Vergleich über mehrere zufällige Datenbestände
+if __name__ == "__main__":
+    """
+    Erzeugt je Seed einen zufälligen Datenbestand, vergleicht die eingelesenen Tabellen und alle Abfragen
+    zwischen Referenz und optimiertem Pfad, danach erneut nach zufälligen Schreibvorgängen. Außerdem werden
+    die JSON-Zeilen des Exports und das Nachspielen des Journals nach einer unterbrochenen Kompaktierung geprüft.
+    Der Exit-Code ist 1, falls eine Abweichung gefunden wurde, und 2, falls eine Abfrage langsamer als
+    mit dem Mindestfaktor beschleunigt ist.
+    """
+    parser = argparse.ArgumentParser(description="Äquivalenztest der optimierten Datenpfade gegen die Referenz.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2], help="Startwerte der Datenbestände")
+    parser.add_argument("--studenten", type=int, default=100, help="Anzahl der Studenten je Datenbestand")
+    parser.add_argument("--schreibvorgaenge", type=int, default=200, help="Zufällige Schreibvorgänge je Datenbestand")
+    parser.add_argument("--verzeichnis", default=None, help="Verzeichnis für die Datenbestände (Standard: temporär)")
+    parser.add_argument("--mindestfaktor", type=float, default=1.0,
+                        help="Geforderte Beschleunigung je Abfrage (0 schaltet die Prüfung ab)")
+    args = parser.parse_args()
+
+    abweichungen = 0
+    langsame = 0
+    with tempfile.TemporaryDirectory() as temporaer:
+        for seed in args.seeds:
+            verzeichnis = os.path.join(args.verzeichnis or temporaer, f"seed_{seed}")
+            datensatz_erzeugen(verzeichnis, args.studenten, seed)
+            # Ein zurückgebliebenes Journal eines früheren Laufs gehört nicht zum erzeugten Bestand
+            journal_pfad = os.path.join(verzeichnis, "modulbuchung.journal")
+            if os.path.exists(journal_pfad):
+                os.remove(journal_pfad)
+
+            print(f"\n=== Seed {seed}: {args.studenten} Studenten ({verzeichnis}) ===")
+            tabellen = tabellen_vergleichen(verzeichnis)
+            print(f"Einlesen: Referenz {tabellen['zeit_referenz']:.3f}s, optimiert {tabellen['zeit_optimiert']:.3f}s")
+            for file_name, beschreibung in tabellen["abweichungen"].items():
+                print(f"    {file_name}: {beschreibung}")
+            abweichungen += len(tabellen["abweichungen"])
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                dbhandler = DBZugriff(verzeichnis)
+                dbhandler.read_data()
+            ergebnisse = vergleichen(Referenz(tabellen["referenz"]), dbhandler)
+            abweichungen += bericht_ausgeben(ergebnisse)
+            langsame += langsame_ausgeben(ergebnisse, args.mindestfaktor)
+
+            anzahl_zeilen, beanstandungen = export_pruefen(verzeichnis)
+            print(f"Export: {anzahl_zeilen} Zeilen auf stdout, {len(beanstandungen)} Beanstandungen")
+            for beanstandung in beanstandungen[:3]:
+                print(f"    {beanstandung}")
+            abweichungen += len(beanstandungen)
+
+            beschreibung = journal_nachspielen_pruefen(verzeichnis)
+            print(f"Journal nach unterbrochener Kompaktierung: {'gleich' if beschreibung is None else beschreibung}")
+            abweichungen += beschreibung is not None
+
+            if args.schreibvorgaenge:
+                schreibvorgaenge_ausfuehren(dbhandler, args.schreibvorgaenge, seed)
+                print(f"--- nach {args.schreibvorgaenge} Schreibvorgängen ---")
+                # Die Referenz rechnet auf einer Kopie der fortgeschriebenen Tabellen ohne Indizes und Caches
+                referenz = Referenz({file_name: data.copy() for file_name, data in dbhandler.read_data().items()})
+                ergebnisse = vergleichen(referenz, dbhandler)
+                abweichungen += bericht_ausgeben(ergebnisse)
+                langsame += langsame_ausgeben(ergebnisse, args.mindestfaktor)
+
+    print(f"\n{'Keine Abweichungen.' if not abweichungen else f'{abweichungen} Abweichungen gefunden.'}")
+    if langsame:
+        print(f"{langsame} Abfragen unter dem Mindestfaktor {args.mindestfaktor:.1f}x.")
+    raise SystemExit(1 if abweichungen else 2 if langsame else 0)
+
+
+# In[ ]:
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# apiserver.py
+
+# Importiere notwendige Module und Klassen
+import argparse  # Für Kommandozeilenargumente
+import asyncio  # Für den nebenläufigen HTTP-Server
+import hashlib  # Für die Berechnung der ETags
+import json  # Für die JSON-Antworten
+from collections import OrderedDict  # Für den begrenzten Antwort-Cache
+from urllib.parse import unquote, urlsplit  # Für das Zerlegen der Anfrage-URL
+from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+from dashboarddaten import TEILE, dashboard_daten, json_wert  # Dashboard-Daten als JSON-taugliche Dictionaries
+from speicher import Speicherbudget, Speicherprofil  # Speicherbedarf und Speicherbudget
+from datenbestaende import Datenbestaende  # Mehrere Datenbestände mit LRU-Verdrängung
+from ranglisten import RANGLISTEN  # Namen der abrufbaren Ranglisten
+
+# HTTP-Statustexte der verwendeten Statuscodes
+STATUS_TEXTE = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+
+# Pfade, die der Server selbst bedient; sie können nicht als Name eines Datenbestands verwendet werden
+RESERVIERTE_NAMEN = ("speicher",)
+
+
+class DashboardServer:
+    """
+    Asyncio-basierter HTTP-Server, der die Dashboard-Daten als JSON bereitstellt.
+    Alle Anfragen teilen sich einen im Speicher geladenen Datenbestand. Antworten werden
+    je Pfad und Datenversion zwischengespeichert und mit ETags versehen. Mit einer Datenbestaende-Verwaltung
+    bedient der Server mehrere Datenbestände; den Pfaden wird dann der Name des Bestands vorangestellt
+    (z. B. /<bestand>/studenten/<student_code>). Die Namen in RESERVIERTE_NAMEN sind dafür nicht zulässig.
+
+    Endpunkte:
+    - GET /status
+    - GET /studenten/<student_code>
+    - GET /studenten/<student_code>/<teil> mit teil aus info, module, pruefungsformen, credits, noten
+    - GET /ranglisten/<name> und /ranglisten/<name>/<k> mit name aus beste_studenten, rueckstaendige_studenten,
+      schwierigste_module (Standard: k = 10)
+    - GET /speicher (Speicherbedarf je Bereich, mit Profil auch die größten Allokationsstellen; nicht zwischengespeichert)
+    """
+    def __init__(self, dbhandler: DBZugriff = None, max_cache_eintraege: int = 10000, speicherbudget: Speicherbudget = None,
+                 speicherprofil: Speicherprofil = None, pruef_intervall: int = 1000, datenbestaende: Datenbestaende = None):
+        """
+        Initialisiert den Server mit einem DBZugriff-Objekt oder einer Verwaltung mehrerer Datenbestände.
+
+        :param dbhandler: Instanz von DBZugriff; die Daten werden einmalig geladen.
+        :param max_cache_eintraege: Maximale Anzahl zwischengespeicherter Antworten.
+        :param speicherbudget: Optionales Speicherbudget, das alle pruef_intervall neu berechneten Antworten geprüft wird
+                               (bei mehreren Beständen gilt stattdessen das Budget der Datenbestaende-Verwaltung).
+        :param speicherprofil: Optionales (gestartetes) tracemalloc-Profil für den Endpunkt /speicher.
+        :param pruef_intervall: Anzahl neu berechneter Antworten zwischen zwei Budgetprüfungen.
+        :param datenbestaende: Optionale Verwaltung mehrerer Datenbestände (anstelle von dbhandler).
+        """
+        self.dbhandler = dbhandler
+        self.datenbestaende = datenbestaende
+        if self.datenbestaende is not None:
+            reserviert = [name for name in self.datenbestaende.namen() if name in RESERVIERTE_NAMEN]
+            if reserviert:
+                raise ValueError(f"Reservierte Namen für Datenbestände: {', '.join(reserviert)}")
+        if self.dbhandler is not None:
+            self.dbhandler.read_data()
+        self.max_cache_eintraege = max_cache_eintraege
+        self.speicherbudget = speicherbudget
+        self.speicherprofil = speicherprofil
+        self.pruef_intervall = pruef_intervall
+        self.berechnete_antworten = 0
+
+        # Antwort-Cache: Pfad -> (Datenversion bzw. Version des Bestands, Statuscode, ETag, Body)
+        self.cache = OrderedDict()
+
+    def antwort_erzeugen(self, pfad: str):
+        """
+        Erzeugt Statuscode, ETag und JSON-Body für einen Pfad, bevorzugt aus dem Cache.
+
+        :param pfad: Der angefragte Pfad (ohne Query-String).
+        :return: Tupel (Statuscode, ETag, Body als Bytes).
+        """
+        if pfad.strip("/") == "speicher":
+            body = json.dumps(self.speicherbericht(), default=json_wert, ensure_ascii=False).encode("utf-8")
+            return 200, None, body
+
+        dbhandler, version, bestand_pfad = self.bestand(pfad)
+        if dbhandler is None:
+            body = json.dumps({"fehler": f"Unbekannter Datenbestand in {pfad}."}, ensure_ascii=False).encode("utf-8")
+            return 404, None, body
+
+        eintrag = self.cache.get(pfad)
+        if eintrag is not None and eintrag[0] == version:
+            self.cache.move_to_end(pfad)
+            return eintrag[1:]
+
+        status, inhalt = self.route(bestand_pfad, dbhandler)
+        body = json.dumps(inhalt, default=json_wert, ensure_ascii=False).encode("utf-8")
+        etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+
+        self.cache[pfad] = (version, status, etag, body)
+        self.cache.move_to_end(pfad)
+        if len(self.cache) > self.max_cache_eintraege:
+            self.cache.popitem(last=False)
+
+        self.berechnete_antworten += 1
+        if self.berechnete_antworten % self.pruef_intervall == 0:
+            self.speicher_pruefen()
+        return status, etag, body
+
+    def speicher_pruefen(self):
+        """
+        Prüft den Speicherbedarf. Mit einem Datenbestand wird das Speicherbudget des Servers geprüft; mit mehreren
+        Beständen werden gemäß der Verwaltung die am längsten nicht genutzten Bestände verworfen (ihre Caches
+        wachsen auch nach dem Laden) und die zwischengespeicherten Antworten verworfener Bestände entfernt.
+        """
+        if self.dbhandler is not None:
+            if self.speicherbudget is not None:
+                self.speicherbudget.pruefen(self.dbhandler, weitere={"antworten": self.cache})
+            return
+
+        self.datenbestaende.einhalten()
+        veraltet = [pfad for pfad, eintrag in self.cache.items() if eintrag[0] != self.bestand_version(pfad)]
+        for pfad in veraltet:
+            del self.cache[pfad]
+
+    def bestand_version(self, pfad: str):
+        """
+        Gibt die Versionskennung des Bestands eines Pfads zurück, ohne ihn zu laden.
+
+        :param pfad: Der angefragte Pfad (mit dem Namen des Bestands).
+        :return: Versionskennung oder None, falls der Bestand nicht geladen ist.
+        """
+        return self.datenbestaende.version(unquote(pfad.strip("/").partition("/")[0]))
+
+    def bestand(self, pfad: str):
+        """
+        Ermittelt den für einen Pfad zuständigen Datenbestand. Mit mehreren Beständen bestimmt der erste
+        Pfadbestandteil den Bestand, der bei Bedarf geladen wird.
+
+        :param pfad: Der angefragte Pfad.
+        :return: Tupel (DBZugriff oder None für unbekannte Bestände, Versionskennung, Pfad innerhalb des Bestands).
+        """
+        if self.datenbestaende is None:
+            return self.dbhandler, self.dbhandler.data_version, pfad
+        name, _, rest = pfad.strip("/").partition("/")
+        name = unquote(name)
+        dbhandler = self.datenbestaende.get(name)
+        if dbhandler is None:
+            return None, None, pfad
+        return dbhandler, self.datenbestaende.version(name), "/" + rest
+
+    def speicherbericht(self):
+        """
+        Erstellt den Bericht für den Endpunkt /speicher.
+
+        :return: Dictionary mit Bytes je Bereich, dem Budget und (mit Profil) dem tracemalloc-Schnappschuss.
+        """
+        if self.dbhandler is not None:
+            bericht = {"bereiche": Speicherbudget.messen(self.dbhandler, weitere={"antworten": self.cache})}
+        else:
+            bericht = {"datenbestaende": self.datenbestaende.speicherbericht()}
+        if self.speicherbudget is not None:
+            bericht["budget"] = {"bytes": self.speicherbudget.limit, "modus": self.speicherbudget.modus}
+        if self.speicherprofil is not None:
+            bericht["tracemalloc"] = self.speicherprofil.schnappschuss()
+        return bericht
+
+    def route(self, pfad: str, dbhandler: DBZugriff = None):
+        """
+        Ordnet einen Pfad dem passenden Endpunkt zu und berechnet dessen Inhalt.
+
+        :param pfad: Der angefragte Pfad (bei mehreren Beständen ohne den Namen des Bestands).
+        :param dbhandler: Der zuständige DBZugriff (Standard: der DBZugriff des Servers).
+        :return: Tupel (Statuscode, JSON-tauglicher Inhalt).
+        """
+        dbhandler = dbhandler if dbhandler is not None else self.dbhandler
+        teile = [unquote(teil) for teil in pfad.strip("/").split("/") if teil]
+
+        if teile == ["status"]:
+            return 200, {"data_version": dbhandler.data_version}
+
+        if len(teile) in (2, 3) and teile[0] == "studenten":
+            teil = teile[2] if len(teile) == 3 else None
+            if teil is not None and teil not in TEILE:
+                return 404, {"fehler": f"Unbekannter Bereich {teil}."}
+            daten = dashboard_daten(dbhandler, teile[1], teil)
+            if daten is None:
+                return 404, {"fehler": f"Kein Student mit dem Code {teile[1]} gefunden."}
+            return 200, daten
+
+        if len(teile) in (2, 3) and teile[0] == "ranglisten":
+            if teile[1] not in RANGLISTEN:
+                return 404, {"fehler": f"Unbekannte Rangliste {teile[1]}."}
+            if len(teile) == 3 and not (teile[2].isdigit() and int(teile[2]) > 0):
+                return 404, {"fehler": f"Ungültige Anzahl {teile[2]}."}
+            k = int(teile[2]) if len(teile) == 3 else 10
+            return 200, dbhandler.get_ranglisten().rangliste(teile[1], k)
+
+        return 404, {"fehler": f"Unbekannter Pfad {pfad}."}
+
+    async def verbindung_bearbeiten(self, reader, writer):
+        """
+        Bearbeitet eine Client-Verbindung; mehrere Anfragen pro Verbindung (Keep-Alive) werden unterstützt.
+
+        :param reader: asyncio.StreamReader der Verbindung.
+        :param writer: asyncio.StreamWriter der Verbindung.
+        """
+        try:
+            while True:
+                anfragezeile = await reader.readline()
+                if not anfragezeile:
+                    break
+
+                # Header bis zur Leerzeile einlesen
+                header = {}
+                while True:
+                    zeile = await reader.readline()
+                    if zeile in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, wert = zeile.decode("latin-1").partition(":")
+                    header[name.strip().lower()] = wert.strip()
+
+                try:
+                    methode, ziel, version = anfragezeile.decode("latin-1").split()
+                except ValueError:
+                    self.senden(writer, 400, None, '{"fehler": "Ungültige Anfrage."}'.encode("utf-8"), False)
+                    break
+
+                keep_alive = header.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+
+                # Einen Anfrage-Body vor der Antwort verwerfen, damit er nicht als nächste Anfrage gelesen wird.
+                # Bodies ohne Content-Length (chunked) werden nicht gelesen, die Verbindung wird danach geschlossen.
+                try:
+                    body_laenge = int(header.get("content-length", "0"))
+                except ValueError:
+                    body_laenge = -1
+                if body_laenge < 0:
+                    self.senden(writer, 400, None, '{"fehler": "Ungültige Content-Length."}'.encode("utf-8"), False)
+                    break
+                await self.body_verwerfen(reader, body_laenge)
+                if "transfer-encoding" in header:
+                    keep_alive = False
+
+                if methode not in ("GET", "HEAD"):
+                    self.senden(writer, 405, None, '{"fehler": "Nur GET wird unterstützt."}'.encode("utf-8"), keep_alive)
+                else:
+                    try:
+                        status, etag, body = self.antwort_erzeugen(urlsplit(ziel).path)
+                    except Exception as e:
+                        # Ein Fehler bei einer Anfrage beendet nicht die Verbindung ohne Antwort
+                        print(f"Fehler bei der Bearbeitung von {ziel}: {e}")
+                        status, etag, body = 500, None, '{"fehler": "Interner Fehler."}'.encode("utf-8")
+                    if status == 200 and header.get("if-none-match") == etag:
+                        self.senden(writer, 304, etag, b"", keep_alive)
+                    else:
+                        self.senden(writer, status, etag, b"" if methode == "HEAD" else body, keep_alive, len(body))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def body_verwerfen(reader, laenge: int):
+        """
+        Liest einen Anfrage-Body der angegebenen Länge blockweise und verwirft ihn.
+
+        :param reader: asyncio.StreamReader der Verbindung.
+        :param laenge: Länge des Bodies in Bytes (Content-Length).
+        """
+        while laenge > 0:
+            block = await reader.read(min(laenge, 1 << 16))
+            if not block:
+                raise asyncio.IncompleteReadError(b"", laenge)
+            laenge -= len(block)
+
+    @staticmethod
+    def senden(writer, status: int, etag, body: bytes, keep_alive: bool, laenge: int = None):
+        """
+        Schreibt eine HTTP-Antwort in den Ausgabepuffer der Verbindung.
+
+        :param writer: asyncio.StreamWriter der Verbindung.
+        :param status: HTTP-Statuscode.
+        :param etag: ETag der Antwort oder None.
+        :param body: Antwortinhalt als Bytes.
+        :param keep_alive: Ob die Verbindung offen bleiben soll.
+        :param laenge: Content-Length, falls abweichend von len(body) (z. B. bei HEAD).
+        """
+        kopf = [
+            f"HTTP/1.1 {status} {STATUS_TEXTE.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body) if laenge is None else laenge}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if etag is not None:
+            kopf.append(f"ETag: {etag}")
+        writer.write(("\r\n".join(kopf) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def starten(self, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Startet den Server und bearbeitet Anfragen, bis der Prozess beendet wird.
+
+        :param host: Adresse, an die der Server gebunden wird.
+        :param port: Port des Servers.
+        """
+        server = await asyncio.start_server(self.verbindung_bearbeiten, host, port)
+        print(f"Dashboard-API läuft auf http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+# Startet den Server, wenn die Datei direkt ausgeführt wird
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON-API für die Dashboard-Daten")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse des Servers")
+    parser.add_argument("--port", type=int, default=8080, help="Port des Servers")
+    parser.add_argument("--speicherbudget", type=float, default=None, help="Speicherbudget in MB")
+    parser.add_argument("--speichermodus", choices=["warnen", "verdraengen"], default="warnen",
+                        help="Reaktion bei Überschreitung des Speicherbudgets")
+    parser.add_argument("--tracemalloc", action="store_true", help="Allokationen für /speicher mit tracemalloc verfolgen")
+    parser.add_argument("--daten-verzeichnis", default=None,
+                        help="Basisverzeichnis mit einem Unterverzeichnis je Datenbestand (mehrere Bestände, LRU-Verdrängung "
+                             "unter --speicherbudget)")
+    parser.add_argument("--max-geladen", type=int, default=None, help="Höchstzahl gleichzeitig geladener Datenbestände")
+    args = parser.parse_args()
+
+    speicherprofil = None
+    if args.tracemalloc:
+        speicherprofil = Speicherprofil()
+        speicherprofil.starten()
+    if args.daten_verzeichnis is not None:
+        # Mehrere Datenbestände; das Speicherbudget gilt für alle geladenen Bestände zusammen
+        datenbestaende = Datenbestaende.aus_verzeichnis(args.daten_verzeichnis, budget_mb=args.speicherbudget,
+                                                        max_geladen=args.max_geladen, reservierte_namen=RESERVIERTE_NAMEN)
+        print(f"Datenbestände: {', '.join(datenbestaende.namen())}")
+        dashboard_server = DashboardServer(speicherprofil=speicherprofil, datenbestaende=datenbestaende)
+    else:
+        speicherbudget = Speicherbudget(args.speicherbudget, args.speichermodus) if args.speicherbudget is not None else None
+        dashboard_server = DashboardServer(DBZugriff(CSVZugriff()), speicherbudget=speicherbudget, speicherprofil=speicherprofil)
+    asyncio.run(dashboard_server.starten(args.host, args.port))
@@ -7,7 +7,11 @@
 # csvzugriff.py
 
 # Importiere notwendige Module und Klassen
+import importlib.util # Für die Prüfung, ob pyarrow installiert ist
+import os # Für Dateipfade, die Anzahl der verfügbaren Prozessoren und das atomare Ersetzen von Dateien
+from concurrent.futures import ThreadPoolExecutor # Für das parallele Einlesen der Dateien
 import pandas as pd # Importiere pandas für die Arbeit mit DataFrames
+from schema import SCHEMA, DATUMSFORMAT, FEHLWERTE, tabelle_konvertieren # Spaltentypen und deren vektorisierte Umwandlung
 
 class CSVZugriff:
     """
@@ -16,11 +20,23 @@ class CSVZugriff:
     Zuordnung von Datentypen sowie das Parsen von Datumsfeldern.
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None, engine: str = "auto", data_dir: str = None):
         """
         Initialisiert die Klasse und definiert die Pfade zu den CSV-Dateien,
         die zu verarbeitenden Spaltentypen und die Datumsspalten.
+        :param max_workers: Anzahl der Threads für das parallele Einlesen (Standard: Anzahl Dateien, höchstens Anzahl CPUs).
+        :param engine: CSV-Engine von pandas: "c", "pyarrow" oder "auto" (pyarrow, falls installiert, sonst c).
+        :param data_dir: Verzeichnis des Datenbestands (Standard: aktuelles Arbeitsverzeichnis).
         """
+        self.max_workers = max_workers
+        self.data_dir = data_dir
+        if engine == "auto":
+            engine = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+        self.engine = engine
+
+        # Fehlermeldungen des letzten Einlesens je Datei (in der Reihenfolge von file_paths)
+        self.errors = {}
+
         # Pfade zu den relevanten CSV-Dateien
         self.file_paths = [
             r"modul.csv",
@@ -32,53 +48,154 @@ class CSVZugriff:
             r"studiengang.csv",
             r"studiengang_semester.csv"
         ]
+        if data_dir:
+            self.file_paths = [os.path.join(data_dir, file_path) for file_path in self.file_paths]
         
-        # Definiert die Datentypen für spezifische Dateien und Spalten
-        self.column_types = {
-            "student.csv": {"student_code": str, "zielnote": float},
-            "student_studiengang.csv": {"student_code": str, "studiengang_code": str},
-            "modul.csv": {"modul_code": str, "credits": int},
-            "modulbuchung.csv": {"student_code": str, "modul_code": str, "bestanden": bool},
-            "semester.csv": {"semester_code": str},
-            "semester_modul.csv": {"semester_code": str, "modul_code": str},
-            "studiengang.csv": {"studiengang_code": str, "credits": int, "semester": int},
-            "studiengang_semester.csv": {"studiengang_code": str, "semester_code": str}
-        }
-
-        # Definiere, welche Spalten als Datum geparst werden sollen
-        self.date_columns = {
-            "student.csv": ["start_studium"],  
-            "modulbuchung.csv": ["buchungsdatum", "pruefungsdatum"],  
-        }
-        
+        # Spaltentypen je Datei; Datumswerte, Wahrheitswerte und Zahlen werden danach einmal je Spalte umgewandelt
+        self.schema = SCHEMA
+
+        # Ergebnisse von read_table: (Dateiname, Spalten) -> ((Größe, Änderungszeit), DataFrame)
+        self._tabellen_cache = {}
+
+    def _pfad(self, file_name: str):
+        """
+        Ermittelt den Pfad einer Datei anhand ihres Dateinamens.
+        :param file_name: Dateiname der Tabelle (z. B. "student.csv")
+        :return: Pfad zur Datei
+        """
+        return next((path for path in self.file_paths if os.path.basename(path) == file_name),
+                    os.path.join(self.data_dir or "", file_name))
+
+    def read_table(self, file_name: str, usecols=None):
+        """
+        Gibt eine einzelne Tabelle zurück (siehe _tabelle_lesen). Das Ergebnis wird je Datei und Spaltenauswahl
+        zwischengespeichert und erst neu geparst, wenn sich Größe oder Änderungszeit der Datei ändern.
+        :param file_name: Dateiname der Tabelle (z. B. "student.csv")
+        :param usecols: Optionale Liste der einzulesenden Spalten
+        :return: DataFrame mit den eingelesenen Daten
+        """
+        status = os.stat(self._pfad(file_name))
+        signatur = (status.st_size, status.st_mtime_ns)
+        schluessel = (file_name, tuple(usecols) if usecols is not None else None)
+        eintrag = self._tabellen_cache.get(schluessel)
+        if eintrag is None or eintrag[0] != signatur:
+            eintrag = (signatur, self._tabelle_lesen(file_name, usecols))
+            self._tabellen_cache[schluessel] = eintrag
+        # Flache Kopie: Änderungen des Aufrufers erreichen den Cache nicht (Copy-on-Write)
+        return eintrag[1].copy(deep=False)
+
+    def _tabelle_lesen(self, file_name: str, usecols=None):
+        """
+        Liest eine einzelne CSV-Datei ein und wandelt die Spalten gemäß Schema um (Datum im festen Format
+        JJJJ-MM-TT, Wahrheitswerte true/false, Zahlen mit fehlenden Werten). Über usecols werden nur die
+        angegebenen Spalten gelesen.
+        :param file_name: Dateiname der Tabelle (z. B. "student.csv")
+        :param usecols: Optionale Liste der einzulesenden Spalten
+        :return: DataFrame mit den eingelesenen Daten
+        """
+        file_path = self._pfad(file_name)
+
+        # Dateien ohne Schema werden wie bisher mit der Typerkennung von pandas gelesen
+        typen = self.schema.get(file_name)
+        if typen is None:
+            return pd.read_csv(file_path, usecols=usecols, engine="pyarrow" if self.engine == "pyarrow" else None)
+
+        # Mit pyarrow werden die Spalten direkt beim Parsen typisiert
+        if self.engine == "pyarrow":
+            try:
+                return tabelle_konvertieren(file_name, self._read_arrow(file_path, typen, usecols))
+            except FileNotFoundError:
+                raise
+            except Exception:
+                # Rückfall auf das Einlesen als Text, z. B. wenn eine Spalte ungültige Werte enthält;
+                # diese werden dann bei der Umwandlung als fehlend übernommen und gemeldet
+                pass
+        # C-Engine: Zahlen direkt als float64 parsen, übrige Spalten als Text; enthält eine Zahlenspalte
+        # ungültige Werte, wird die ganze Datei als Text gelesen
+        optionen = dict(usecols=usecols, keep_default_na=False, na_values=FEHLWERTE)
+        try:
+            data = pd.read_csv(file_path, dtype={spalte: "float64" if typ in ("int", "float") else str
+                                                 for spalte, typ in typen.items()}, **optionen)
+        except FileNotFoundError:
+            raise
+        except ValueError:
+            data = pd.read_csv(file_path, dtype=str, **optionen)
+        return tabelle_konvertieren(file_name, data)
+
+    @staticmethod
+    def _read_arrow(file_path: str, typen: dict, usecols=None):
+        """
+        Liest eine CSV-Datei mit pyarrow und festen Spaltentypen ein. Wahrheitswerte werden als Text gelesen
+        und bei der Umwandlung einheitlich interpretiert.
+        :param file_path: Pfad zur CSV-Datei
+        :param typen: Spaltentypen der Datei aus dem Schema
+        :param usecols: Optionale Liste der einzulesenden Spalten
+        :return: DataFrame mit den eingelesenen Daten
+        """
+        import pyarrow as pa  # Für die Spaltentypen
+        import pyarrow.csv as pa_csv  # Für das typisierte Einlesen
+
+        arrow_typen = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.string(),
+                       "date": pa.timestamp("us")}
+        optionen = pa_csv.ConvertOptions(
+            column_types={spalte: arrow_typen[typ] for spalte, typ in typen.items()},
+            timestamp_parsers=[DATUMSFORMAT],
+            null_values=FEHLWERTE,
+            strings_can_be_null=True,
+            include_columns=list(usecols) if usecols is not None else None
+        )
+        return pa_csv.read_csv(file_path, convert_options=optionen).to_pandas()
+
+    def write_table(self, file_name: str, data: pd.DataFrame):
+        """
+        Schreibt eine Tabelle im Format der Quelldateien zurück (UTF-8 mit BOM, CRLF, Datum als JJJJ-MM-TT,
+        Wahrheitswerte als true/false). Die Datei wird über eine temporäre Datei atomar ersetzt.
+        :param file_name: Dateiname der Tabelle (z. B. "modulbuchung.csv")
+        :param data: DataFrame mit den zu schreibenden Daten
+        """
+        file_path = self._pfad(file_name)
+        # Zwischengespeicherte Ergebnisse dieser Datei sind nach dem Schreiben veraltet
+        self._tabellen_cache = {schluessel: eintrag for schluessel, eintrag in self._tabellen_cache.items()
+                                if schluessel[0] != file_name}
+
+        # Wahrheitswerte in der Schreibweise der Quelldateien ausgeben
+        data = data.assign(**{column: data[column].map({True: "true", False: "false"})
+                              for column in data.columns if data[column].dtype == bool})
+        data.to_csv(file_path + ".tmp", index=False, encoding="utf-8-sig", lineterminator="\r\n",
+                    date_format="%Y-%m-%d", float_format="%g")
+        os.replace(file_path + ".tmp", file_path)
+
     def read_data(self):
         """
-        Liest alle CSV-Dateien in der Liste ein und gibt ein Dictionary zurück.
+        Liest alle CSV-Dateien in der Liste parallel in einem Thread-Pool ein und gibt ein Dictionary zurück.
         Der Schlüssel ist der Dateiname, der Wert ist der eingelesene DataFrame.
+        Meldungen und Fehler werden unabhängig von der Fertigstellungsreihenfolge
+        in der Reihenfolge von file_paths ausgegeben.
         :return: Dictionary mit Dateinamen als Schlüssel und DataFrames als Werte
         """
+        # Extrahiere die Dateinamen (z. B. "student.csv")
+        file_names = [os.path.basename(file_path) for file_path in self.file_paths]
+        
+        max_workers = self.max_workers or min(len(file_names), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            # Vollständiges Einlesen ohne Zwischenspeicher; die Tabellen hält der Aufrufer
+            futures = [executor.submit(self._tabelle_lesen, file_name) for file_name in file_names]
+        
         data_dict = {} # Dictionary zur Speicherung der geladenen DataFrames
-        for file_path in self.file_paths:
+        self.errors = {}
+        for file_path, file_name, future in zip(self.file_paths, file_names, futures):
             try:
-                # Extrahiere den Dateinamen (z. B. "student.csv")
-                file_name = file_path.split("\\")[-1]
-                
-                # Hole die definierten Datentypen und Datumsspalten für die aktuelle Datei
-                dtype = self.column_types.get(file_name, None)
-                parse_dates = self.date_columns.get(file_name, None)
-                
-                # Lade die CSV-Datei mit pandas, unter Berücksichtigung der Typ- und Datumseinstellungen
-                data = pd.read_csv(file_path, dtype=dtype, parse_dates=parse_dates)
-                
                 # Speichere den DataFrame im Dictionary mit dem Dateinamen als Schlüssel
-                data_dict[file_name] = data
+                data_dict[file_name] = future.result()
                 print(f"Datei {file_name} erfolgreich geladen.")  # Debugging: Bestätigung
             except FileNotFoundError:
                 # Fehlerbehandlung, wenn die Datei nicht gefunden wird
-                print(f"Datei nicht gefunden: {file_path}")
+                self.errors[file_name] = f"Datei nicht gefunden: {file_path}"
+                print(self.errors[file_name])
             except Exception as e:
                 # Allgemeine Fehlerbehandlung mit Ausgabe der Fehlermeldung
-                print(f"Fehler beim Lesen der Datei {file_path}: {e}")
+                self.errors[file_name] = f"Fehler beim Lesen der Datei {file_path}: {e}"
+                print(self.errors[file_name])
         return data_dict
 
 # Kurzer Test, um sicherzustellen, dass die CSV-Dateien geladen werden können
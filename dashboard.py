@@ -10,21 +10,134 @@
 import tkinter as tk  # Für GUI-Komponenten
 from tkinter import ttk  # Für erweiterte Widgets wie Tabellen
 from datetime import datetime  # Für aktuelle Datumsanzeige
+import time  # Für die Zeitmessung beim Studentenwechsel
 import matplotlib.pyplot as plt  # Für Diagramme
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Einbetten von Matplotlib in Tkinter
 import pandas as pd  # Für Datenverarbeitung
+from dashboarddaten import dashboard_viewmodel  # Vorberechnete Dashboard-Daten je Student
+from prognose import Notenprognose  # Prognose der Erreichbarkeit der Zielnote
 
-def run_dashboard(student, booked_not_completed_modules, not_booked_modules, completed_modules):
+# Spalten der Modultabellen
+MODUL_SPALTEN = ["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform"]
+
+
+def _tabelle_fuellen(titel, tree, leer_label, zeilen):
+    """
+    Ersetzt den Inhalt einer Modultabelle. Ohne Zeilen werden Überschrift und Tabelle ausgeblendet
+    und stattdessen der Hinweis angezeigt.
+
+    :param titel: Überschrift der Tabelle.
+    :param tree: Die Treeview-Tabelle.
+    :param leer_label: Hinweis, der bei leerer Tabelle angezeigt wird.
+    :param zeilen: Liste von Wertetupeln; fehlende Werte (None) werden als "-" angezeigt.
+    """
+    tree.delete(*tree.get_children())
+    if not zeilen:
+        titel.grid_remove()
+        tree.grid_remove()
+        leer_label.grid()
+        return
+    leer_label.grid_remove()
+    titel.grid()
+    tree.grid()
+    for werte in zeilen:
+        tree.insert("", "end", values=tuple("-" if wert is None else wert for wert in werte))
+
+
+def _semester_zeichnen(ax, viewmodel):
+    """
+    Zeichnet das Balkendiagramm der gesamten und der bestandenen Credits je Plansemester neu.
+
+    :param ax: Die Matplotlib-Achse, die geleert und neu gezeichnet wird.
+    :param viewmodel: DashboardViewModel des Studenten.
+    """
+    semesters, total_credits_values, completed_credits_values = zip(*viewmodel.credits_pro_semester)
+    x = range(len(semesters))
+    width = 0.2  # Breite der Balken
+
+    ax.clear()
+    ax.bar(x, total_credits_values, width=width, label="Gesamte Credits", color='skyblue', align='center')
+    ax.bar([i + width for i in x], completed_credits_values, width=width, label="Bestandene Credits", color='green', align='center')
+    ax.set_title(f"Credits pro Semester - Student: {viewmodel.student_name}")
+    ax.set_xlabel("Semester")
+    ax.set_ylabel("Credits")
+    ax.set_xticks([i + width / 2 for i in x])
+    ax.set_xticklabels(semesters, rotation=45)
+    ax.legend()
+    ax.figure.tight_layout()
+
+
+class _BlitDiagramm:
+    """
+    Eingebettete Matplotlib-Figure, deren veränderliche Artists beim Studentenwechsel per Blitting auf einen
+    zwischengespeicherten Hintergrund gezeichnet werden. Nur wenn sich der statische Teil (Achsen,
+    Beschriftungen) ändert, wird die Figure vollständig neu gezeichnet.
+    """
+    def __init__(self, canvas):
+        """
+        Initialisiert das Diagramm.
+
+        :param canvas: Die FigureCanvasTkAgg der Figure.
+        """
+        self.canvas = canvas
+        self.schluessel = None  # Beschreibt den statischen Teil des zuletzt vollständig gezeichneten Diagramms
+        self.hintergrund = None
+        self.artists = []
+
+        # Nach jedem vollständigen Zeichnen (auch bei Größenänderungen) den Hintergrund neu sichern
+        canvas.mpl_connect("draw_event", self._nach_zeichnen)
+
+    def _nach_zeichnen(self, event):
+        """
+        Sichert den Hintergrund ohne die veränderlichen Artists und zeichnet diese darüber.
+        """
+        self.hintergrund = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._artists_zeichnen()
+
+    def _artists_zeichnen(self):
+        """
+        Zeichnet die veränderlichen Artists und überträgt die Figure in das Tk-Widget.
+        """
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def aktualisieren(self, schluessel, artists):
+        """
+        Zeigt die übergebenen Artists an. Bei unverändertem statischem Teil wird nur der gesicherte
+        Hintergrund wiederhergestellt und die Artists darüber gezeichnet.
+
+        :param schluessel: Vergleichbarer Wert, der den statischen Teil beschreibt.
+        :param artists: Liste der veränderlichen Artists.
+        """
+        for artist in artists:
+            artist.set_animated(True)
+        self.artists = artists
+        if schluessel != self.schluessel or self.hintergrund is None:
+            self.schluessel = schluessel
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.hintergrund)
+            self._artists_zeichnen()
+
+
+def run_dashboard(viewmodel, db_handler, viewmodel_laden=None):
     """
     Erstellt und startet ein Tkinter-basiertes Dashboard für die Anzeige der Studenteninformationen,
     gebuchten Module, offenen Module und abgeschlossenen Module. Visualisiert Daten mit Tabellen
-    und Diagrammen.
-
-    :param student: Das Student-Objekt mit grundlegenden Informationen und Methoden zur Datenverarbeitung.
-    :param booked_not_completed_modules: DataFrame mit gebuchten, aber nicht abgeschlossenen Modulen.
-    :param not_booked_modules: DataFrame mit noch nicht gebuchten Modulen.
-    :param completed_modules: DataFrame mit bereits abgeschlossenen Modulen.
+    und Diagrammen. Angezeigt wird ein vorberechnetes DashboardViewModel; das Dashboard ermittelt
+    selbst nur noch die Prognose und den Lernverlauf. Über das Eingabefeld kann ein anderer Student
+    angezeigt werden; dabei werden nur die Inhalte der vorhandenen Widgets und Diagramme ersetzt.
+
+    :param viewmodel: DashboardViewModel des anzuzeigenden Studenten.
+    :param db_handler: Instanz von DBZugriff für Suche, Lernverlauf und Prognose.
+    :param viewmodel_laden: Optionale Funktion student_code -> DashboardViewModel oder None für den
+                            Studentenwechsel (Standard: dashboard_viewmodel).
     """
+    if viewmodel_laden is None:
+        viewmodel_laden = lambda code: dashboard_viewmodel(db_handler, code)
+    prognose = Notenprognose(db_handler)
+
     root = tk.Tk()
     root.title("Student Dashboard")
 
@@ -35,23 +148,32 @@ def run_dashboard(student, booked_not_completed_modules, not_booked_modules, com
     label = tk.Label(root, text="Studenteninformationen", font=("Arial", 16))
     label.pack(pady=10)
 
+    # *** Studentenwechsel ***
+    auswahl_frame = tk.Frame(root)
+    auswahl_frame.pack(pady=5, padx=10)
+    tk.Label(auswahl_frame, text="Studenten-Code oder Name:", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+    code_eingabe = tk.Entry(auswahl_frame, font=("Arial", 12), width=20)
+    code_eingabe.pack(side="left", padx=5)
+    # Vorschläge der Autovervollständigung (Code - Name), werden bei jeder Eingabe aktualisiert
+    vorschlag_liste = tk.Listbox(auswahl_frame, font=("Arial", 10), width=36, height=4)
+    vorschlag_liste.pack(side="left", padx=5)
+    vorschlag_codes = []
+    anzeigen_button = tk.Button(auswahl_frame, text="Anzeigen", font=("Arial", 12))
+    anzeigen_button.pack(side="left", padx=5)
+    status_label = tk.Label(auswahl_frame, text="", font=("Arial", 10))
+    status_label.pack(side="left", padx=5)
+
     # *** Studenteninformationen anzeigen ***
     info_frame = tk.Frame(root)
     info_frame.pack(pady=10, padx=10)
 
-    # Daten des Studenten vorbereiten
-    student_name = student.student_name if student.student_name else "Nicht verfügbar"
-    student_code = student.student_code if student.student_code else "Nicht verfügbar"
-    studiengang_name = student.studiengang.studiengang_name if student.studiengang else "Nicht verfügbar"
-    aktuelles_datum = datetime.now().strftime('%d.%m.%Y')
-
-    # Beschriftungen und Werte nebeneinander anzeigen
+    # Beschriftungen und Werte nebeneinander anzeigen; die Werte werden beim Studentenwechsel ersetzt
     data_labels = ["Name:", "Code:", "Studiengang:", "Datum:"]
-    data_values = [student_name, student_code, studiengang_name, aktuelles_datum]
-    
-    for i, (label_text, value) in enumerate(zip(data_labels, data_values)):
+    info_werte = []
+    for i, label_text in enumerate(data_labels):
         tk.Label(info_frame, text=label_text, font=("Arial", 12, "bold")).grid(row=0, column=i*2, sticky="w", padx=5)
-        tk.Label(info_frame, text=value, font=("Arial", 12)).grid(row=0, column=i*2+1, sticky="w", padx=5)
+        info_werte.append(tk.Label(info_frame, text="", font=("Arial", 12)))
+        info_werte[-1].grid(row=0, column=i*2+1, sticky="w", padx=5)
 
     # *** Tabellen für Module erstellen ***
     table_frame = tk.Frame(root)
@@ -61,115 +183,198 @@ def run_dashboard(student, booked_not_completed_modules, not_booked_modules, com
     tables_frame = tk.Frame(table_frame)
     tables_frame.pack(fill=tk.BOTH, expand=True)
 
-    # Tabelle: Gebuchte, aber nicht abgeschlossene Module
-    if booked_not_completed_modules is not None and not booked_not_completed_modules.empty:
-        tk.Label(tables_frame, text="Gebuchte, aber nicht abgeschlossene Module:", font=("Arial", 14)).grid(row=0, column=0, padx=10)
-
-        booked_tree = ttk.Treeview(tables_frame, columns=["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform"], show="headings", height=10)
-        booked_tree.grid(row=1, column=0, padx=10, pady=10)
+    tabellen = []
+    for column, (titel_text, leer_text, spalten) in enumerate([
+        ("Gebuchte, aber nicht abgeschlossene Module:", "Keine gebuchten, aber nicht abgeschlossenen Module vorhanden.", MODUL_SPALTEN),
+        ("Offene Module:", "Keine offenen Module vorhanden.", MODUL_SPALTEN),
+        ("Abgeschlossene Module:", "Keine abgeschlossenen Module vorhanden.", MODUL_SPALTEN + ["Note", "Perzentil"])
+    ]):
+        titel = tk.Label(tables_frame, text=titel_text, font=("Arial", 14))
+        titel.grid(row=0, column=column, padx=10)
+        tree = ttk.Treeview(tables_frame, columns=spalten, show="headings", height=10)
+        tree.grid(row=1, column=column, padx=10, pady=10)
 
         # Spaltenüberschriften hinzufügen
-        for col in ["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform"]:
-            booked_tree.heading(col, text=col)
-            booked_tree.column(col, width=70)
-
-        # Daten einfügen und "Credits" formatieren
-        for _, row in booked_not_completed_modules.iterrows():
-            booked_tree.insert("", "end", values=(
-                row["modul_code"],
-                row["modul_name"],
-                row["credits"],
-                row["tutor"],
-                row["pruefungsform"]
-            ))
-    else:
-        tk.Label(tables_frame, text="Keine gebuchten, aber nicht abgeschlossenen Module vorhanden.", font=("Arial", 14)).grid(row=1, column=0, padx=10)
-
-    # Tabelle: Offene Module
-    if not_booked_modules is not None and not not_booked_modules.empty:
-        tk.Label(tables_frame, text="Offene Module:", font=("Arial", 14)).grid(row=0, column=1, padx=10)
-
-        open_tree = ttk.Treeview(tables_frame, columns=["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform"], show="headings", height=10)
-        open_tree.grid(row=1, column=1, padx=10, pady=10)
-
-        for col in ["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform"]:
-            open_tree.heading(col, text=col)
-            open_tree.column(col, width=70)
-
-        for _, row in not_booked_modules.iterrows():
-            open_tree.insert("", "end", values=(
-                row["modul_code"],
-                row["modul_name"],
-                row["credits"],
-                row["tutor"],
-                row["pruefungsform"]
-            ))
-    else:
-        tk.Label(tables_frame, text="Keine offenen Module vorhanden.", font=("Arial", 14)).grid(row=1, column=1, padx=10)
-
-    # Tabelle: Abgeschlossene Module
-    if completed_modules is not None and not completed_modules.empty:
-        tk.Label(tables_frame, text="Abgeschlossene Module:", font=("Arial", 14)).grid(row=0, column=2, padx=10)
-
-        completed_tree = ttk.Treeview(tables_frame, columns=["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform", "Note"], show="headings", height=10)
-        completed_tree.grid(row=1, column=2, padx=10, pady=10)
-
-        for col in ["Modul-Code", "Modul-Name", "Credits", "Tutor", "Prüfungsform", "Note"]:
-            completed_tree.heading(col, text=col)
-            completed_tree.column(col, width=70)
-
-        for _, row in completed_modules.iterrows():
-            completed_tree.insert("", "end", values=(
-                row["modul_code"],
-                row["modul_name"],
-                row["credits"],
-                row["tutor"],
-                row["pruefungsform"],
-                row["note"]
-            ))
-    else:
-        tk.Label(tables_frame, text="Keine abgeschlossenen Module vorhanden.", font=("Arial", 14)).grid(row=1, column=2, padx=10)
-
-    # Kreisdiagramm für Prüfungsformen und Semesterplot nebeneinander anzeigen
-    if completed_modules is not None and not completed_modules.empty:
-        pruefungsform_counts = completed_modules["pruefungsform"].value_counts()
-
-        # Kreisdiagramm erstellen
-        fig_pie, ax_pie = plt.subplots(figsize=(3, 3))  # Größeren Wert für größere Diagramme verwenden
-        ax_pie.pie(pruefungsform_counts, labels=pruefungsform_counts.index, autopct='%1.1f%%', startangle=90)
-        ax_pie.axis('equal')
-
-        # Frame für Diagramme (Kreisdiagramm und Semesterplot)
-        diagrams_frame = tk.Frame(root)
+        for col in spalten:
+            tree.heading(col, text=col)
+            tree.column(col, width=70)
+
+        leer_label = tk.Label(tables_frame, text=leer_text, font=("Arial", 14))
+        leer_label.grid(row=1, column=column, padx=10)
+        leer_label.grid_remove()
+        tabellen.append((titel, tree, leer_label))
+
+    # *** Diagramme und Kennzahlen; Figuren werden einmal erstellt und beim Studentenwechsel neu gezeichnet ***
+    diagrams_frame = tk.Frame(root)
+
+    # Kreisdiagramm für Prüfungsformen
+    fig_pie, ax_pie = plt.subplots(figsize=(3, 3))  # Größeren Wert für größere Diagramme verwenden
+    pie_canvas = FigureCanvasTkAgg(fig_pie, master=diagrams_frame)
+    pie_canvas.get_tk_widget().pack(side="left", padx=10)  # Links positionieren
+    pie_diagramm = _BlitDiagramm(pie_canvas)
+
+    # Semesterplot rechts vom Kreisdiagramm
+    fig_semester, ax_semester = plt.subplots(figsize=(6, 3))
+    semester_canvas = FigureCanvasTkAgg(fig_semester, master=diagrams_frame)
+    semester_canvas.get_tk_widget().pack(side="left", padx=10)
+    semester_diagramm = _BlitDiagramm(semester_canvas)
+
+    # Studienfortschritt über die Kalendermonate: kumulierte Credits und gleitender Notendurchschnitt.
+    # Die Linien werden einmal angelegt und beim Studentenwechsel nur mit neuen Daten gefüllt.
+    fig_verlauf, ax_verlauf = plt.subplots(figsize=(5, 3))
+    ax_verlauf_note = ax_verlauf.twinx()
+    credits_linie, = ax_verlauf.step([], [], where="post", color="green", label="Kumulierte Credits")
+    noten_linie, = ax_verlauf_note.plot([], [], color="tab:orange", marker=".", label="Notendurchschnitt (6 Monate)")
+    ax_verlauf.xaxis_date()  # Die Linien starten leer, daher die Datumsachse ausdrücklich festlegen
+    ax_verlauf.set_ylabel("Credits")
+    ax_verlauf_note.set_ylabel("Note")
+    ax_verlauf_note.invert_yaxis()  # Bessere (niedrigere) Noten oben
+    ax_verlauf.legend(handles=[credits_linie, noten_linie], loc="upper left", fontsize=7)
+    ax_verlauf.set_title("Studienfortschritt")
+    fig_verlauf.autofmt_xdate()
+    verlauf_canvas = FigureCanvasTkAgg(fig_verlauf, master=diagrams_frame)
+    verlauf_canvas.get_tk_widget().pack(side="left", padx=10)
+
+    result_frame = tk.Frame(diagrams_frame)
+    result_frame.pack(side="left", padx=10)
+
+    result_labels = ["Zielnote:", "Aktueller Notendurchschnitt:", "Erreichte ECTS-Credits:",
+                     "Benötigte Note (offene Module):", "Zielnote erreichbar (Prognose):"]
+    result_werte = []
+    for i, label_text in enumerate(result_labels):
+        tk.Label(result_frame, text=label_text, font=("Arial", 12, "bold")).grid(row=i, column=0, sticky="w", pady=2)
+        result_werte.append(tk.Label(result_frame, text="", font=("Arial", 12)))
+        result_werte[-1].grid(row=i, column=1, sticky="w", pady=2)
+
+    def anzeigen(viewmodel):
+        """
+        Ersetzt alle studentenspezifischen Inhalte (Informationen, Tabellen, Diagramme, Kennzahlen).
+        """
+        # Daten des Studenten vorbereiten
+        student_name = viewmodel.student_name if viewmodel.student_name else "Nicht verfügbar"
+        student_code = viewmodel.student_code if viewmodel.student_code else "Nicht verfügbar"
+        studiengang_name = viewmodel.studiengang if viewmodel.studiengang else "Nicht verfügbar"
+        aktuelles_datum = datetime.now().strftime('%d.%m.%Y')
+        for widget, value in zip(info_werte, [student_name, student_code, studiengang_name, aktuelles_datum]):
+            widget.config(text=value)
+
+        # Tabellen: Gebuchte, aber nicht abgeschlossene Module und offene Module
+        _tabelle_fuellen(*tabellen[0], viewmodel.gebucht_nicht_abgeschlossen)
+        _tabelle_fuellen(*tabellen[1], viewmodel.offen)
+
+        # Tabelle: Abgeschlossene Module mit Perzentil der Note innerhalb aller Ergebnisse des Moduls
+        zeilen = [zeile[:-1] + (f"{zeile[-1]:.0f} %" if zeile[-1] is not None else "-",) for zeile in viewmodel.abgeschlossen]
+        _tabelle_fuellen(*tabellen[2], zeilen)
+
+        # Diagramme und Kennzahlen nur bei abgeschlossenen Modulen anzeigen
+        if not viewmodel.abgeschlossen:
+            diagrams_frame.pack_forget()
+            return
         diagrams_frame.pack(pady=10, padx=10)
 
-        # Kreisdiagramm im Tkinter-Fenster anzeigen
-        pie_canvas = FigureCanvasTkAgg(fig_pie, master=diagrams_frame)
-        pie_canvas.draw()
-        pie_canvas.get_tk_widget().pack(side="left", padx=10)  # Links positionieren
-
-        semester_plot = student.plot_combined_credits_per_semester()
-        if semester_plot:
-            semester_canvas = FigureCanvasTkAgg(semester_plot, master=diagrams_frame)
-            semester_canvas.draw()
-            semester_canvas.get_tk_widget().pack(side="left", padx=10)  # Rechts vom Kreisdiagramm positionierensemester_plot = student.plot_combined_credits_per_semester()  # Für das Diagramm übergeben
-        
-
-        # Berechnungen für Durchschnittsnote
-        total_credits = completed_modules["credits"].sum()
-        average_grade = round(completed_modules["note"].mean(), 2)
-        target_grade = student.zielnote  # Zielnote aus dem Student-Objekt holen
-
-        result_frame = tk.Frame(diagrams_frame)
-        result_frame.pack(side="left", padx=10)
-
-        result_data = [("Zielnote:", target_grade), 
-                       ("Aktueller Notendurchschnitt:", average_grade), 
-                       ("Erreichte ECTS-Credits:", total_credits)]
-
-        for i, (label_text, value) in enumerate(result_data):
-            tk.Label(result_frame, text=label_text, font=("Arial", 12, "bold")).grid(row=i, column=0, sticky="w", pady=2)
-            tk.Label(result_frame, text=value, font=("Arial", 12)).grid(row=i, column=1, sticky="w", pady=2)
-
+        # Kreisdiagramm: alte Segmente entfernen, neue auf den gesicherten (leeren) Hintergrund zeichnen
+        for artist in ax_pie.patches + ax_pie.texts:
+            artist.remove()
+        if viewmodel.pruefungsformen:
+            formen, anzahlen = zip(*viewmodel.pruefungsformen)
+            ax_pie.pie(anzahlen, labels=formen, autopct='%1.1f%%', startangle=90)
+        ax_pie.axis('equal')
+        pie_diagramm.aktualisieren("pie", list(ax_pie.patches) + list(ax_pie.texts))
+
+        # Semesterplot: Achsen und Gesamtcredits hängen nur vom Studiengang ab, daher werden bei gleichem
+        # Studiengang nur die Balken der bestandenen Credits und der Titel aktualisiert
+        if not viewmodel.credits_pro_semester:
+            semester_canvas.get_tk_widget().pack_forget()
+        else:
+            semester_namen, gesamt_credits, bestandene_credits = zip(*viewmodel.credits_pro_semester)
+            schluessel = (viewmodel.studiengang_code, semester_namen, gesamt_credits)
+            if (schluessel == semester_diagramm.schluessel and len(ax_semester.containers) == 2
+                    and max(bestandene_credits, default=0) <= ax_semester.get_ylim()[1]):
+                for balken, wert in zip(ax_semester.containers[1], bestandene_credits):
+                    balken.set_height(wert)
+                ax_semester.set_title(f"Credits pro Semester - Student: {viewmodel.student_name}")
+            else:
+                _semester_zeichnen(ax_semester, viewmodel)
+            semester_canvas.get_tk_widget().pack(side="left", padx=10, before=result_frame)
+            semester_diagramm.aktualisieren(schluessel, list(ax_semester.containers[1]) + [ax_semester.title])
+
+        # Studienfortschritt über die Zeit
+        verlauf = db_handler.get_lernverlauf(viewmodel.student_code)
+        if verlauf is None:
+            verlauf_canvas.get_tk_widget().pack_forget()
+        else:
+            credits_linie.set_data(verlauf["monat"], verlauf["kumulierte_credits"])
+            noten_linie.set_data(verlauf["monat"], verlauf["gleitender_durchschnitt"])
+            for ax in (ax_verlauf, ax_verlauf_note):
+                ax.relim()
+                ax.autoscale_view()
+            verlauf_canvas.get_tk_widget().pack(side="left", padx=10, before=result_frame)
+            verlauf_canvas.draw_idle()
+
+        # Prognose: benötigte Note in den offenen Modulen und Wahrscheinlichkeit, die Zielnote zu erreichen.
+        # Sie wird direkt aus den geladenen Tabellen simuliert und ist daher nicht Teil des ViewModels.
+        benoetigte_note, wahrscheinlichkeit = "-", "-"
+        ergebnis = prognose.fuer_student_code(viewmodel.student_code)
+        if ergebnis is not None:
+            if pd.notna(ergebnis["benoetigte_note"]):
+                benoetigte_note = round(ergebnis["benoetigte_note"], 2)
+            if pd.notna(ergebnis["wahrscheinlichkeit"]):
+                wahrscheinlichkeit = f"{ergebnis['wahrscheinlichkeit']:.0%}"
+
+        kennzahlen = [viewmodel.zielnote, viewmodel.notendurchschnitt, viewmodel.erreichte_credits, benoetigte_note, wahrscheinlichkeit]
+        for widget, value in zip(result_werte, kennzahlen):
+            widget.config(text="-" if value is None else value)
+
+    def vorschlagen(event=None):
+        """
+        Aktualisiert die Vorschlagsliste passend zur bisherigen Eingabe (Code- oder Namensanfang, Tippfehler).
+        """
+        if event is not None and event.keysym in ("Return", "Up", "Down"):
+            return
+        vorschlag_liste.delete(0, tk.END)
+        vorschlag_codes.clear()
+        for code, name in db_handler.get_studentensuche().suchen(code_eingabe.get(), limit=8):
+            vorschlag_liste.insert(tk.END, f"{code} - {name}")
+            vorschlag_codes.append(code)
+
+    def vorschlag_waehlen(event=None):
+        """
+        Übernimmt den ausgewählten Vorschlag in das Eingabefeld und zeigt den Studenten an.
+        """
+        auswahl = vorschlag_liste.curselection()
+        if not auswahl:
+            return
+        code_eingabe.delete(0, tk.END)
+        code_eingabe.insert(0, vorschlag_codes[auswahl[0]])
+        wechseln()
+
+    def wechseln(event=None):
+        """
+        Lädt den eingegebenen Studenten und zeigt ihn im bestehenden Fenster an.
+        Ist die Eingabe kein Studenten-Code, wird der beste Treffer der Suche angezeigt.
+        """
+        student_code = code_eingabe.get().strip()
+        if not student_code:
+            return
+        suche = db_handler.get_studentensuche()
+        if not suche.ist_code(student_code):
+            treffer = suche.suchen(student_code, limit=1)
+            if not treffer:
+                status_label.config(text=f"Kein Student zu {student_code} gefunden.")
+                return
+            student_code = treffer[0][0]
+        start = time.perf_counter()
+        neues_viewmodel = viewmodel_laden(student_code)
+        if neues_viewmodel is None:
+            status_label.config(text=f"Kein Student mit dem Code {student_code} gefunden.")
+            return
+        anzeigen(neues_viewmodel)
+        status_label.config(text=f"Student {student_code} angezeigt ({(time.perf_counter() - start) * 1000:.0f} ms).")
+
+    anzeigen_button.config(command=wechseln)
+    code_eingabe.bind("<Return>", wechseln)
+    code_eingabe.bind("<KeyRelease>", vorschlagen)
+    vorschlag_liste.bind("<<ListboxSelect>>", vorschlag_waehlen)
+
+    anzeigen(viewmodel)
     root.mainloop()
-
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# dashboarddaten.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die Umwandlung von NumPy-Werten
+import pandas as pd  # Für Datenverarbeitung
+from collections import Counter  # Für die Anzahl abgeschlossener Module je Prüfungsform
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+
+# Teilbereiche der Dashboard-Daten, die als eigene Endpunkte abrufbar sind
+TEILE = ("info", "module", "pruefungsformen", "credits", "noten")
+
+
+def json_wert(wert):
+    """
+    Wandelt Werte, die json nicht direkt kennt (NumPy-Zahlen, Zeitstempel), in JSON-taugliche Werte um.
+
+    :param wert: Der umzuwandelnde Wert.
+    :return: JSON-tauglicher Wert.
+    """
+    if isinstance(wert, np.generic):
+        return wert.item()
+    if isinstance(wert, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(wert).strftime('%Y-%m-%d')
+    raise TypeError(f"Nicht serialisierbarer Wert: {wert!r}")
+
+
+# Spalten der Modullisten im DashboardViewModel; abgeschlossene Module zusätzlich mit Note und Perzentil
+MODUL_FELDER = ("modul_code", "modul_name", "credits", "tutor", "pruefungsform")
+ABGESCHLOSSEN_FELDER = MODUL_FELDER + ("note", "perzentil")
+
+# Spalten der Credits je Plansemester
+SEMESTER_FELDER = ("semester_name", "gesamt_credits", "bestandene_credits")
+
+
+def _python_wert(wert):
+    """
+    Wandelt fehlende Werte in None und NumPy-Zahlen in Python-Zahlen um.
+
+    :param wert: Ein einzelner Wert.
+    :return: Python-Wert oder None.
+    """
+    if wert is None or pd.isna(wert):
+        return None
+    return wert.item() if isinstance(wert, np.generic) else wert
+
+
+def _python_liste(werte):
+    """
+    Wandelt eine Spalte (Series oder Array) in eine Liste von Python-Werten um, fehlende Werte werden zu None.
+
+    :param werte: Pandas Series, Pandas-Array oder NumPy-Array.
+    :return: Liste der Werte.
+    """
+    if isinstance(werte, pd.arrays.NumpyExtensionArray):
+        werte = werte.to_numpy()
+    liste = werte.tolist()
+    fehlt = pd.isna(werte)
+    if fehlt.any():
+        liste = [None if fehlt_wert else wert for wert, fehlt_wert in zip(liste, fehlt.tolist())]
+    return liste
+
+
+def _zeilen(data, felder):
+    """
+    Wandelt die angegebenen Spalten eines DataFrames (oder eines Dictionaries Spalte -> Array) in eine Liste
+    von Wertetupeln um, fehlende Werte werden zu None.
+
+    :param data: Pandas DataFrame, Dictionary Spalte -> Array oder None.
+    :param felder: Die zu übernehmenden Spalten.
+    :return: Liste von Tupeln (leer, falls keine Daten vorhanden sind).
+    """
+    if data is None or not len(data[felder[0]]):
+        return []
+    # Spaltenweise in Python-Werte umwandeln; bei den wenigen Zeilen je Student ist das deutlich günstiger
+    # als eine Umwandlung des ganzen DataFrames nach object
+    return list(zip(*[_python_liste(data[feld]) for feld in felder]))
+
+
+class DashboardViewModel:
+    """
+    Vorberechnete, darstellungsunabhängige Daten des Dashboards eines Studenten: Informationen, die drei
+    Modullisten als Wertetupel, die Anzahl abgeschlossener Module je Prüfungsform, die Credits je Plansemester
+    und die Kennzahlen. Das Objekt enthält nur Python-Werte (keine DataFrames und keinen DB-Handler), ist
+    daher günstig zu picklen und zu cachen und wird vom Tk-Dashboard, vom API-Server und vom Export genutzt.
+    """
+    def __init__(self, student_code: str, student_name: str, studiengang_code: str, studiengang: str,
+                 start_studium, zielnote: float, gebucht_nicht_abgeschlossen: list, offen: list, abgeschlossen: list,
+                 pruefungsformen: list, credits_pro_semester: list, notendurchschnitt: float,
+                 erreichte_credits: float, fehlende_credits: float):
+        """
+        Initialisiert das ViewModel mit bereits berechneten Werten.
+
+        :param student_code: Code des Studenten.
+        :param student_name: Name des Studenten.
+        :param studiengang_code: Code des Studiengangs oder None.
+        :param studiengang: Name des Studiengangs oder None.
+        :param start_studium: Startdatum des Studiums (Timestamp) oder None.
+        :param zielnote: Zielnote des Studenten oder None.
+        :param gebucht_nicht_abgeschlossen: Liste von Tupeln (MODUL_FELDER) der gebuchten, aber nicht abgeschlossenen Module.
+        :param offen: Liste von Tupeln (MODUL_FELDER) der noch nicht gebuchten Module.
+        :param abgeschlossen: Liste von Tupeln (ABGESCHLOSSEN_FELDER) der abgeschlossenen Module.
+        :param pruefungsformen: Liste von Paaren (Prüfungsform, Anzahl), absteigend nach Anzahl.
+        :param credits_pro_semester: Liste von Tupeln (SEMESTER_FELDER).
+        :param notendurchschnitt: Auf zwei Stellen gerundeter Notendurchschnitt oder None.
+        :param erreichte_credits: Summe der Credits der abgeschlossenen Module.
+        :param fehlende_credits: Fehlende Credits bis zu den benötigten Credits des Studiengangs.
+        """
+        self.student_code = student_code
+        self.student_name = student_name
+        self.studiengang_code = studiengang_code
+        self.studiengang = studiengang
+        self.start_studium = start_studium
+        self.zielnote = zielnote
+        self.gebucht_nicht_abgeschlossen = gebucht_nicht_abgeschlossen
+        self.offen = offen
+        self.abgeschlossen = abgeschlossen
+        self.pruefungsformen = pruefungsformen
+        self.credits_pro_semester = credits_pro_semester
+        self.notendurchschnitt = notendurchschnitt
+        self.erreichte_credits = erreichte_credits
+        self.fehlende_credits = fehlende_credits
+
+    @property
+    def abstand_zielnote(self):
+        """
+        Abstand des Notendurchschnitts zur Zielnote; positive Werte bedeuten, dass der Durchschnitt
+        schlechter als die Zielnote ist.
+
+        :return: Auf zwei Stellen gerundeter Abstand oder None, falls Zielnote oder Durchschnitt fehlen.
+        """
+        if self.zielnote is None or self.notendurchschnitt is None:
+            return None
+        return round(self.notendurchschnitt - self.zielnote, 2)
+
+    def als_dict(self, teil: str = None):
+        """
+        Gibt die Daten als JSON-taugliches Dictionary zurück (Format der API und des Exports).
+
+        :param teil: Optionaler Teilbereich (siehe TEILE); ohne Angabe werden alle Bereiche geliefert.
+        :return: Dictionary mit den Dashboard-Daten bzw. dem Teilbereich.
+        """
+        teile = TEILE if teil is None else (teil,)
+        daten = {}
+        if "info" in teile:
+            daten["info"] = {
+                "student_code": self.student_code,
+                "student_name": self.student_name,
+                "studiengang": self.studiengang,
+                "start_studium": self.start_studium,
+                "zielnote": self.zielnote
+            }
+        if "module" in teile:
+            daten["module"] = {
+                "gebucht_nicht_abgeschlossen": [dict(zip(MODUL_FELDER, zeile)) for zeile in self.gebucht_nicht_abgeschlossen],
+                "offen": [dict(zip(MODUL_FELDER, zeile)) for zeile in self.offen],
+                "abgeschlossen": [dict(zip(ABGESCHLOSSEN_FELDER, zeile)) for zeile in self.abgeschlossen]
+            }
+        if "pruefungsformen" in teile:
+            daten["pruefungsformen"] = dict(self.pruefungsformen)
+        if "credits" in teile:
+            daten["credits"] = [dict(zip(SEMESTER_FELDER, zeile)) for zeile in self.credits_pro_semester]
+        if "noten" in teile:
+            daten["noten"] = {
+                "zielnote": self.zielnote,
+                "notendurchschnitt": self.notendurchschnitt,
+                "erreichte_credits": self.erreichte_credits,
+                "fehlende_credits": self.fehlende_credits
+            }
+        return daten if teil is None else daten[teil]
+
+
+def dashboard_viewmodel(dbhandler: DBZugriff, student_code: str):
+    """
+    Berechnet das DashboardViewModel eines Studenten. Es werden keine Student- oder Modulbuchung-Objekte
+    und keine Zwischen-DataFrames aufgebaut, sondern nur die Indizes und aufgelösten Fremdschlüssel der
+    geladenen Tabellen abgefragt; die Werte entsprechen denen der get_*-Methoden von DBZugriff.
+
+    :param dbhandler: Instanz von DBZugriff mit den geladenen Daten.
+    :param student_code: Code des Studenten.
+    :return: DashboardViewModel oder None, falls der Student nicht existiert.
+    """
+    data = dbhandler.read_data()
+    if "student.csv" not in data:
+        print("Studenten-Daten konnten nicht geladen werden.")
+        return None
+    student_positionen = dbhandler.positionen("student.csv", {"student_code": student_code})
+    if not len(student_positionen):
+        return None
+    student = data["student.csv"]
+    student_position = student_positionen[0]
+
+    # Studiengang des Studenten (für Info, Semesterplot und fehlende Credits)
+    studiengang_code, studiengang_position = None, None
+    studiengang_positionen = dbhandler.positionen("student_studiengang.csv", {"student_code": student_code}) \
+        if "student_studiengang.csv" in data else []
+    if len(studiengang_positionen):
+        studiengang_code = _python_wert(data["student_studiengang.csv"]["studiengang_code"].iat[studiengang_positionen[0]])
+        treffer = dbhandler.positionen("studiengang.csv", {"studiengang_code": studiengang_code}) \
+            if "studiengang.csv" in data else []
+        if len(treffer):
+            studiengang_position = treffer[0]
+    studiengang = data.get("studiengang.csv")
+
+    # Abgeschlossene Module mit dem Perzentil der Note innerhalb aller Ergebnisse des Moduls
+    completed_modules = dbhandler.modulbuchungen_verbinden(student_code, True, ["modul_code", "note"])
+    has_completed = completed_modules is not None and len(completed_modules["modul_code"]) > 0
+    abgeschlossen = []
+    pruefungsformen = []
+    total_credits, average_grade = 0, None
+    if has_completed:
+        modulstatistik = dbhandler.get_modulstatistik()
+        abgeschlossen = [zeile + (_python_wert(modulstatistik.perzentil(zeile[0], zeile[5])),)
+                         for zeile in _zeilen(completed_modules, ABGESCHLOSSEN_FELDER[:-1])]
+        # Anzahl je Prüfungsform absteigend, bei Gleichstand in der Reihenfolge des ersten Auftretens (wie value_counts)
+        formen = Counter(zeile[4] for zeile in abgeschlossen if zeile[4] is not None)
+        pruefungsformen = [(str(form), int(anzahl)) for form, anzahl in formen.most_common()]
+        # Summe und Mittelwert wie bei den Spalten eines DataFrames (fehlende Werte werden übersprungen)
+        total_credits = _python_wert(pd.Series(completed_modules["credits"]).sum())
+        average_grade = _python_wert(round(pd.Series(completed_modules["note"]).mean(), 2))
+
+    credits_per_semester = dbhandler.get_credits_per_semester(student_code, studiengang_code)
+    erforderliche_credits = _python_wert(studiengang["benötigte_credits"].iat[studiengang_position]) \
+        if studiengang_position is not None else 0
+
+    # Noch nicht gebuchte Module des Studiengangs
+    offen = []
+    offen_positionen = dbhandler.nicht_gebuchte_module(student_code)
+    if offen_positionen is not None:
+        modul = data["modul.csv"]
+        offen = _zeilen({feld: modul[feld].array.take(offen_positionen) for feld in MODUL_FELDER}, MODUL_FELDER)
+
+    return DashboardViewModel(
+        student_code=student_code,
+        student_name=_python_wert(student["student_name"].iat[student_position]),
+        studiengang_code=studiengang_code,
+        studiengang=_python_wert(studiengang["studiengang_name"].iat[studiengang_position]) if studiengang_position is not None else None,
+        start_studium=_python_wert(student["start_studium"].iat[student_position]),
+        zielnote=_python_wert(student["zielnote"].iat[student_position]),
+        gebucht_nicht_abgeschlossen=_zeilen(dbhandler.modulbuchungen_verbinden(student_code, False, ["modul_code"]), MODUL_FELDER),
+        offen=offen,
+        abgeschlossen=abgeschlossen,
+        pruefungsformen=pruefungsformen,
+        credits_pro_semester=_zeilen(credits_per_semester, SEMESTER_FELDER),
+        notendurchschnitt=average_grade,
+        erreichte_credits=total_credits,
+        fehlende_credits=erforderliche_credits - total_credits
+    )
+
+
+def dashboard_daten(dbhandler: DBZugriff, student_code: str, teil: str = None):
+    """
+    Ermittelt die Daten, die run_dashboard für einen Studenten anzeigt, als JSON-taugliches Dictionary.
+
+    :param dbhandler: Instanz von DBZugriff mit den geladenen Daten.
+    :param student_code: Code des Studenten.
+    :param teil: Optionaler Teilbereich (siehe TEILE); ohne Angabe werden alle Bereiche geliefert.
+    :return: Dictionary mit den Dashboard-Daten oder None, falls der Student nicht existiert.
+    """
+    viewmodel = dashboard_viewmodel(dbhandler, student_code)
+    return viewmodel.als_dict(teil) if viewmodel is not None else None
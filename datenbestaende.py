@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# datenbestaende.py
+
+# Importiere notwendige Module und Klassen
+import itertools  # Für fortlaufende Ladenummern
+import os  # Für das Durchsuchen des Basisverzeichnisses
+from collections import OrderedDict  # Für die LRU-Reihenfolge der geladenen Datenbestände
+from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+from speicher import Speicherbudget  # Messung des Speicherbedarfs
+
+
+class Datenbestaende:
+    """
+    Verwaltet mehrere Datenbestände (z. B. je Fakultät oder Semesterstand), jeweils ein Verzeichnis mit
+    den CSV-Dateien. Ein Datenbestand wird beim ersten Zugriff geladen; unter einem Speicherbudget bzw. einer
+    Höchstzahl geladener Bestände werden die am längsten nicht genutzten Bestände verworfen und bei
+    Bedarf neu geladen. Jeder Ladevorgang erhält eine fortlaufende Nummer, sodass Caches erkennen,
+    dass ein Bestand zwischenzeitlich neu geladen wurde.
+    """
+    def __init__(self, verzeichnisse: dict, budget_mb: float = None, max_geladen: int = None, engine: str = "auto",
+                 reservierte_namen=()):
+        """
+        Initialisiert die Verwaltung.
+
+        :param verzeichnisse: Dictionary Name des Datenbestands -> Datenverzeichnis.
+        :param budget_mb: Optionales Speicherbudget in Megabyte für alle geladenen Bestände zusammen.
+        :param max_geladen: Optionale Höchstzahl gleichzeitig geladener Bestände.
+        :param engine: CSV-Engine für CSVZugriff.
+        :param reservierte_namen: Namen, die nicht als Datenbestand registriert werden (z. B. Endpunkte des
+                                  API-Servers); solche Verzeichnisse werden mit einer Meldung übergangen.
+        """
+        self.verzeichnisse = {}
+        for name, verzeichnis in verzeichnisse.items():
+            if name in reservierte_namen:
+                print(f"Datenbestand {name} wird übergangen: Der Name ist reserviert.")
+            else:
+                self.verzeichnisse[name] = verzeichnis
+        self.budget = int(budget_mb * 1e6) if budget_mb is not None else None
+        self.max_geladen = max_geladen
+        self.engine = engine
+
+        # Geladene Bestände in LRU-Reihenfolge (zuletzt genutzt am Ende): Name -> DBZugriff
+        self.geladen = OrderedDict()
+
+        # Ladenummer je geladenem Bestand und gemessener Speicherbedarf in Bytes
+        self.ladungen = {}
+        self.groessen = {}
+        self._ladenummern = itertools.count(1)
+
+    @classmethod
+    def aus_verzeichnis(cls, basis: str, **kwargs):
+        """
+        Legt die Verwaltung für alle Unterverzeichnisse eines Basisverzeichnisses an, die eine student.csv enthalten.
+
+        :param basis: Basisverzeichnis mit einem Unterverzeichnis je Datenbestand.
+        :param kwargs: Weitere Parameter für den Konstruktor (budget_mb, max_geladen, engine, reservierte_namen).
+        :return: Datenbestaende-Objekt.
+        """
+        verzeichnisse = {
+            name: os.path.join(basis, name) for name in sorted(os.listdir(basis))
+            if os.path.isfile(os.path.join(basis, name, "student.csv"))
+        }
+        return cls(verzeichnisse, **kwargs)
+
+    def namen(self):
+        """
+        Gibt die Namen aller verfügbaren Datenbestände zurück.
+
+        :return: Liste der Namen.
+        """
+        return list(self.verzeichnisse)
+
+    def get(self, name: str):
+        """
+        Gibt den DBZugriff eines Datenbestands zurück und lädt ihn bei Bedarf. Danach werden gegebenenfalls
+        andere, länger nicht genutzte Bestände verworfen.
+
+        :param name: Name des Datenbestands.
+        :return: DBZugriff-Objekt mit geladenen Daten oder None, falls der Bestand unbekannt ist.
+        """
+        dbhandler = self.geladen.get(name)
+        if dbhandler is not None:
+            self.geladen.move_to_end(name)
+            return dbhandler
+        if name not in self.verzeichnisse:
+            return None
+
+        dbhandler = DBZugriff(CSVZugriff(engine=self.engine, data_dir=self.verzeichnisse[name]))
+        dbhandler.read_data()
+        self.geladen[name] = dbhandler
+        self.ladungen[name] = next(self._ladenummern)
+        print(f"Datenbestand {name} geladen.")
+        self.einhalten()
+        return dbhandler
+
+    def version(self, name: str):
+        """
+        Gibt eine Versionskennung eines geladenen Bestands zurück, die sich bei jedem Neuladen und
+        jedem Commit ändert.
+
+        :param name: Name des Datenbestands.
+        :return: Zeichenkette "Ladenummer.Datenversion" oder None, falls der Bestand nicht geladen ist.
+        """
+        dbhandler = self.geladen.get(name)
+        if dbhandler is None:
+            return None
+        return f"{self.ladungen[name]}.{dbhandler.data_version}"
+
+    def verwerfen(self, name: str):
+        """
+        Verwirft einen geladenen Datenbestand; er wird beim nächsten Zugriff neu geladen.
+
+        :param name: Name des Datenbestands.
+        """
+        if self.geladen.pop(name, None) is not None:
+            self.ladungen.pop(name, None)
+            self.groessen.pop(name, None)
+            print(f"Datenbestand {name} verworfen.")
+
+    def einhalten(self):
+        """
+        Verwirft die am längsten nicht genutzten Bestände, bis Höchstzahl und Speicherbudget eingehalten
+        sind. Der zuletzt genutzte Bestand bleibt immer geladen.
+        """
+        if self.max_geladen is not None:
+            while len(self.geladen) > max(self.max_geladen, 1):
+                self.verwerfen(next(iter(self.geladen)))
+        if self.budget is None:
+            return
+
+        # Speicherbedarf neu messen, da Caches der Bestände seit dem Laden gewachsen sein können
+        self.groessen = {name: Speicherbudget.messen(dbhandler)["gesamt"] for name, dbhandler in self.geladen.items()}
+        while len(self.geladen) > 1 and sum(self.groessen.values()) > self.budget:
+            self.verwerfen(next(iter(self.geladen)))
+        if sum(self.groessen.values()) > self.budget:
+            print(f"Datenbestand {next(reversed(self.geladen))} überschreitet allein das Speicherbudget "
+                  f"({sum(self.groessen.values()) / 1e6:.1f} MB von {self.budget / 1e6:.1f} MB).")
+
+    def speicherbericht(self):
+        """
+        Misst den Speicherbedarf der geladenen Bestände.
+
+        :return: Dictionary Name -> Bytes (in LRU-Reihenfolge) und das Budget.
+        """
+        self.groessen = {name: Speicherbudget.messen(dbhandler)["gesamt"] for name, dbhandler in self.geladen.items()}
+        return {"geladen": dict(self.groessen), "budget": self.budget}
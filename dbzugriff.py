@@ -7,8 +7,13 @@
 #dbzugriff.py
 
 # Importiere notwendige Module und Klassen
+import os # Für den Pfad des Journals im Datenverzeichnis
+import numpy as np # Für Positionsarrays der Indizes
 import pandas as pd # Für Datenverarbeitung
 from csvzugriff import CSVZugriff # Klasse zum Arbeiten mit CSV-Dateien
+from fremdschluessel import fremdschluessel_aufloesen, verbinden_spalten # Beim Laden aufgelöste Fremdschlüssel
+from journal import Journal # Append-only-Journal für Schreibvorgänge
+from tabellenpuffer import Tabellenpuffer # Vorab reservierter Speicher für angehängte Modulbuchungen
 
 class DBZugriff:
     """
@@ -16,69 +21,230 @@ class DBZugriff:
     Studiengänge, Module und Semester. Sie dient als Schnittstelle, um spezifische Daten basierend
     auf bestimmten Kriterien abzurufen.
     """
-    def __init__(self, db_handler: CSVZugriff):
+    def __init__(self, db_handler, journal: Journal = None, kompaktieren_ab: int = 10000):
         """
         Initialisiert die DBZugriff-Klasse mit einer Instanz von CSVZugriff.
-        :param db_handler: Eine Instanz von CSVZugriff, die die CSV-Dateien verwaltet.
+        :param db_handler: Eine Instanz von CSVZugriff, die die CSV-Dateien verwaltet, oder das Verzeichnis
+                           eines Datenbestands (dann wird dafür ein CSVZugriff angelegt).
+        :param journal: Optionales Journal für Schreibvorgänge (Standard: modulbuchung.journal im Datenverzeichnis).
+        :param kompaktieren_ab: Anzahl committeter Journaleinträge, ab der das Journal in modulbuchung.csv übernommen wird.
         """
+        if isinstance(db_handler, str):
+            db_handler = CSVZugriff(data_dir=db_handler)
         self.db_handler = db_handler
+        self.data_dir = getattr(db_handler, "data_dir", None)
+        self.journal = journal if journal is not None else Journal(os.path.join(self.data_dir or "", "modulbuchung.journal"))
+        self.kompaktieren_ab = kompaktieren_ab
 
-    def read_data(self):
+        # Einmal geladene Tabellen; None, solange read_data noch nicht aufgerufen wurde
+        self.data = None
+
+        # Versionsnummer der geladenen Daten, wird bei jedem (Neu-)Laden und jedem Commit erhöht
+        self.data_version = 0
+
+        # Indizes je (Tabelle, Spalte): Wert -> Zeilenpositionen, werden bei Bedarf aufgebaut
+        self.indexes = {}
+
+        # Cache der Lehrpläne je studiengang_code, gemeinsam genutzt von allen Studenten eines Studiengangs
+        self.lehrplan_cache = {}
+
+        # Notenstatistik je Modul über alle Studenten, wird beim ersten Zugriff berechnet
+        self.modulstatistik = None
+
+        # Suchindex über Studenten-Codes und -Namen, wird beim ersten Zugriff aufgebaut
+        self.studentensuche = None
+
+        # Monatsreihen des Studienfortschritts aller Studenten, werden beim ersten Zugriff berechnet
+        self.lernverlauf = None
+
+        # Ranglisten über die Kohorte, werden beim ersten Zugriff berechnet und bei Schreibvorgängen angepasst
+        self.ranglisten = None
+
+        # Beim Laden aufgelöste Fremdschlüssel: (Quelltabelle, Quellspalte) -> Fremdschluessel
+        self.fremdschluessel = {}
+
+        # Beim Laden bereits gemeldete unbekannte Schlüssel: (Zieltabelle, Wert)
+        self.gemeldete_schluessel = set()
+
+        # Höchste vergebene Buchungsnummer, Grundlage für neue Buchungen
+        self.letzte_buchungsnummer = 0
+
+        # Spaltenpuffer der Modulbuchungen, wird beim ersten Anwenden von Journaleinträgen angelegt
+        self.modulbuchung_puffer = None
+
+    def read_data(self, reload: bool = False):
         """
-        Ruft die read_data-Methode von CSVZugriff auf.
+        Ruft die read_data-Methode von CSVZugriff einmalig auf und hält die Daten im Speicher.
+        Committete, noch nicht kompaktierte Journaleinträge werden danach auf die Modulbuchungen angewendet.
+        :param reload: Erzwingt ein erneutes Einlesen aller CSV-Dateien.
         :return: Dictionary mit den geladenen CSV-Daten.
         """
-        return self.db_handler.read_data()
-    
+        if self.data is None or reload:
+            self.data = self.db_handler.read_data()
+            self.data_version += 1
+
+            # Abgeleitete Strukturen gehören zur alten Datenversion
+            self.caches_leeren()
+            self.fremdschluessel = {}
+            self.modulbuchung_puffer = None
+
+            # Schreibvorgänge aus dem Journal nachspielen
+            if "modulbuchung.csv" in self.data:
+                eintraege = self.journal.lesen()
+                if eintraege:
+                    self._eintraege_anwenden(eintraege)
+                if not self.data["modulbuchung.csv"].empty:
+                    self.letzte_buchungsnummer = max(self.letzte_buchungsnummer, int(self.data["modulbuchung.csv"]["buchungsnummer"].max()))
+
+            # Fremdschlüssel einmalig auflösen und Integritätsfehler an dieser Stelle melden
+            self.fremdschluessel = fremdschluessel_aufloesen(self.data)
+            self.gemeldete_schluessel = {
+                (beziehung.ziel, wert) for beziehung in self.fremdschluessel.values() for wert in beziehung.verwaiste_werte
+            }
+        return self.data
+
+    def caches_leeren(self):
+        """
+        Verwirft alle bei Bedarf aufgebauten Strukturen (Indizes, Lehrpläne, Modulstatistik, Suchindex,
+        Lernverlauf, Ranglisten), z. B. um unter einem Speicherbudget Platz zu schaffen. Sie werden beim nächsten
+        Zugriff aus den geladenen Tabellen neu aufgebaut.
+        """
+        self.indexes = {}
+        self.lehrplan_cache = {}
+        self.modulstatistik = None
+        self.studentensuche = None
+        self.lernverlauf = None
+        self.ranglisten = None
+
+    def get_index(self, table: str, column: str):
+        """
+        Gibt den Index einer Spalte zurück und baut ihn beim ersten Zugriff auf.
+        :param table: Dateiname der Tabelle (z. B. "student.csv")
+        :param column: Name der indizierten Spalte
+        :return: Dictionary mit Spaltenwert als Schlüssel und aufsteigenden Zeilenpositionen als Wert
+        """
+        index = self.indexes.get((table, column))
+        if index is None:
+            index = self.data[table].groupby(column, sort=False).indices
+            self.indexes[(table, column)] = index
+        return index
+
+    def positionen(self, table: str, where: dict):
+        """
+        Ermittelt die Zeilenpositionen einer geladenen Tabelle, die alle Filter erfüllen.
+        Der erste Filter wird über den Index aufgelöst, weitere Filter nur auf den verbleibenden Zeilen geprüft.
+        :param table: Dateiname der Tabelle
+        :param where: Dictionary Spalte -> Wert oder Spalte -> Liste von Werten
+        :return: Aufsteigendes NumPy-Array von Zeilenpositionen
+        """
+        data = self.data[table]
+        positions = None
+        for column, value in where.items():
+            values = value if isinstance(value, (list, tuple, set, frozenset, np.ndarray, pd.Series)) else None
+            if positions is None:
+                index = self.get_index(table, column)
+                if values is None:
+                    positions = index.get(value, np.empty(0, dtype=np.intp))
+                else:
+                    treffer = [index[v] for v in set(values) if v in index]
+                    positions = np.sort(np.concatenate(treffer)) if treffer else np.empty(0, dtype=np.intp)
+            else:
+                # Direkt auf dem Array filtern, ohne eine Zwischen-Series aufzubauen
+                spalte = data[column].array.take(positions)
+                maske = spalte.isin(list(values)) if values is not None else spalte == value
+                positions = positions[np.asarray(maske, dtype=bool)]
+        return positions if positions is not None else np.arange(len(data))
+
+    def query(self, table: str, where: dict = None, columns: list = None, order_by=None):
+        """
+        Allgemeine Abfrage einer Tabelle mit Projektion und Filtern.
+        Gleichheitsfilter (Einzelwert) und In-Filter (Liste, Tupel, Menge) werden an die
+        Speicherschicht weitergereicht: Sind die Daten geladen, wird über einen Index gesucht,
+        andernfalls werden beim Einlesen nur die benötigten Spalten geparst.
+        Ohne Filter und Projektion wird die geladene Tabelle selbst zurückgegeben; das Ergebnis
+        ist daher nur lesend zu verwenden.
+        :param table: Dateiname der Tabelle (z. B. "modulbuchung.csv")
+        :param where: Optionales Dictionary Spalte -> Wert oder Spalte -> Liste von Werten
+        :param columns: Optionale Liste der zurückzugebenden Spalten
+        :param order_by: Optionale Spalte oder Liste von Spalten für eine stabile Sortierung
+        :return: Pandas DataFrame mit den Originalzeilenlabels oder None, falls die Tabelle nicht geladen werden kann
+        """
+        where = where or {}
+        order_columns = [order_by] if isinstance(order_by, str) else list(order_by or [])
+
+        if self.data is not None:
+            data = self.data.get(table)
+            if data is None:
+                print(f"Tabelle {table} konnte nicht geladen werden.")
+                return None
+        else:
+            # Nur die Spalten einlesen, die für Ergebnis, Filter und Sortierung gebraucht werden
+            usecols = None
+            if columns is not None:
+                usecols = list(dict.fromkeys([*columns, *where, *order_columns]))
+            try:
+                data = self.db_handler.read_table(table, usecols=usecols)
+            except Exception as e:
+                print(f"Fehler beim Laden von {table}: {e}")
+                return None
+
+        if self.data is not None:
+            # Filter über die Indizes der geladenen Tabelle
+            result = data.iloc[self.positionen(table, where)] if where else data
+        else:
+            result = data
+            for column, value in where.items():
+                if isinstance(value, (list, tuple, set, frozenset, np.ndarray, pd.Series)):
+                    result = result[result[column].isin(value)]
+                else:
+                    result = result[result[column] == value]
+
+        if order_columns:
+            result = result.sort_values(order_columns, kind="stable")
+        if columns is not None:
+            result = result[list(columns)]
+        return result
+
     def get_student(self, student_code: str):
         """
         Gibt die Daten eines Studenten basierend auf dem student_code zurück.
         :param student_code: Code des Studenten
         :return: Pandas DataFrame mit den Daten des Studenten
         """
-        student_data = self.db_handler.read_data().get("student.csv")
-        if student_data is not None:
-            # Da student_code bereits als str eingelesen wird, ist keine Konvertierung nötig
-            return student_data[student_data["student_code"] == student_code]
-        else:
+        # Da student_code bereits als str eingelesen wird, ist keine Konvertierung nötig
+        student_data = self.query("student.csv", where={"student_code": student_code})
+        if student_data is None:
             print("Studenten-Daten konnten nicht geladen werden.")
-            return None
+        return student_data
+
 
-    
     def get_studiengang(self, student_code: str):
         """
         Gibt die Daten aller Studiengänge zurück.
         :return: Pandas DataFrame mit den Studiengangdaten
         """
-        studiengang_data = self.db_handler.read_data().get("studiengang.csv")
-        if studiengang_data is not None:
-            return studiengang_data
-        else:
+        studiengang_data = self.query("studiengang.csv")
+        if studiengang_data is None:
             print("Studiengang-Daten konnten nicht geladen werden.")
-            return None
-    
-                
+        return studiengang_data
+
+
     def get_modul(self, modul_code: str):
         """
         Gibt die Daten eines Moduls basierend auf dem modul_code zurück.
         :param modul_code: Der Code des Moduls.
         :return: Ein Pandas DataFrame mit den Moduldaten oder ein leeres DataFrame, wenn das Modul nicht gefunden wird.
         """
-        try:
-            modul_data = self.read_data().get("modul.csv")
-            if modul_data is not None and not modul_data.empty:
-                modul_row = modul_data[modul_data["modul_code"] == modul_code]
-                if not modul_row.empty:
-                    return modul_row  # Rückgabe als DataFrame
-                else:
-                    print(f"Kein Modul mit modul_code={modul_code} gefunden.")
-                    return pd.DataFrame()  # Leeres DataFrame zurückgeben
-            else:
-                print("Keine Daten für modul.csv gefunden.")
-                return pd.DataFrame()  # Leeres DataFrame zurückgeben
-        except Exception as e:
-            print(f"Fehler beim Laden von modul.csv: {e}")
-            return pd.DataFrame()  # Leeres DataFrame bei Fehler
+        modul_row = self.query("modul.csv", where={"modul_code": modul_code})
+        if modul_row is None:
+            print("Keine Daten für modul.csv gefunden.")
+            return pd.DataFrame()  # Leeres DataFrame zurückgeben
+        if modul_row.empty:
+            # Bereits beim Laden gemeldete unbekannte Modulkodes nicht erneut melden
+            if ("modul.csv", modul_code) not in self.gemeldete_schluessel:
+                print(f"Kein Modul mit modul_code={modul_code} gefunden.")
+            return pd.DataFrame()  # Leeres DataFrame zurückgeben
+        return modul_row  # Rückgabe als DataFrame
 
 
     def get_modulbuchung(self, student_code: str):
@@ -87,12 +253,10 @@ class DBZugriff:
         :param student_code: Code des Studenten
         :return: Pandas DataFrame mit den Modulbuchungen
         """
-        modulbuchung_data = self.db_handler.read_data().get("modulbuchung.csv")
-        if modulbuchung_data is not None:
-            return modulbuchung_data[modulbuchung_data["student_code"] == student_code]
-        else:
+        modulbuchung_data = self.query("modulbuchung.csv", where={"student_code": student_code})
+        if modulbuchung_data is None:
             print("Studenten-Daten konnten nicht geladen werden.")
-            return None
+        return modulbuchung_data
 
     def get_semester(self, semester_code=None):
         """
@@ -100,22 +264,17 @@ class DBZugriff:
         :param semester_code: Optionaler Semester-Code, um ein bestimmtes Semester zu filtern.
         :return: Pandas DataFrame mit den Semesterdaten oder einem leeren DataFrame, wenn kein Ergebnis gefunden wird.
         """
-        semester_data = self.db_handler.read_data().get("semester.csv")
-        
+        # Wenn kein semester_code angegeben ist, alle Daten zurückgeben
+        where = {"semester_code": semester_code} if semester_code is not None else None
+        semester_data = self.query("semester.csv", where=where)
+
         if semester_data is None:
             print("Semester-Daten konnten nicht geladen werden.")
             return pd.DataFrame()  # Gib einen leeren DataFrame zurück, falls keine Daten geladen werden konnten.
-        
-        # Wenn kein semester_code angegeben ist, alle Daten zurückgeben
-        if semester_code is None:
-            return semester_data
-        
-        # Nach semester_code filtern
-        filtered_data = semester_data[semester_data["semester_code"] == semester_code]
-        
-        if filtered_data.empty:
+
+        if semester_code is not None and semester_data.empty:
             print(f"Kein Semester mit dem Code {semester_code} gefunden.")
-        return filtered_data
+        return semester_data
 
     def get_semester_modul(self, semester_code: str):
         """
@@ -123,16 +282,11 @@ class DBZugriff:
         :param semester_code: Der Code des Semesters.
         :return: Pandas DataFrame mit den Modulzuordnungen oder ein leeres DataFrame, falls keine Daten vorhanden sind.
         """
-        try:
-            semester_modul_data = self.db_handler.read_data().get("semester_modul.csv")
-            if semester_modul_data is not None and not semester_modul_data.empty:
-                return semester_modul_data[semester_modul_data["semester_code"] == semester_code]
-            else:
-                print("Keine Daten für semester_modul.csv gefunden.")
-                return pd.DataFrame()  # Leeres DataFrame zurückgeben
-        except Exception as e:
-            print(f"Fehler beim Laden von semester_modul.csv: {e}")
-            return pd.DataFrame()  # Leeres DataFrame bei Fehler
+        semester_modul_data = self.query("semester_modul.csv", where={"semester_code": semester_code})
+        if semester_modul_data is None:
+            print("Keine Daten für semester_modul.csv gefunden.")
+            return pd.DataFrame()  # Leeres DataFrame zurückgeben
+        return semester_modul_data
 
     def get_student_studiengang(self, student_code: str):
         """
@@ -140,13 +294,11 @@ class DBZugriff:
         :param student_code: Code des Studenten
         :return: Pandas DataFrame mit den Studiengängen
         """
-        student_studiengang_data = self.db_handler.read_data().get("student_studiengang.csv")
-        if student_studiengang_data is not None:
-            return student_studiengang_data[student_studiengang_data["student_code"] == student_code]
-        else:
+        student_studiengang_data = self.query("student_studiengang.csv", where={"student_code": student_code})
+        if student_studiengang_data is None:
             print("Studiumsdaten-Daten konnten nicht geladen werden.")
-            return None
-            
+        return student_studiengang_data
+
 
     def get_studiengang_semester(self, studiengang_code: str):
         """
@@ -154,12 +306,143 @@ class DBZugriff:
         :param studiengang_code: Code des Studiengangs
         :return: Pandas DataFrame mit den Studiengängen
         """
-        studiengang_semester_data = self.db_handler.read_data().get("studiengang_semester.csv")
-        if studiengang_semester_data is not None:
-            return studiengang_semester_data[studiengang_semester_data["studiengang_code"] == studiengang_code]
-        else:
+        studiengang_semester_data = self.query("studiengang_semester.csv", where={"studiengang_code": studiengang_code})
+        if studiengang_semester_data is None:
             print("Studiumsdaten_Semester-Daten konnten nicht geladen werden.")
+        return studiengang_semester_data
+
+    def get_lehrplan(self, studiengang_code: str):
+        """
+        Gibt den Lehrplan (Studiengang → Semester → Module) eines Studiengangs zurück.
+        Der Lehrplan wird beim ersten Zugriff aufgebaut und danach aus dem Cache geliefert.
+        :param studiengang_code: Code des Studiengangs
+        :return: Lehrplan-Objekt
+        """
+        lehrplan = self.lehrplan_cache.get(studiengang_code)
+        if lehrplan is None:
+            # Lokaler Import, da lehrplan.py über semester.py wiederum dbzugriff.py importiert
+            from lehrplan import Lehrplan
+            lehrplan = Lehrplan.aus_daten(studiengang_code, self.read_data(), self.fremdschluessel)
+            self.lehrplan_cache[studiengang_code] = lehrplan
+        return lehrplan
+
+    def get_modulstatistik(self):
+        """
+        Gibt die Notenstatistik je Modul über alle Studenten zurück.
+        Die Statistik wird einmal je Datenversion berechnet und danach aus dem Cache geliefert.
+        :return: Modulstatistik-Objekt
+        """
+        if self.modulstatistik is None:
+            from modulstatistik import Modulstatistik
+            self.modulstatistik = Modulstatistik(self.read_data()["modulbuchung.csv"])
+        return self.modulstatistik
+
+    def get_studentensuche(self):
+        """
+        Gibt den Suchindex über Studenten-Codes und -Namen zurück.
+        Der Index wird einmal je Datenversion aufgebaut und danach aus dem Cache geliefert.
+        :return: Studentensuche-Objekt
+        """
+        if self.studentensuche is None:
+            from studentensuche import Studentensuche
+            self.studentensuche = Studentensuche(self.read_data()["student.csv"])
+        return self.studentensuche
+
+    def get_lernverlauf(self, student_code: str):
+        """
+        Gibt den Studienfortschritt eines Studenten je Kalendermonat seit Studienbeginn zurück.
+        Die Reihen werden einmal je Datenversion für alle Studenten gemeinsam berechnet.
+        :param student_code: Der Code des Studenten.
+        :return: Pandas DataFrame mit den Spalten monat, credits, kumulierte_credits, durchschnitt und
+                 gleitender_durchschnitt oder None.
+        """
+        if self.lernverlauf is None:
+            data = self.read_data()
+            beziehung = self.fremdschluessel.get(("modulbuchung.csv", "modul_code"))
+            if beziehung is None or "student.csv" not in data:
+                print("Fehler beim Laden der Daten.")
+                return None
+            from lernverlauf import Lernverlauf
+            self.lernverlauf = Lernverlauf(data, beziehung)
+        return self.lernverlauf.fuer_student(student_code)
+
+    def get_ranglisten(self):
+        """
+        Gibt die Ranglisten über die Kohorte zurück (beste Notendurchschnitte, meiste fehlende Credits,
+        niedrigste Bestehensquoten). Sie werden einmal berechnet und bei neuen Prüfungsergebnissen angepasst.
+        :return: Ranglisten-Objekt
+        """
+        if self.ranglisten is None:
+            from ranglisten import Ranglisten
+            self.ranglisten = Ranglisten(self.read_data())
+        return self.ranglisten
+
+    def get_credits_per_semester(self, student_code: str, studiengang_code: str = None):
+        """
+        Gibt die gesamten und die bestandenen Credits eines Studenten je Plansemester zurück.
+        Die gesamten Credits stammen aus dem vorberechneten Lehrplan, nur die bestandenen
+        Credits werden studentenspezifisch ermittelt.
+        :param student_code: Der Code des Studenten.
+        :param studiengang_code: Optionaler Code des Studiengangs; wird sonst über student_studiengang ermittelt.
+        :return: Pandas DataFrame mit den Spalten semester_name, gesamt_credits und bestandene_credits oder None.
+        """
+        if studiengang_code is None:
+            student_studiengang_data = self.get_student_studiengang(student_code)
+            if student_studiengang_data is None or student_studiengang_data.empty:
+                print(f"Kein Studiengang für den Studenten {student_code} gefunden.")
+                return None
+            studiengang_code = student_studiengang_data.iloc[0]["studiengang_code"]
+
+        # Gemeinsam genutzten Lehrplan des Studiengangs laden
+        lehrplan = self.get_lehrplan(studiengang_code)
+        if not lehrplan.semester:
+            print(f"Keine Semester für den Studiengang {studiengang_code} gefunden.")
+            return None
+
+        # Modulkodes der abgeschlossenen Modulbuchungen des Studenten (ohne Modul-Details)
+        completed_modules = self.modulbuchungen_verbinden(student_code, True, ["modul_code"], [])
+        if completed_modules is None or not len(completed_modules["modul_code"]):
+            print(f"Keine abgeschlossenen Module für den Studenten {student_code} gefunden.")
             return None
+        completed_modul_codes = set(completed_modules["modul_code"])
+
+        semester_total_credits = {}
+        semester_completed_credits = {}
+        for semester in lehrplan.semester:
+            semester_total_credits[semester.semester_name] = semester.gesamt_credits
+            semester_completed_credits[semester.semester_name] = sum(
+                modul.credits for modul in semester.module if modul.modul_code in completed_modul_codes
+            )
+
+        semesters = list(semester_total_credits.keys())
+        return pd.DataFrame({
+            "semester_name": semesters,
+            "gesamt_credits": [semester_total_credits[sem] for sem in semesters],
+            "bestandene_credits": [semester_completed_credits[sem] for sem in semesters]
+        })
+
+    def modulbuchungen_verbinden(self, student_code: str, bestanden: bool, quell_spalten: list,
+                                 ziel_spalten: list = ("modul_name", "credits", "tutor", "pruefungsform")):
+        """
+        Verknüpft die bestandenen bzw. nicht bestandenen Modulbuchungen eines Studenten über den vorab aufgelösten
+        Fremdschlüssel mit den Modul-Details (wie ein Left-Join) und gibt die Spalten ohne DataFrame-Aufbau zurück.
+        :param student_code: Der Code des Studenten.
+        :param bestanden: True für abgeschlossene, False für gebuchte, aber nicht abgeschlossene Module.
+        :param quell_spalten: Spalten aus modulbuchung.csv.
+        :param ziel_spalten: Spalten aus modul.csv (ohne Treffer NaN).
+        :return: Dictionary Spalte -> Array oder None, falls die Daten nicht geladen werden können.
+        """
+        data = self.read_data()
+        beziehung = self.fremdschluessel.get(("modulbuchung.csv", "modul_code"))
+
+        if beziehung is None:
+            print("Fehler beim Laden der Daten.")
+            return None
+
+        # Filtere die Modulbuchungen nach dem student_code und dem Prüfungsergebnis
+        # Hier nehmen wir an, dass "bestanden" entweder True oder False ist
+        positions = self.positionen("modulbuchung.csv", {"student_code": student_code, "bestanden": bestanden})
+        return verbinden_spalten(data, beziehung, positions, list(quell_spalten), list(ziel_spalten))
 
     def get_completed_modules(self, student_code: str):
         """
@@ -167,27 +450,12 @@ class DBZugriff:
         :param student_code: Der Code des Studenten.
         :return: Liste von abgeschlossenen Modulen.
         """
-        # CSV-Daten laden
-        data = self.db_handler.read_data()
-        
-        # Notwendige DataFrames extrahieren
-        modul_data = data.get("modul.csv")
-        modulbuchung_data = data.get("modulbuchung.csv")
-        student_data = data.get("student.csv")
-        
-        if modul_data is not None and modulbuchung_data is not None and student_data is not None:
-            # Filtere die Modulbuchungen nach dem student_code und beständig = True
-            completed_modules = modulbuchung_data[(modulbuchung_data["student_code"] == student_code) &
-                                                  (modulbuchung_data["bestanden"] == True)]
-            
-            # Verknüpfe die abgeschlossenen Module mit den Modul-Details
-            completed_modules_details = completed_modules.merge(modul_data, on="modul_code", how="left")
-            
-            # Rückgabe der Liste der abgeschlossenen Module einschließlich der Note
-            return completed_modules_details[["modul_code", "modul_name", "credits", "tutor", "pruefungsform", "note"]]
-        else:
-            print("Fehler beim Laden der Daten.")
+        # Verknüpfe die abgeschlossenen Module über den vorab aufgelösten Fremdschlüssel mit den Modul-Details
+        spalten = self.modulbuchungen_verbinden(student_code, True, ["modul_code", "note"])
+        if spalten is None:
             return None
+        return pd.DataFrame({spalte: spalten[spalte] for spalte in
+                             ["modul_code", "modul_name", "credits", "tutor", "pruefungsform", "note"]})
 
     def get_booked_but_not_completed_modules(self, student_code: str):
         """
@@ -195,78 +463,361 @@ class DBZugriff:
         :param student_code: Der Code des Studenten.
         :return: Liste von gebuchten, aber nicht abgeschlossenen Modulen.
         """
-        # CSV-Daten laden
-        data = self.db_handler.read_data()
-        
-        # Notwendige DataFrames extrahieren
-        modul_data = data.get("modul.csv")
-        modulbuchung_data = data.get("modulbuchung.csv")
-        
-        if modul_data is not None and modulbuchung_data is not None:
-            # Filtere die Modulbuchungen nach dem student_code und nicht bestanden (bestanden == False)
-            # Hier nehmen wir an, dass "bestanden" entweder True oder False ist
-            booked_not_completed_modules = modulbuchung_data[(modulbuchung_data["student_code"] == student_code) &
-                                                              (modulbuchung_data["bestanden"] == False)]
-            
-            # Verknüpfe die gebuchten, nicht abgeschlossenen Module mit den Modul-Details
-            booked_not_completed_modules_details = booked_not_completed_modules.merge(modul_data, on="modul_code", how="left")
-            
-            # Rückgabe der Liste der gebuchten, aber nicht abgeschlossenen Module
-            return booked_not_completed_modules_details[["modul_code", "modul_name", "credits", "tutor", "pruefungsform"]]
-        else:
+        # Verknüpfe die gebuchten, nicht abgeschlossenen Module über den vorab aufgelösten Fremdschlüssel
+        spalten = self.modulbuchungen_verbinden(student_code, False, ["modul_code"])
+        if spalten is None:
+            return None
+        return pd.DataFrame({spalte: spalten[spalte] for spalte in
+                             ["modul_code", "modul_name", "credits", "tutor", "pruefungsform"]})
+
+    def nicht_gebuchte_module(self, student_code: str):
+        """
+        Ermittelt die Zeilenpositionen der Module des Studiengangs in modul.csv, die der Student noch nicht gebucht hat.
+        :param student_code: Der Code des Studenten.
+        :return: Aufsteigendes Array von Zeilenpositionen in modul.csv oder None, falls kein Studiengang
+                 oder keine Semester gefunden werden.
+        """
+        data = self.read_data()
+        if any(table not in data for table in ("student_studiengang.csv", "modulbuchung.csv", "modul.csv")):
             print("Fehler beim Laden der Daten.")
             return None
 
+        # Schritt 1: Finde den Studiengang des Studenten
+        studiengang_positionen = self.positionen("student_studiengang.csv", {"student_code": student_code})
+        if not len(studiengang_positionen):
+            print(f"Kein Studiengang für Student {student_code} gefunden.")
+            return None
+
+        # Der Student ist genau einem Studiengang zugeordnet
+        studiengang_code = data["student_studiengang.csv"]["studiengang_code"].iat[studiengang_positionen[0]]
+
+        # Schritt 2: Alle Module des Studiengangs aus dem gemeinsam genutzten Lehrplan holen
+        lehrplan = self.get_lehrplan(studiengang_code)
+
+        if not lehrplan.semester:
+            print(f"Keine Semester für Studiengang {studiengang_code} gefunden.")
+            return None
+
+        # Schritt 3: Alle bereits gebuchten Module des Studenten finden
+        buchungs_positionen = self.positionen("modulbuchung.csv", {"student_code": student_code})
+        booked_modules = set(data["modulbuchung.csv"]["modul_code"].array.take(buchungs_positionen))
+
+        # Schritt 4: Filtere die Module des Studiengangs, die der Student noch nicht gebucht hat
+        not_booked_modules = [modul_code for modul_code in lehrplan.modul_codes if modul_code not in booked_modules]
+
+        # Schritt 5: Positionen der noch nicht gebuchten Module über den Index
+        return self.positionen("modul.csv", {"modul_code": not_booked_modules})
+
     def get_modules_not_booked_yet(self, student_code: str):
         """
         Gibt eine Liste der Module eines Studiengangs zurück, die der Student noch nicht gebucht hat.
         :param student_code: Der Code des Studenten.
         :return: Liste der Module, die der Student noch nicht gebucht hat.
         """
-        # CSV-Daten laden
-        data = self.db_handler.read_data()
-        
-        # Notwendige DataFrames extrahieren
-        modul_data = data.get("modul.csv")
-        modulbuchung_data = data.get("modulbuchung.csv")
-        student_studiengang_data = data.get("student_studiengang.csv")
-        studiengang_semester_data = data.get("studiengang_semester.csv")
-        semester_modul_data = data.get("semester_modul.csv")
-        
-        if modul_data is not None and modulbuchung_data is not None and student_studiengang_data is not None and studiengang_semester_data is not None and semester_modul_data is not None:
-            # Schritt 1: Finde den Studiengang des Studenten
-            studiengang_code = student_studiengang_data[student_studiengang_data["student_code"] == student_code]["studiengang_code"]
-            
-            if studiengang_code.empty:
-                print(f"Kein Studiengang für Student {student_code} gefunden.")
-                return None
-            
-            # Der Student ist genau einem Studiengang zugeordnet
-            studiengang_code = studiengang_code.iloc[0]
-            
-            # Schritt 2: Alle Semester des Studiengangs ermitteln
-            semester_codes = studiengang_semester_data[studiengang_semester_data["studiengang_code"] == studiengang_code]["semester_code"]
-            
-            if semester_codes.empty:
-                print(f"Keine Semester für Studiengang {studiengang_code} gefunden.")
-                return None
-            
-            # Schritt 3: Alle Module der Semester ermitteln
-            all_modules_in_study_program = semester_modul_data[semester_modul_data["semester_code"].isin(semester_codes)]["modul_code"].unique()
-            
-            # Schritt 4: Alle bereits gebuchten Module des Studenten finden
-            booked_modules = modulbuchung_data[modulbuchung_data["student_code"] == student_code]["modul_code"].unique()
-            
-            # Schritt 5: Filtere die Module des Studiengangs, die der Student noch nicht gebucht hat
-            not_booked_modules = [modul_code for modul_code in all_modules_in_study_program if modul_code not in booked_modules]
-            
-            # Schritt 6: Holt die Details der noch nicht gebuchten Module
-            not_booked_modules_details = modul_data[modul_data["modul_code"].isin(not_booked_modules)]
-            
-            # Rückgabe der Liste der Module, die der Student noch nicht gebucht hat
-            return not_booked_modules_details[["modul_code", "modul_name", "credits", "tutor", "pruefungsform"]]
-        else:
-            print("Fehler beim Laden der Daten.")
+        positions = self.nicht_gebuchte_module(student_code)
+        if positions is None:
+            return None
+
+        # Holt die Details der noch nicht gebuchten Module
+        return self.data["modul.csv"].iloc[positions][["modul_code", "modul_name", "credits", "tutor", "pruefungsform"]]
+
+    def modul_buchen(self, student_code: str, modul_code: str, buchungsdatum=None):
+        """
+        Bucht ein Modul für einen Studenten. Die Buchung wird im Journal vermerkt und mit dem
+        nächsten Commit in die Modulbuchungen übernommen.
+        :param student_code: Code des Studenten.
+        :param modul_code: Code des Moduls.
+        :param buchungsdatum: Optionales Buchungsdatum (Standard: heute).
+        :return: Die vergebene Buchungsnummer oder None, falls Student oder Modul nicht existieren.
+        """
+        self.read_data()
+        if not len(self.positionen("student.csv", {"student_code": student_code})):
+            print(f"Kein Student mit student_code={student_code} gefunden.")
+            return None
+        if not len(self.positionen("modul.csv", {"modul_code": modul_code})):
+            print(f"Kein Modul mit modul_code={modul_code} gefunden.")
             return None
 
+        self.letzte_buchungsnummer += 1
+        self._schreiben({
+            "op": "buchen",
+            "buchungsnummer": self.letzte_buchungsnummer,
+            "student_code": student_code,
+            "modul_code": modul_code,
+            "buchungsdatum": pd.Timestamp(buchungsdatum if buchungsdatum is not None else "today").strftime("%Y-%m-%d")
+        })
+        return self.letzte_buchungsnummer
 
+    def pruefungsversuch_erfassen(self, student_code: str, modul_code: str, pruefungsdatum=None):
+        """
+        Erfasst einen neuen Prüfungsversuch zur jüngsten Buchung eines Moduls. Der Versuchszähler
+        wird erhöht, eine vorherige Note zurückgesetzt und der Status auf "Bewertung offen" gesetzt.
+        Der Journaleintrag nennt die Buchungsnummer, damit er beim Nachspielen dieselbe Buchung trifft.
+        :param student_code: Code des Studenten.
+        :param modul_code: Code des Moduls.
+        :param pruefungsdatum: Optionales Prüfungsdatum (Standard: heute).
+        :return: Nummer des Prüfungsversuchs oder None, falls keine Buchung existiert.
+        """
+        buchung = self._juengste_buchung(student_code, modul_code)
+        if buchung is None:
+            print(f"Keine Buchung des Moduls {modul_code} für den Studenten {student_code} gefunden.")
+            return None
+
+        buchungsnummer, versuch = buchung
+        self._schreiben({
+            "op": "versuch",
+            "buchungsnummer": buchungsnummer,
+            "student_code": student_code,
+            "modul_code": modul_code,
+            "pruefungsversuch": versuch + 1,
+            "pruefungsdatum": pd.Timestamp(pruefungsdatum if pruefungsdatum is not None else "today").strftime("%Y-%m-%d")
+        })
+        return versuch + 1
+
+    def note_erfassen(self, student_code: str, modul_code: str, note: float, bestanden: bool = None):
+        """
+        Erfasst die Note zur jüngsten Buchung eines Moduls und schließt die Bewertung ab.
+        Der Journaleintrag nennt die Buchungsnummer, damit er beim Nachspielen dieselbe Buchung trifft.
+        :param student_code: Code des Studenten.
+        :param modul_code: Code des Moduls.
+        :param note: Die erzielte Note.
+        :param bestanden: Ob die Prüfung bestanden wurde (Standard: Note bis einschließlich 4,0).
+        :return: True bei Erfolg, False falls keine Buchung existiert.
+        """
+        buchung = self._juengste_buchung(student_code, modul_code)
+        if buchung is None:
+            print(f"Keine Buchung des Moduls {modul_code} für den Studenten {student_code} gefunden.")
+            return False
+
+        self._schreiben({
+            "op": "note",
+            "buchungsnummer": buchung[0],
+            "student_code": student_code,
+            "modul_code": modul_code,
+            "note": float(note),
+            "bestanden": bool(note <= 4.0) if bestanden is None else bool(bestanden)
+        })
+        return True
+
+    def commit(self):
+        """
+        Schreibt alle offenen Journaleinträge gemeinsam in die Journaldatei und wendet sie auf die
+        geladenen Modulbuchungen, Indizes, Fremdschlüssel und die Modulstatistik an.
+        Ab kompaktieren_ab committeten Einträgen wird das Journal in die Basistabelle übernommen.
+        :return: Anzahl der committeten Einträge.
+        """
+        self.read_data()
+        eintraege = self.journal.schreiben()
+        if not eintraege:
+            return 0
+        self._eintraege_anwenden(eintraege)
+        self.data_version += 1
+        if self.journal.anzahl >= self.kompaktieren_ab:
+            self.kompaktieren()
+        return len(eintraege)
+
+    def kompaktieren(self):
+        """
+        Schreibt die Modulbuchungen inklusive aller Journaleinträge nach modulbuchung.csv zurück
+        und leert anschließend das Journal. Da das Nachspielen des Journals idempotent ist, bleibt
+        der Datenbestand auch bei einem Abbruch zwischen beiden Schritten konsistent.
+        """
+        self.commit()
+        if self.journal.anzahl == 0:
+            return
+        try:
+            self.db_handler.write_table("modulbuchung.csv", self.data["modulbuchung.csv"])
+        except Exception as e:
+            print(f"Fehler beim Schreiben von modulbuchung.csv: {e}")
+            return
+        self.journal.leeren()
+
+    def _schreiben(self, eintrag: dict):
+        """
+        Nimmt einen Eintrag in das Journal auf und committet, sobald der Batch voll ist.
+        :param eintrag: Der Journaleintrag.
+        """
+        if self.journal.anhaengen(eintrag):
+            self.commit()
+
+    def _juengste_buchung(self, student_code: str, modul_code: str):
+        """
+        Ermittelt die jüngste Buchung eines Moduls und deren aktuellen Prüfungsversuch unter
+        Berücksichtigung der noch nicht committeten Journaleinträge.
+        :param student_code: Code des Studenten.
+        :param modul_code: Code des Moduls.
+        :return: Tupel (Buchungsnummer, Anzahl der bisherigen Prüfungsversuche) oder None, falls keine Buchung existiert.
+        """
+        data = self.read_data()
+        buchung = None
+        positions = self.positionen("modulbuchung.csv", {"student_code": student_code, "modul_code": modul_code})
+        if len(positions):
+            zeilen = data["modulbuchung.csv"]
+            position = self._juengste_position(positions)
+            buchung = (int(zeilen["buchungsnummer"].iat[position]), int(zeilen["pruefungsversuch"].iat[position]))
+        for eintrag in self.journal.offen:
+            if eintrag["student_code"] == student_code and eintrag["modul_code"] == modul_code:
+                if eintrag["op"] == "buchen":
+                    buchung = (eintrag["buchungsnummer"], 0)
+                elif eintrag["op"] == "versuch":
+                    buchung = (eintrag["buchungsnummer"], eintrag["pruefungsversuch"])
+        return buchung
+
+    def _juengste_position(self, positions):
+        """
+        Wählt unter Zeilen der Modulbuchungen die Buchung mit der höchsten Buchungsnummer aus.
+        :param positions: Nicht leeres Array von Zeilenpositionen.
+        :return: Zeilenposition der jüngsten Buchung.
+        """
+        buchungsnummern = self.data["modulbuchung.csv"]["buchungsnummer"].to_numpy()[positions]
+        return int(positions[np.argmax(buchungsnummern)])
+
+    def _eintraege_anwenden(self, eintraege: list):
+        """
+        Wendet committete Journaleinträge auf die geladenen Modulbuchungen an. Neue Buchungen werden
+        gesammelt in die reservierte Kapazität des Tabellenpuffers geschrieben, ohne die vorhandenen Zeilen
+        zu kopieren; Änderungen werden spaltenweise an Ort und Stelle geschrieben.
+        Bereits aufgebaute Indizes und Fremdschlüssel werden nur für die betroffenen Zeilen angepasst.
+        Buchungen, deren Buchungsnummer schon vorhanden ist (nach einer Kompaktierung), werden übersprungen;
+        Prüfungsversuche und Noten treffen über ihre Buchungsnummer immer dieselbe Buchung, sodass das
+        Nachspielen auch nach einer Kompaktierung dasselbe Ergebnis liefert.
+        :param eintraege: Liste der Journaleinträge in Schreibreihenfolge.
+        """
+        table = "modulbuchung.csv"
+        data = self.data[table]
+        vorhandene_nummern = self.get_index(table, "buchungsnummer")
+
+        neue_zeilen = []  # Neue Buchungen als Dictionaries
+        neue_position = {}  # Buchungsnummer -> Position in neue_zeilen
+        neueste_nummer = {}  # (student_code, modul_code) -> Buchungsnummer der jüngsten neuen Buchung
+        aenderungen = {}  # Zeilenposition -> geänderte Spaltenwerte
+        neue_noten = []  # Neue Prüfungsergebnisse für die Modulstatistik
+        statistik_veraltet = False
+
+        for eintrag in eintraege:
+            schluessel = (eintrag["student_code"], eintrag["modul_code"])
+            if eintrag["op"] == "buchen":
+                if eintrag["buchungsnummer"] in vorhandene_nummern:
+                    continue
+                neue_position[eintrag["buchungsnummer"]] = len(neue_zeilen)
+                neueste_nummer[schluessel] = eintrag["buchungsnummer"]
+                neue_zeilen.append({
+                    "buchungsnummer": eintrag["buchungsnummer"],
+                    "buchungsdatum": pd.Timestamp(eintrag["buchungsdatum"]),
+                    "status": "offen",
+                    "pruefungsversuch": 0,
+                    "pruefungsdatum": pd.NaT,
+                    "note": np.nan,
+                    "bestanden": False,
+                    "modul_code": eintrag["modul_code"],
+                    "student_code": eintrag["student_code"]
+                })
+                continue
+
+            if eintrag["op"] == "versuch":
+                werte = {"status": "Bewertung offen", "pruefungsversuch": eintrag["pruefungsversuch"],
+                         "pruefungsdatum": pd.Timestamp(eintrag["pruefungsdatum"]), "note": np.nan, "bestanden": False}
+            elif eintrag["op"] == "note":
+                werte = {"status": "Bewertung abgeschlossen", "note": eintrag["note"], "bestanden": eintrag["bestanden"]}
+            else:
+                print(f"Unbekannter Journaleintrag: {eintrag}")
+                continue
+
+            # Ziel ist die Buchung mit der Buchungsnummer des Eintrags; Einträge ohne Buchungsnummer
+            # (aus älteren Journalen) treffen die jüngste Buchung des Moduls
+            nummer = eintrag.get("buchungsnummer", neueste_nummer.get(schluessel))
+            if nummer in neue_position:
+                zeile = neue_zeilen[neue_position[nummer]]
+            else:
+                if nummer is not None:
+                    positions = vorhandene_nummern.get(nummer, [])
+                else:
+                    positions = self.positionen(table, {"student_code": eintrag["student_code"], "modul_code": eintrag["modul_code"]})
+                if not len(positions):
+                    print(f"Keine Buchung des Moduls {eintrag['modul_code']} für den Studenten {eintrag['student_code']} gefunden.")
+                    continue
+                position = self._juengste_position(positions)
+                zeile = aenderungen.setdefault(position, {})
+                for spalte in ("note", "pruefungsversuch"):
+                    zeile.setdefault(spalte, data[spalte].iat[position])
+
+            # Eine bereits vorhandene Note wird überschrieben: Statistik muss neu berechnet werden
+            if pd.notna(zeile["note"]):
+                statistik_veraltet = True
+            elif eintrag["op"] == "note":
+                neue_noten.append((eintrag["modul_code"], eintrag["note"], eintrag["bestanden"], zeile["pruefungsversuch"]))
+            zeile.update(werte)
+
+        if not neue_zeilen and not aenderungen:
+            return
+        if self.modulbuchung_puffer is None:
+            self.modulbuchung_puffer = Tabellenpuffer(data)
+
+        if neue_zeilen:
+            start = len(data)
+            neu = pd.DataFrame(neue_zeilen, columns=data.columns).astype(data.dtypes.to_dict())
+            self.modulbuchung_puffer.anhaengen(neu)
+            self.data[table] = self.modulbuchung_puffer.tabelle()
+
+            # Indizes und Fremdschlüssel nur um die neuen Positionen erweitern
+            for (index_table, column), index in self.indexes.items():
+                if index_table == table:
+                    for wert, positions in neu.groupby(column, sort=False).indices.items():
+                        index[wert] = np.concatenate([index.get(wert, np.empty(0, dtype=np.intp)), positions + start])
+            for beziehung in self.fremdschluessel.values():
+                if beziehung.quelle == table:
+                    beziehung.erweitern(self.data)
+
+        # Bisherige Werte der geänderten Zeilen für die inkrementelle Anpassung der Ranglisten
+        ergebnis_spalten = ["student_code", "modul_code", "note", "bestanden"]
+        ergebnis_positionen = list(aenderungen)
+        if self.ranglisten is not None:
+            alte_ergebnisse = data[ergebnis_spalten].iloc[ergebnis_positionen]
+
+        if aenderungen:
+            spalten = dict.fromkeys(spalte for werte in aenderungen.values() for spalte in werte)
+            for spalte in spalten:
+                positions = [position for position, werte in aenderungen.items() if spalte in werte]
+                neue_werte = [aenderungen[position][spalte] for position in positions]
+                index = self.indexes.get((table, spalte))
+                if index is not None:
+                    for position, alt, neu in zip(positions, data[spalte].iloc[positions].tolist(), neue_werte):
+                        self._index_umhaengen(index, position, alt, neu)
+                self.modulbuchung_puffer.setzen(spalte, positions, neue_werte)
+            self.data[table] = self.modulbuchung_puffer.tabelle()
+
+        # Die Monatsreihen hängen von Datum, Note und Status aller Buchungen ab und werden neu berechnet
+        self.lernverlauf = None
+
+        if self.ranglisten is not None:
+            neue_positionen = ergebnis_positionen + list(range(len(self.data[table]) - len(neue_zeilen), len(self.data[table])))
+            self.ranglisten.aktualisieren(alte_ergebnisse, self.data[table][ergebnis_spalten].iloc[neue_positionen])
+
+        if self.modulstatistik is not None:
+            if statistik_veraltet:
+                self.modulstatistik = None
+            else:
+                for modul_code, note, bestanden, pruefungsversuch in neue_noten:
+                    self.modulstatistik.aktualisieren(modul_code, note, bestanden, pruefungsversuch)
+
+    @staticmethod
+    def _index_umhaengen(index: dict, position: int, alt, neu):
+        """
+        Verschiebt eine Zeilenposition in einem Index vom alten zum neuen Spaltenwert.
+        Fehlende Werte werden wie bei groupby nicht indiziert.
+        :param index: Index der Spalte (Wert -> aufsteigende Zeilenpositionen).
+        :param position: Die betroffene Zeilenposition.
+        :param alt: Bisheriger Wert der Zeile.
+        :param neu: Neuer Wert der Zeile.
+        """
+        if (pd.isna(alt) and pd.isna(neu)) or alt == neu:
+            return
+        if pd.notna(alt) and alt in index:
+            rest = index[alt][index[alt] != position]
+            if len(rest):
+                index[alt] = rest
+            else:
+                del index[alt]
+        if pd.notna(neu):
+            positions = index.get(neu, np.empty(0, dtype=np.intp))
+            index[neu] = np.insert(positions, np.searchsorted(positions, position), position)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# export.py
+
+# Importiere notwendige Module und Klassen
+import argparse  # Für Kommandozeilenargumente
+import contextlib  # Für die Umleitung der Meldungen auf stderr
+import csv  # Für den CSV-Export
+import json  # Für den JSON-Lines-Export
+import sys  # Für die Ausgabe auf stdout
+import time  # Für die Durchsatzmessung
+from aenderungen import Datenstand, aenderungen_ermitteln  # Seit dem letzten Export betroffene Studenten
+from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+from dashboarddaten import dashboard_daten, json_wert  # Dashboard-Daten als JSON-taugliche Dictionaries
+
+# Spalten des CSV-Exports; verschachtelte Bereiche werden als JSON-Text abgelegt
+CSV_SPALTEN = [
+    "student_code", "student_name", "studiengang", "start_studium", "zielnote",
+    "notendurchschnitt", "erreichte_credits", "fehlende_credits",
+    "module_gebucht_nicht_abgeschlossen", "module_offen", "module_abgeschlossen",
+    "pruefungsformen", "credits_pro_semester"
+]
+
+
+def dashboard_datensaetze(dbhandler: DBZugriff, student_codes=None):
+    """
+    Generator über die Dashboard-Daten aller Studenten. Es wird immer nur der Datensatz
+    des aktuellen Studenten im Speicher gehalten.
+
+    :param dbhandler: Instanz von DBZugriff mit den geladenen Daten.
+    :param student_codes: Optionales Iterable von Studenten-Codes; ohne Angabe alle Studenten aus student.csv.
+    :return: Generator von Dictionaries (ein Datensatz je Student).
+    """
+    if student_codes is None:
+        student_codes = dbhandler.read_data()["student.csv"]["student_code"].drop_duplicates()
+    for student_code in student_codes:
+        daten = dashboard_daten(dbhandler, student_code)
+        if daten is not None:
+            yield daten
+
+
+def betroffene_student_codes(dbhandler: DBZugriff, alter_datenstand: Datenstand = None):
+    """
+    Ermittelt die Studenten, deren Dashboard-Daten sich seit einem früheren Datenstand geändert haben können,
+    in der Reihenfolge von student.csv. Nicht mehr vorhandene Studenten werden nicht aufgeführt.
+
+    :param dbhandler: Instanz von DBZugriff mit den geladenen Daten.
+    :param alter_datenstand: Datenstand des letzten Exports oder None (dann sind alle Studenten betroffen).
+    :return: Tupel (Liste der Studenten-Codes, aktueller Datenstand).
+    """
+    data = dbhandler.read_data()
+    betroffene, datenstand = aenderungen_ermitteln(data, alter_datenstand)
+    student_codes = data["student.csv"]["student_code"].drop_duplicates()
+    return student_codes[student_codes.isin(list(betroffene))].tolist(), datenstand
+
+
+def _csv_zeile(daten: dict):
+    """
+    Flacht einen Datensatz für den CSV-Export ab.
+
+    :param daten: Datensatz aus dashboard_datensaetze.
+    :return: Dictionary mit den Spalten aus CSV_SPALTEN.
+    """
+    def als_json(wert):
+        return json.dumps(wert, default=json_wert, ensure_ascii=False)
+
+    def skalar(wert):
+        return wert if wert is None or isinstance(wert, (str, int, float)) else json_wert(wert)
+
+    info, noten, module = daten["info"], daten["noten"], daten["module"]
+    return {
+        "student_code": info["student_code"],
+        "student_name": info["student_name"],
+        "studiengang": info["studiengang"],
+        "start_studium": skalar(info["start_studium"]),
+        "zielnote": skalar(noten["zielnote"]),
+        "notendurchschnitt": skalar(noten["notendurchschnitt"]),
+        "erreichte_credits": skalar(noten["erreichte_credits"]),
+        "fehlende_credits": skalar(noten["fehlende_credits"]),
+        "module_gebucht_nicht_abgeschlossen": als_json(module["gebucht_nicht_abgeschlossen"]),
+        "module_offen": als_json(module["offen"]),
+        "module_abgeschlossen": als_json(module["abgeschlossen"]),
+        "pruefungsformen": als_json(daten["pruefungsformen"]),
+        "credits_pro_semester": als_json(daten["credits"])
+    }
+
+
+def exportieren(datensaetze, ausgabe, format: str = "jsonl", melde_intervall: int = 10000):
+    """
+    Schreibt Datensätze inkrementell als JSON Lines oder CSV, ohne die Ergebnismenge aufzubauen.
+
+    :param datensaetze: Iterable von Datensätzen (z. B. dashboard_datensaetze).
+    :param ausgabe: Geöffnete Textdatei (oder sys.stdout).
+    :param format: "jsonl" oder "csv".
+    :param melde_intervall: Nach wie vielen Datensätzen ein Zwischenstand ausgegeben wird (0 = nie).
+    :return: Tupel (Anzahl Datensätze, Datensätze pro Sekunde).
+    """
+    if format not in ("jsonl", "csv"):
+        raise ValueError(f"Unbekanntes Exportformat: {format}")
+
+    writer = None
+    if format == "csv":
+        writer = csv.DictWriter(ausgabe, fieldnames=CSV_SPALTEN)
+        writer.writeheader()
+
+    anzahl = 0
+    start = time.perf_counter()
+    for daten in datensaetze:
+        if writer is not None:
+            writer.writerow(_csv_zeile(daten))
+        else:
+            ausgabe.write(json.dumps(daten, default=json_wert, ensure_ascii=False))
+            ausgabe.write("\n")
+        anzahl += 1
+        if melde_intervall and anzahl % melde_intervall == 0:
+            dauer = time.perf_counter() - start
+            print(f"{anzahl} Datensätze exportiert ({anzahl / dauer:.0f} Datensätze/s)", file=sys.stderr)
+
+    dauer = time.perf_counter() - start
+    durchsatz = anzahl / dauer if dauer > 0 else float("inf")
+    print(f"Export abgeschlossen: {anzahl} Datensätze in {dauer:.2f} s ({durchsatz:.0f} Datensätze/s)", file=sys.stderr)
+    return anzahl, durchsatz
+
+
+# Startet den Export, wenn die Datei direkt ausgeführt wird
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export der Dashboard-Daten aller Studenten")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Ausgabeformat")
+    parser.add_argument("--ausgabe", default="-", help="Ausgabedatei (Standard: stdout)")
+    parser.add_argument("--seit", help="Datenstand-Datei des letzten Exports: nur die seitdem betroffenen Studenten "
+                                       "exportieren und die Datei danach aktualisieren")
+    args = parser.parse_args()
+
+    # Nur die Datensätze gehören auf stdout; Meldungen beim Laden und Abfragen gehen auf stderr
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        dbhandler = DBZugriff(CSVZugriff())
+        student_codes, datenstand = None, None
+        if args.seit:
+            student_codes, datenstand = betroffene_student_codes(dbhandler, Datenstand.laden(args.seit))
+            print(f"{len(student_codes)} betroffene Studenten seit dem letzten Export")
+        if args.ausgabe == "-":
+            exportieren(dashboard_datensaetze(dbhandler, student_codes), stdout, args.format)
+        else:
+            with open(args.ausgabe, "w", encoding="utf-8", newline="") as ausgabe_datei:
+                exportieren(dashboard_datensaetze(dbhandler, student_codes), ausgabe_datei, args.format)
+        if datenstand is not None:
+            datenstand.speichern(args.seit)
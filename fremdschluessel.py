@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# fremdschluessel.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die Positionsarrays
+import pandas as pd  # Für Datenverarbeitung
+
+# Fremdschlüsselbeziehungen: (Quelltabelle, Quellspalte, Zieltabelle, Zielspalte)
+FREMDSCHLUESSEL = [
+    ("modulbuchung.csv", "modul_code", "modul.csv", "modul_code"),
+    ("modulbuchung.csv", "student_code", "student.csv", "student_code"),
+    ("student_studiengang.csv", "student_code", "student.csv", "student_code"),
+    ("student_studiengang.csv", "studiengang_code", "studiengang.csv", "studiengang_code"),
+    ("studiengang_semester.csv", "studiengang_code", "studiengang.csv", "studiengang_code"),
+    ("studiengang_semester.csv", "semester_code", "semester.csv", "semester_code"),
+    ("semester_modul.csv", "modul_code", "modul.csv", "modul_code"),
+]
+
+
+class Fremdschluessel:
+    """
+    Aufgelöste Fremdschlüsselbeziehung zwischen zwei geladenen Tabellen.
+    Für jede Zeile der Quelltabelle werden die Positionen der passenden Zeilen der Zieltabelle
+    einmalig als Integer-Arrays (CSR-Format: offsets und positionen) abgelegt. Verknüpfungen
+    werden dadurch zu Array-Zugriffen statt Hash-Merges.
+    """
+    def __init__(self, quelle: str, quell_spalte: str, ziel: str, ziel_spalte: str, data: dict):
+        """
+        Löst die Beziehung in einem vektorisierten Durchlauf auf und prüft dabei die referentielle Integrität.
+
+        :param quelle: Dateiname der Quelltabelle (z. B. "modulbuchung.csv").
+        :param quell_spalte: Spalte der Quelltabelle mit dem Fremdschlüssel.
+        :param ziel: Dateiname der Zieltabelle (z. B. "modul.csv").
+        :param ziel_spalte: Schlüsselspalte der Zieltabelle.
+        :param data: Dictionary mit den geladenen DataFrames.
+        """
+        self.quelle = quelle
+        self.quell_spalte = quell_spalte
+        self.ziel = ziel
+        self.ziel_spalte = ziel_spalte
+
+        # Index der Zieltabelle für das Erweitern um neue Quellzeilen, wird bei Bedarf aufgebaut
+        self._ziel_index = None
+
+        # Puffer mit freier Kapazität hinter anzahl, offsets und positionen, wird beim ersten Erweitern angelegt
+        self._puffer = None
+
+        quell_werte = data[quelle][quell_spalte].to_numpy(dtype=object)
+        ziel_werte = data[ziel][ziel_spalte].to_numpy(dtype=object)
+        anzahl_ziel = len(ziel_werte)
+
+        # Gemeinsame Codierung beider Spalten; fehlende Werte erhalten wie beim pandas-Merge einen eigenen Code
+        codes, uniques = pd.factorize(np.concatenate([ziel_werte, quell_werte]), use_na_sentinel=False)
+        ziel_ids = codes[:anzahl_ziel]
+        quell_ids = codes[anzahl_ziel:]
+
+        # Zielpositionen nach Schlüssel gruppiert, innerhalb eines Schlüssels in Tabellenreihenfolge
+        anzahl_je_schluessel = np.bincount(ziel_ids, minlength=len(uniques))
+        start_je_schluessel = np.cumsum(anzahl_je_schluessel) - anzahl_je_schluessel
+        ziel_reihenfolge = np.argsort(ziel_ids, kind="stable")
+
+        # Treffer je Quellzeile als CSR-Struktur
+        self.anzahl = anzahl_je_schluessel[quell_ids]
+        self.offsets = np.concatenate([[0], np.cumsum(self.anzahl)])
+        innerhalb = np.arange(self.offsets[-1]) - np.repeat(self.offsets[:-1], self.anzahl)
+        self.positionen = ziel_reihenfolge[np.repeat(start_je_schluessel[quell_ids], self.anzahl) + innerhalb]
+
+        # Referentielle Integrität: unbekannte Schlüssel in der Quelle, mehrdeutige Schlüssel im Ziel
+        vorhanden = pd.notna(quell_werte)
+        self.verwaist = np.flatnonzero((self.anzahl == 0) & vorhanden)
+        self.verwaiste_werte = list(dict.fromkeys(quell_werte[self.verwaist]))
+        mehrdeutig = (anzahl_je_schluessel > 1) & pd.notna(uniques)
+        self.mehrdeutige_werte = list(uniques[mehrdeutig])
+
+    def erweitern(self, data: dict):
+        """
+        Löst die Beziehung für neu angehängte Zeilen der Quelltabelle auf, ohne die bestehenden
+        Zeilen erneut zu verarbeiten. Die Zieltabelle muss unverändert geblieben sein.
+
+        :param data: Dictionary mit den geladenen DataFrames (Quelltabelle inklusive der neuen Zeilen).
+        """
+        start = len(self.anzahl)
+        neue_werte = data[self.quelle][self.quell_spalte].iloc[start:].to_numpy(dtype=object)
+        if not len(neue_werte):
+            return
+
+        if self._ziel_index is None:
+            self._ziel_index = data[self.ziel].groupby(self.ziel_spalte, sort=False).indices
+        leer = np.empty(0, dtype=np.intp)
+        treffer = [self._ziel_index.get(wert, leer) for wert in neue_werte]
+        anzahl = np.array([len(positionen) for positionen in treffer], dtype=self.anzahl.dtype)
+
+        # Neue Zeilen in die freie Kapazität schreiben, ohne die bestehenden Arrays zu kopieren
+        if self._puffer is None:
+            self._puffer = {"anzahl": self.anzahl, "offsets": self.offsets, "positionen": self.positionen}
+        for name, neu in (("positionen", np.concatenate(treffer)),
+                          ("offsets", self.offsets[-1] + np.cumsum(anzahl)),
+                          ("anzahl", anzahl)):
+            laenge = len(getattr(self, name))
+            puffer = self._puffer[name]
+            if laenge + len(neu) > len(puffer):
+                puffer = np.empty(max(2 * len(puffer), laenge + len(neu)), dtype=puffer.dtype)
+                puffer[:laenge] = getattr(self, name)
+                self._puffer[name] = puffer
+            puffer[laenge:laenge + len(neu)] = neu
+            setattr(self, name, puffer[:laenge + len(neu)])
+
+        verwaist = start + np.flatnonzero((anzahl == 0) & pd.notna(neue_werte))
+        if len(verwaist):
+            self.verwaist = np.concatenate([self.verwaist, verwaist])
+            self.verwaiste_werte = list(dict.fromkeys([*self.verwaiste_werte, *neue_werte[verwaist - start]]))
+
+    def erste_position(self, quell_positionen):
+        """
+        Gibt für Quellzeilen die Position des ersten passenden Zieldatensatzes zurück.
+
+        :param quell_positionen: Array von Zeilenpositionen der Quelltabelle.
+        :return: Array von Zielpositionen, -1 für Zeilen ohne Treffer.
+        """
+        quell_positionen = np.asarray(quell_positionen, dtype=np.intp)
+        treffer = self.anzahl[quell_positionen] > 0
+        ergebnis = np.full(len(quell_positionen), -1, dtype=np.intp)
+        ergebnis[treffer] = self.positionen[self.offsets[quell_positionen[treffer]]]
+        return ergebnis
+
+    def links_verbinden(self, quell_positionen):
+        """
+        Berechnet die Zeilenpaare eines Left-Joins für ausgewählte Quellzeilen, in der Reihenfolge
+        eines pandas-Merges mit how="left" (je Quellzeile alle Treffer, ohne Treffer eine Zeile mit -1).
+
+        :param quell_positionen: Aufsteigendes Array von Zeilenpositionen der Quelltabelle.
+        :return: Tupel (Quellpositionen, Zielpositionen) gleicher Länge; Zielposition -1 bedeutet kein Treffer.
+        """
+        quell_positionen = np.asarray(quell_positionen, dtype=np.intp)
+        anzahl = self.anzahl[quell_positionen]
+        zeilen = np.maximum(anzahl, 1)
+
+        links = np.repeat(quell_positionen, zeilen)
+        innerhalb = np.arange(zeilen.sum()) - np.repeat(np.cumsum(zeilen) - zeilen, zeilen)
+        treffer = np.repeat(anzahl > 0, zeilen)
+
+        rechts = np.full(len(links), -1, dtype=np.intp)
+        rechts[treffer] = self.positionen[np.repeat(self.offsets[quell_positionen], zeilen)[treffer] + innerhalb[treffer]]
+        return links, rechts
+
+    def __str__(self):
+        """
+        Gibt eine String-Darstellung der Beziehung zurück.
+
+        :return: Formatierte Zeichenkette mit Quelle und Ziel.
+        """
+        return f"{self.quelle}.{self.quell_spalte} → {self.ziel}.{self.ziel_spalte}"
+
+
+def fremdschluessel_aufloesen(data: dict):
+    """
+    Löst alle Fremdschlüssel der geladenen Tabellen auf und meldet Integritätsfehler einmalig.
+
+    :param data: Dictionary mit den geladenen DataFrames.
+    :return: Dictionary (Quelltabelle, Quellspalte) -> Fremdschluessel.
+    """
+    fremdschluessel = {}
+    for quelle, quell_spalte, ziel, ziel_spalte in FREMDSCHLUESSEL:
+        if quelle not in data or ziel not in data:
+            continue
+        beziehung = Fremdschluessel(quelle, quell_spalte, ziel, ziel_spalte, data)
+        if beziehung.verwaiste_werte:
+            print(f"Referenzfehler {beziehung}: {len(beziehung.verwaist)} Zeilen mit unbekanntem Schlüssel "
+                  f"({', '.join(map(str, beziehung.verwaiste_werte))}).")
+        fremdschluessel[(quelle, quell_spalte)] = beziehung
+
+    # Mehrdeutige Schlüssel je Zieltabelle nur einmal melden
+    gemeldet = set()
+    for beziehung in fremdschluessel.values():
+        if beziehung.mehrdeutige_werte and (beziehung.ziel, beziehung.ziel_spalte) not in gemeldet:
+            gemeldet.add((beziehung.ziel, beziehung.ziel_spalte))
+            print(f"Mehrdeutiger Schlüssel in {beziehung.ziel}.{beziehung.ziel_spalte}: "
+                  f"{', '.join(map(str, beziehung.mehrdeutige_werte))}.")
+    return fremdschluessel
+
+
+def verbinden_spalten(data: dict, beziehung: Fremdschluessel, quell_positionen, quell_spalten: list, ziel_spalten: list):
+    """
+    Berechnet die Spalten eines Left-Joins ausgewählter Quellzeilen mit der Zieltabelle über Array-Zugriffe,
+    ohne einen DataFrame aufzubauen (z. B. für die zeilenweise Weiterverarbeitung weniger Zeilen).
+
+    :param data: Dictionary mit den geladenen DataFrames.
+    :param beziehung: Die aufgelöste Fremdschlüsselbeziehung.
+    :param quell_positionen: Aufsteigendes Array von Zeilenpositionen der Quelltabelle.
+    :param quell_spalten: Spalten, die aus der Quelltabelle übernommen werden.
+    :param ziel_spalten: Spalten, die aus der Zieltabelle übernommen werden (fehlende Treffer werden zu NaN).
+    :return: Dictionary Spalte -> Array, alle Arrays gleich lang.
+    """
+    links, rechts = beziehung.links_verbinden(quell_positionen)
+    quelle = data[beziehung.quelle]
+    ziel = data[beziehung.ziel]
+
+    ergebnis = {spalte: quelle[spalte].array.take(links) for spalte in quell_spalten}
+    ergebnis.update({spalte: ziel[spalte].array.take(rechts, allow_fill=True) for spalte in ziel_spalten})
+    return ergebnis
+
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# gemeinsamerdatensatz.py
+
+# Importiere notwendige Module und Klassen
+import importlib.util  # Für die Prüfung, ob pyarrow installiert ist
+import mmap  # Für das schreibgeschützte Einblenden der Datensatzdatei
+import os  # Für Dateipfade, Dateisignaturen und atomares Ersetzen
+import pickle  # Für das Inhaltsverzeichnis der Datensatzdatei
+import struct  # Für den Dateikopf
+import time  # Für die Zeitmessung beim Einbinden
+import numpy as np  # Für die Spaltenpuffer
+import pandas as pd  # Für Datenverarbeitung
+from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+
+# Kennung und Version des Dateiformats; bei Änderungen am Layout DATENSATZ_FORMAT erhöhen
+DATENSATZ_KENNUNG = b"DBDS"
+DATENSATZ_FORMAT = 1
+
+# Dateikopf: Kennung, Formatversion, Länge des Inhaltsverzeichnisses
+_KOPF = struct.Struct("<4sIQ")
+
+# Ausrichtung der Spaltenpuffer in Bytes
+_AUSRICHTUNG = 64
+
+
+def _ausrichten(position: int):
+    """
+    Rundet eine Dateiposition auf die nächste Pufferausrichtung auf.
+
+    :param position: Position in Bytes.
+    :return: Ausgerichtete Position.
+    """
+    return -(-position // _AUSRICHTUNG) * _AUSRICHTUNG
+
+
+class GemeinsamerDatensatz:
+    """
+    Stellt die geparsten Tabellen mehreren Dashboard-Prozessen auf einem Rechner gemeinsam zur Verfügung.
+    Ein Prozess schreibt die Tabellen einmalig spaltenweise in eine Datensatzdatei (Zahlen, Wahrheitswerte
+    und Datumswerte als Rohpuffer, Zeichenketten im Arrow-Layout aus Offsets, Daten und Gültigkeitsbitmap).
+    Alle Prozesse blenden die Datei schreibgeschützt per mmap ein und bauen die DataFrames ohne Kopie auf
+    den eingeblendeten Puffern auf; die Seiten liegen nur einmal im Seitencache des Betriebssystems.
+    Die Klasse bietet dieselbe Schnittstelle wie CSVZugriff und kann daher direkt an DBZugriff übergeben werden.
+    """
+    def __init__(self, csv_zugriff: CSVZugriff = None, pfad: str = None):
+        """
+        Initialisiert den gemeinsamen Datensatz.
+
+        :param csv_zugriff: Instanz von CSVZugriff, über die der Datensatz bei Bedarf neu geladen wird.
+        :param pfad: Pfad der Datensatzdatei (Standard: .dashboard_cache/datensatz.bin im Datenverzeichnis).
+        """
+        self.csv_zugriff = csv_zugriff if csv_zugriff is not None else CSVZugriff()
+        self.pfad = pfad if pfad is not None else os.path.join(self.data_dir or "", ".dashboard_cache", "datensatz.bin")
+
+        # Fehlermeldungen des letzten Einlesens je Datei
+        self.errors = {}
+
+        # Eingeblendete Datei; muss geöffnet bleiben, solange DataFrames auf ihr aufbauen
+        self._abbild = None
+
+        # Zuletzt eingebundene Tabellen und die Signatur der CSV-Dateien, zu der sie gehören (für read_table)
+        self._tabellen = None
+        self._tabellen_signatur = None
+
+    @property
+    def file_paths(self):
+        """
+        Pfade der zugrunde liegenden CSV-Dateien (wie bei CSVZugriff).
+
+        :return: Liste der Dateipfade.
+        """
+        return self.csv_zugriff.file_paths
+
+    @property
+    def data_dir(self):
+        """
+        Verzeichnis des Datenbestands (wie bei CSVZugriff).
+
+        :return: Verzeichnis oder None für das aktuelle Arbeitsverzeichnis.
+        """
+        return getattr(self.csv_zugriff, "data_dir", None)
+
+    def signatur(self):
+        """
+        Ermittelt Name, Größe und Änderungszeit aller CSV-Quelldateien. Stimmt die Signatur nicht
+        mit der in der Datensatzdatei gespeicherten überein, wird der Datensatz neu veröffentlicht.
+
+        :return: Liste von Tupeln (Pfad, Größe, Änderungszeit in ns) bzw. (Pfad, None, None) für fehlende Dateien.
+        """
+        ergebnis = []
+        for file_path in self.file_paths:
+            try:
+                status = os.stat(file_path)
+                ergebnis.append((file_path, status.st_size, status.st_mtime_ns))
+            except FileNotFoundError:
+                ergebnis.append((file_path, None, None))
+        return ergebnis
+
+    def veroeffentlichen(self, data: dict = None):
+        """
+        Schreibt die Tabellen spaltenweise in die Datensatzdatei. Die Datei wird über eine temporäre
+        Datei atomar ersetzt; bereits eingebundene Prozesse behalten ihre bisherige Version.
+
+        :param data: Optionales Dictionary mit DataFrames; ohne Angabe werden die CSV-Dateien eingelesen.
+        """
+        signatur = self.signatur()
+        if data is None:
+            data = self.csv_zugriff.read_data()
+            self.errors = dict(self.csv_zugriff.errors)
+
+        puffer = []  # Zu schreibende Puffer in Dateireihenfolge
+        position = 0  # Position relativ zum Beginn des Datenbereichs
+
+        def ablegen(werte: bytes):
+            nonlocal position
+            position = _ausrichten(position)
+            puffer.append((position, werte))
+            position += len(werte)
+            return puffer[-1][0], len(werte)
+
+        tabellen = {}
+        for file_name, tabelle in data.items():
+            spalten = []
+            for spalte in tabelle.columns:
+                serie = tabelle[spalte]
+                if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "biufM":
+                    werte = np.ascontiguousarray(serie.to_numpy())
+                    spalten.append((spalte, "numpy", werte.dtype.str, ablegen(werte.tobytes())))
+                elif serie.dtype == "str" or (serie.dtype == object and all(isinstance(wert, str) for wert in serie.dropna())):
+                    werte = serie.to_numpy(dtype=object)
+                    gueltig = pd.notna(werte)
+                    kodiert = [wert.encode("utf-8") if ok else b"" for wert, ok in zip(werte, gueltig)]
+                    offsets = np.concatenate([[0], np.cumsum([len(wert) for wert in kodiert], dtype=np.int64)]).astype(np.int64)
+                    spalten.append((spalte, "str", str(serie.dtype), {
+                        "offsets": ablegen(offsets.tobytes()),
+                        "daten": ablegen(b"".join(kodiert)),
+                        "gueltig": ablegen(np.packbits(gueltig, bitorder="little").tobytes()),
+                        "fehlend": int((~gueltig).sum())
+                    }))
+                else:
+                    # Sonstige Spalten werden serialisiert und beim Einbinden kopiert
+                    spalten.append((spalte, "pickle", str(serie.dtype), ablegen(pickle.dumps(serie, protocol=pickle.HIGHEST_PROTOCOL))))
+            tabellen[file_name] = {"laenge": len(tabelle), "spalten": spalten}
+
+        verzeichnis = pickle.dumps({"signatur": signatur, "tabellen": tabellen, "errors": self.errors},
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+        datenbeginn = _ausrichten(_KOPF.size + len(verzeichnis))
+
+        os.makedirs(os.path.dirname(self.pfad) or ".", exist_ok=True)
+        temp_pfad = f"{self.pfad}.{os.getpid()}.tmp"
+        with open(temp_pfad, "wb") as datei:
+            datei.write(_KOPF.pack(DATENSATZ_KENNUNG, DATENSATZ_FORMAT, len(verzeichnis)))
+            datei.write(verzeichnis)
+            for offset, werte in puffer:
+                datei.seek(datenbeginn + offset)
+                datei.write(werte)
+            datei.truncate(datenbeginn + position)
+        os.replace(temp_pfad, self.pfad)
+
+    def einbinden(self):
+        """
+        Blendet die Datensatzdatei ein und baut die DataFrames ohne Kopie auf den eingeblendeten Puffern auf.
+
+        :return: Dictionary mit Dateinamen als Schlüssel und DataFrames als Werte oder None,
+                 falls die Datei fehlt, ungültig ist oder nicht zu den CSV-Dateien passt.
+        """
+        try:
+            with open(self.pfad, "rb") as datei:
+                abbild = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Eine ungültige oder veraltete Datei wird wieder ausgeblendet, bevor None zurückgegeben wird
+        try:
+            kennung, version, laenge = _KOPF.unpack_from(abbild, 0)
+            gueltig = kennung == DATENSATZ_KENNUNG and version == DATENSATZ_FORMAT
+            verzeichnis = pickle.loads(abbild[_KOPF.size:_KOPF.size + laenge]) if gueltig else None
+        except (struct.error, pickle.UnpicklingError, EOFError):
+            gueltig = False
+        if not gueltig or verzeichnis["signatur"] != self.signatur():
+            abbild.close()
+            return None
+        datenbeginn = _ausrichten(_KOPF.size + laenge)
+        ansicht = memoryview(abbild)
+
+        mit_pyarrow = importlib.util.find_spec("pyarrow") is not None
+        if mit_pyarrow:
+            import pyarrow as pa
+
+        data = {}
+        for file_name, tabelle in verzeichnis["tabellen"].items():
+            anzahl = tabelle["laenge"]
+            spalten = {}
+            for spalte, art, dtype, ort in tabelle["spalten"]:
+                if art == "numpy":
+                    spalten[spalte] = np.frombuffer(abbild, dtype=np.dtype(dtype), count=anzahl, offset=datenbeginn + ort[0])
+                elif art == "str":
+                    offsets, daten, gueltig = (ansicht[datenbeginn + o:datenbeginn + o + n] for o, n in (ort["offsets"], ort["daten"], ort["gueltig"]))
+                    if mit_pyarrow and dtype == "str":
+                        # Arrow-Array direkt auf den eingeblendeten Puffern (ohne Kopie)
+                        werte = pa.LargeStringArray.from_buffers(anzahl, pa.py_buffer(offsets), pa.py_buffer(daten),
+                                                                 pa.py_buffer(gueltig), ort["fehlend"])
+                        spalten[spalte] = pa.chunked_array([werte]).to_pandas(types_mapper={pa.large_string(): pd.StringDtype("pyarrow", na_value=np.nan)}.get).array
+                    else:
+                        # Ohne pyarrow werden die Zeichenketten dekodiert (Kopie)
+                        grenzen = np.frombuffer(offsets, dtype=np.int64)
+                        maske = np.unpackbits(np.frombuffer(gueltig, dtype=np.uint8), count=anzahl, bitorder="little").astype(bool)
+                        roh = bytes(daten)
+                        werte = [roh[grenzen[i]:grenzen[i + 1]].decode("utf-8") if maske[i] else np.nan for i in range(anzahl)]
+                        spalten[spalte] = pd.array(werte, dtype=dtype)
+                else:
+                    spalten[spalte] = pickle.loads(ansicht[datenbeginn + ort[0]:datenbeginn + ort[0] + ort[1]]).array
+            data[file_name] = pd.DataFrame(spalten, copy=False) if spalten else pd.DataFrame(index=pd.RangeIndex(anzahl))
+
+        self._abbild = abbild
+        self.errors = verzeichnis["errors"]
+        return data
+
+    def read_data(self):
+        """
+        Bindet den gemeinsamen Datensatz ein. Fehlt er oder passt er nicht mehr zu den CSV-Dateien,
+        werden die Dateien eingelesen und der Datensatz zuerst neu veröffentlicht.
+
+        :return: Dictionary mit Dateinamen als Schlüssel und DataFrames als Werte
+        """
+        start = time.perf_counter()
+        signatur = self.signatur()
+        try:
+            data = self.einbinden()
+            if data is None:
+                self.veroeffentlichen()
+                data = self.einbinden()
+        except Exception as e:
+            print(f"Gemeinsamer Datensatz {self.pfad} nicht nutzbar, CSV-Dateien werden direkt eingelesen: {e}")
+            data = None
+        if data is None:
+            data = self.csv_zugriff.read_data()
+            self.errors = dict(self.csv_zugriff.errors)
+            self._tabellen, self._tabellen_signatur = data, signatur
+            return data
+
+        self._tabellen, self._tabellen_signatur = data, signatur
+        print(f"Gemeinsamer Datensatz {self.pfad} eingebunden ({len(data)} Tabellen, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms).")
+        return data
+
+    def read_table(self, file_name: str, usecols=None):
+        """
+        Gibt eine einzelne Tabelle aus dem gemeinsamen Datensatz zurück. Die eingebundenen Tabellen werden
+        wiederverwendet, solange die CSV-Dateien unverändert sind; nur beim ersten Aufruf oder nach einer
+        Änderung wird der Datensatz (neu) eingebunden.
+
+        :param file_name: Dateiname der Tabelle (z. B. "student.csv")
+        :param usecols: Optionale Liste der zurückzugebenden Spalten
+        :return: DataFrame mit den Daten der Tabelle
+        """
+        data = self._tabellen
+        if data is None or self._tabellen_signatur != self.signatur():
+            data = self.read_data()
+        if file_name not in data:
+            raise FileNotFoundError(file_name)
+        # Flache Kopie bzw. Projektion: Änderungen des Aufrufers erreichen die gemeinsamen Tabellen nicht
+        return data[file_name].copy(deep=False) if usecols is None else data[file_name][list(usecols)]
+
+    def write_table(self, file_name: str, data: pd.DataFrame):
+        """
+        Schreibt eine Tabelle über CSVZugriff zurück. Die geänderte Signatur führt beim nächsten
+        Einbinden zu einer Neuveröffentlichung des Datensatzes.
+
+        :param file_name: Dateiname der Tabelle (z. B. "modulbuchung.csv")
+        :param data: DataFrame mit den zu schreibenden Daten
+        """
+        self.csv_zugriff.write_table(file_name, data)
+        self._tabellen = None
+
+
+# Veröffentlicht den Datensatz, wenn die Datei direkt ausgeführt wird (Ladeprozess)
+if __name__ == "__main__":
+    datensatz = GemeinsamerDatensatz()
+    datensatz.veroeffentlichen()
+    print(f"Datensatz nach {datensatz.pfad} veröffentlicht ({os.path.getsize(datensatz.pfad)} Bytes).")
+    datensatz.read_data()
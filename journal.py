@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# journal.py
+
+# Importiere notwendige Module und Klassen
+import json  # Für das Zeilenformat des Journals (JSON Lines)
+import os  # Für fsync und Dateiprüfungen
+
+
+class Journal:
+    """
+    Append-only-Journal für Schreibvorgänge auf den Modulbuchungen. Einträge werden zunächst
+    im Speicher gesammelt und beim Commit gemeinsam als JSON-Zeilen an die Journaldatei angehängt,
+    sodass ein Commit genau einen Schreib- und Synchronisationsvorgang kostet.
+    """
+    def __init__(self, pfad: str = "modulbuchung.journal", batch_groesse: int = 100):
+        """
+        Initialisiert das Journal.
+
+        :param pfad: Pfad der Journaldatei.
+        :param batch_groesse: Anzahl offener Einträge, ab der automatisch committet wird.
+        """
+        self.pfad = pfad
+        self.batch_groesse = batch_groesse
+
+        # Noch nicht committete Einträge
+        self.offen = []
+
+        # Anzahl der committeten Einträge in der Journaldatei (wird von lesen gesetzt)
+        self.anzahl = 0
+
+    def anhaengen(self, eintrag: dict):
+        """
+        Nimmt einen Eintrag in den offenen Batch auf.
+
+        :param eintrag: JSON-taugliches Dictionary mit mindestens dem Schlüssel "op".
+        :return: True, wenn der Batch voll ist und committet werden sollte.
+        """
+        self.offen.append(eintrag)
+        return len(self.offen) >= self.batch_groesse
+
+    def schreiben(self):
+        """
+        Hängt alle offenen Einträge an die Journaldatei an und synchronisiert sie auf den Datenträger.
+
+        :return: Liste der geschriebenen Einträge (leer, falls nichts offen war).
+        """
+        eintraege, self.offen = self.offen, []
+        if not eintraege:
+            return eintraege
+        with open(self.pfad, "a", encoding="utf-8") as datei:
+            datei.write("".join(json.dumps(eintrag, ensure_ascii=False) + "\n" for eintrag in eintraege))
+            datei.flush()
+            os.fsync(datei.fileno())
+        self.anzahl += len(eintraege)
+        return eintraege
+
+    def lesen(self):
+        """
+        Liest alle committeten Einträge aus der Journaldatei. Eine unvollständige letzte Zeile
+        (z. B. nach einem Absturz während des Schreibens) wird verworfen.
+
+        :return: Liste der Einträge in Schreibreihenfolge.
+        """
+        eintraege = []
+        if os.path.exists(self.pfad):
+            with open(self.pfad, encoding="utf-8") as datei:
+                for zeilennummer, zeile in enumerate(datei, start=1):
+                    if not zeile.strip():
+                        continue
+                    try:
+                        eintraege.append(json.loads(zeile))
+                    except json.JSONDecodeError:
+                        print(f"Unvollständiger Journaleintrag in Zeile {zeilennummer} von {self.pfad} wird ignoriert.")
+        self.anzahl = len(eintraege)
+        return eintraege
+
+    def leeren(self):
+        """
+        Entfernt alle committeten Einträge, nachdem sie in die Basistabelle übernommen wurden.
+        """
+        if os.path.exists(self.pfad):
+            os.remove(self.pfad)
+        self.anzahl = 0
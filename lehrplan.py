@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# lehrplan.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die Zeilenpositionen
+from semester import Semester  # Semester-Knoten des Lehrplans
+from modul import Modul  # Modul-Blätter des Lehrplans
+
+class Lehrplan:
+    """
+    Repräsentiert den Lehrplan (Curriculum) eines Studiengangs als Baum:
+    Studiengang → geordnete Liste von Semestern → Liste von Modulen mit Credits.
+    Der Baum wird einmal pro studiengang_code aufgebaut und von allen Studenten
+    dieses Studiengangs gemeinsam genutzt.
+    """
+    def __init__(self, studiengang_code: str, semester: list):
+        """
+        Initialisiert einen Lehrplan.
+
+        :param studiengang_code: Code des Studiengangs.
+        :param semester: Geordnete Liste von Semester-Objekten mit bereits geladenen Modulen.
+        """
+        self.studiengang_code = studiengang_code
+        self.semester = semester
+
+        # Alle Modulkodes des Studiengangs in Reihenfolge ihres ersten Auftretens
+        self.modul_codes = list(dict.fromkeys(
+            modul_code for sem in semester for modul_code in sem.modul_codes
+        ))
+
+        # Gesamte Credits des Studiengangs laut Lehrplan
+        self.gesamt_credits = sum(sem.gesamt_credits for sem in semester)
+
+    @classmethod
+    def aus_daten(cls, studiengang_code: str, data: dict, fremdschluessel: dict):
+        """
+        Baut den Lehrplan eines Studiengangs aus den geladenen CSV-Daten auf.
+        Die Kette studiengang_semester → semester → semester_modul → modul wird dabei
+        genau einmal durchlaufen; Semester und Module werden über die beim Laden
+        aufgelösten Fremdschlüssel als Zeilenpositionen gefunden.
+
+        :param studiengang_code: Code des Studiengangs.
+        :param data: Dictionary mit den geladenen DataFrames (siehe CSVZugriff.read_data).
+        :param fremdschluessel: Beim Laden aufgelöste Fremdschlüssel (siehe fremdschluessel_aufloesen).
+        :return: Lehrplan-Objekt (mit leerer Semesterliste, falls keine Daten vorhanden sind).
+        """
+        studiengang_semester_data = data.get("studiengang_semester.csv")
+        semester_data = data.get("semester.csv")
+        semester_modul_data = data.get("semester_modul.csv")
+        modul_data = data.get("modul.csv")
+        modul_beziehung = fremdschluessel.get(("semester_modul.csv", "modul_code"))
+
+        if studiengang_semester_data is None or semester_modul_data is None or modul_beziehung is None:
+            print("Lehrplan-Daten konnten nicht geladen werden.")
+            return cls(studiengang_code, [])
+
+        semester_zeilen = np.flatnonzero(studiengang_semester_data["studiengang_code"].to_numpy() == studiengang_code)
+        semester_codes = studiengang_semester_data["semester_code"].iloc[semester_zeilen]
+
+        # Semesternamen und Moduldetails: jeweils die erste Zeile pro Code (ohne Treffer -1)
+        semester_beziehung = fremdschluessel.get(("studiengang_semester.csv", "semester_code"))
+        if semester_beziehung is not None:
+            semester_positionen = semester_beziehung.erste_position(semester_zeilen)
+        else:
+            semester_positionen = np.full(len(semester_zeilen), -1)
+
+        # Modulzuordnungen nur für die Semester dieses Studiengangs gruppieren
+        modul_zeilen = np.flatnonzero(semester_modul_data["semester_code"].isin(semester_codes).to_numpy())
+        modul_positionen = modul_beziehung.erste_position(modul_zeilen)
+        zeilen_je_semester = semester_modul_data.iloc[modul_zeilen].groupby("semester_code", sort=False).indices
+        modul_codes_zugeordnet = semester_modul_data["modul_code"].iloc[modul_zeilen].tolist()
+
+        semester_liste = []
+        for semester_code, semester_position in zip(semester_codes, semester_positionen):
+            semester_name = semester_data["semester_name"].iat[semester_position] if semester_position >= 0 \
+                else f"Semester {semester_code}"
+            zeilen = zeilen_je_semester.get(semester_code, [])
+            modul_codes = [modul_codes_zugeordnet[zeile] for zeile in zeilen]
+
+            # Module ohne Eintrag in modul.csv tragen keine Credits bei
+            module = [
+                Modul(
+                    modul_codes_zugeordnet[zeile],
+                    modul_data["modul_name"].iat[modul_positionen[zeile]],
+                    modul_data["credits"].iat[modul_positionen[zeile]],
+                    modul_data["tutor"].iat[modul_positionen[zeile]],
+                    modul_data["pruefungsform"].iat[modul_positionen[zeile]]
+                )
+                for zeile in zeilen if modul_positionen[zeile] >= 0
+            ]
+            semester_liste.append(Semester(semester_code, semester_name, module=module, modul_codes=modul_codes))
+
+        return cls(studiengang_code, semester_liste)
+
+    def __str__(self):
+        """
+        Gibt eine String-Darstellung des Lehrplans zurück.
+
+        :return: Formatierte Zeichenkette mit Semestern und Credits.
+        """
+        zeilen = [f"Lehrplan Studiengang {self.studiengang_code} ({self.gesamt_credits} Credits)"]
+        for sem in self.semester:
+            zeilen.append(f"  {sem} - {len(sem.module)} Module, {sem.gesamt_credits} Credits")
+        return "\n".join(zeilen)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# lernverlauf.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die vektorisierte Berechnung der Monatsreihen
+import pandas as pd  # Für Datenverarbeitung
+
+# Monatsnummer (Jahr * 12 + Monat - 1) des Januar 1970, Bezugspunkt von numpy datetime64[M]
+_MONAT_1970 = 1970 * 12
+
+
+def _monatsnummer(datum: pd.Series):
+    """
+    Wandelt Datumswerte in fortlaufende Monatsnummern (Jahr * 12 + Monat - 1) um.
+
+    :param datum: Series mit Datumswerten (Zeichenketten oder datetime).
+    :return: Float-Array der Monatsnummern, NaN für fehlende oder ungültige Daten.
+    """
+    monat = pd.to_datetime(datum, errors="coerce").to_numpy().astype("datetime64[M]")
+    return np.where(np.isnat(monat), np.nan, monat.astype(np.int64) + _MONAT_1970)
+
+
+class Lernverlauf:
+    """
+    Studienfortschritt über die Kalenderzeit: je Student und Monat seit start_studium die kumulierten
+    bestandenen Credits, der bisherige Notendurchschnitt und ein gleitender Notendurchschnitt über die
+    letzten Monate. Beide Durchschnitte umfassen wie calculate_average_grade nur bestandene Module. Die Reihen aller Studenten werden gemeinsam berechnet: Die Prüfungsergebnisse werden
+    per np.bincount auf ein Raster (Student, Monat) verteilt und je Student kumuliert; es gibt keine
+    Schleife über Buchungen. Die Reihe eines Studenten wird beim ersten Abruf aus der Gesamttabelle
+    geschnitten und danach aus dem Cache geliefert.
+    """
+    def __init__(self, data: dict, beziehung, fenster: int = 6):
+        """
+        Berechnet die Monatsreihen aller Studenten.
+
+        :param data: Dictionary mit den geladenen DataFrames (student.csv, modulbuchung.csv, modul.csv).
+        :param beziehung: Aufgelöster Fremdschlüssel modulbuchung.modul_code -> modul.modul_code.
+        :param fenster: Länge des gleitenden Notendurchschnitts in Monaten.
+        """
+        self.fenster = fenster
+        student_data = data["student.csv"].drop_duplicates("student_code")
+        buchungen = data["modulbuchung.csv"]
+
+        codes = pd.Index(student_data["student_code"].astype(str))
+        # Buchungen über ihre eindeutigen Codes den Studenten zuordnen (Hash-Suche nur je eindeutigem Code)
+        buchung_ids, buchung_codes = pd.factorize(buchungen["student_code"].astype(str))
+        student_id = np.append(codes.get_indexer(buchung_codes), -1)[buchung_ids]
+
+        # Monat des Prüfungsergebnisses; ohne Prüfungsdatum zählt das Buchungsdatum
+        monat = _monatsnummer(buchungen["pruefungsdatum"])
+        ohne_datum = np.isnan(monat)
+        monat[ohne_datum] = _monatsnummer(buchungen["buchungsdatum"])[ohne_datum]
+
+        # Credits bestandener Module über den Fremdschlüssel
+        note = buchungen["note"].to_numpy(dtype=float, na_value=np.nan)
+        bestanden = buchungen["bestanden"].to_numpy(dtype=bool, na_value=False)
+        modul_position = beziehung.erste_position(np.arange(len(buchungen)))
+        modul_credits = data["modul.csv"]["credits"].to_numpy(dtype=float, na_value=0.0)
+        credits = np.where(bestanden & (modul_position >= 0), modul_credits[modul_position], 0.0)
+        # Nur Prüfungsergebnisse zählen; reine Anmeldungen verlängern die Reihe nicht
+        gueltig = (student_id >= 0) & ~np.isnan(monat) & (~np.isnan(note) | bestanden)
+        student_id, monat, note, credits = student_id[gueltig], monat[gueltig].astype(np.int64), note[gueltig], credits[gueltig]
+        bestanden = bestanden[gueltig]
+        # Wie der Notendurchschnitt im Dashboard zählen nur Noten bestandener Module
+        bewertet = ~np.isnan(note) & bestanden
+
+        # Zeitraum je Student: vom Monat des Studienbeginns bis zum letzten Prüfungsergebnis.
+        # Ohne Studienbeginn beginnt die Reihe mit dem ersten Ergebnis; Ergebnisse vor dem Studienbeginn
+        # werden dem ersten Monat zugerechnet.
+        start = pd.Series(_monatsnummer(student_data["start_studium"]))
+        erstes = pd.Series(monat).groupby(student_id).min().reindex(range(len(codes)))
+        letztes = pd.Series(monat).groupby(student_id).max().reindex(range(len(codes)))
+        start = start.fillna(erstes).to_numpy()
+        hat_reihe = ~np.isnan(start)
+        ende = np.fmax(letztes.to_numpy(), start)
+        laenge = np.where(hat_reihe, ende - start + 1, 0).astype(np.int64)
+        start = np.where(hat_reihe, start, 0).astype(np.int64)
+
+        # Raster (Student, Monat) als flache Arrays mit Abschnitt je Student
+        self._offsets = np.concatenate([[0], np.cumsum(laenge)])
+        zeilen = int(self._offsets[-1])
+        raster_student = np.repeat(np.arange(len(codes)), laenge)
+        raster_monat = start[raster_student] + np.arange(zeilen) - self._offsets[raster_student]
+
+        # Prüfungsergebnisse auf das Raster verteilen
+        position = self._offsets[student_id] + np.clip(monat - start[student_id], 0, None)
+        monats_credits = np.bincount(position, weights=credits, minlength=zeilen)
+        notensumme = np.bincount(position[bewertet], weights=note[bewertet], minlength=zeilen)
+        notenanzahl = np.bincount(position[bewertet], minlength=zeilen).astype(float)
+
+        # Kumulierte Summen je Student: globale Summe abzüglich des Stands vor dem Abschnittsanfang
+        def kumulieren(werte):
+            summe = np.concatenate([[0.0], np.cumsum(werte)])
+            return summe[1:] - summe[self._offsets[raster_student]], summe
+
+        kumulierte_credits, _ = kumulieren(monats_credits)
+        kumulierte_notensumme, notensumme_global = kumulieren(notensumme)
+        kumulierte_notenanzahl, notenanzahl_global = kumulieren(notenanzahl)
+
+        # Gleitendes Fenster: Stand am Monatsende abzüglich des Stands vor dem Fenster (höchstens Abschnittsanfang)
+        fenster_anfang = np.maximum(np.arange(zeilen) + 1 - fenster, self._offsets[raster_student])
+        fenster_notensumme = notensumme_global[1:] - notensumme_global[fenster_anfang]
+        fenster_notenanzahl = notenanzahl_global[1:] - notenanzahl_global[fenster_anfang]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.tabelle = pd.DataFrame({
+                "student_code": codes.to_numpy()[raster_student],
+                "monat": (raster_monat - _MONAT_1970).astype("datetime64[M]").astype("datetime64[s]"),
+                "credits": monats_credits,
+                "kumulierte_credits": kumulierte_credits,
+                "durchschnitt": np.where(kumulierte_notenanzahl > 0, kumulierte_notensumme / kumulierte_notenanzahl, np.nan),
+                "gleitender_durchschnitt": np.where(fenster_notenanzahl > 0, fenster_notensumme / fenster_notenanzahl, np.nan)
+            })
+
+        self._student_id = dict(zip(codes, range(len(codes))))
+        self._cache = {}
+
+    def fuer_student(self, student_code: str):
+        """
+        Gibt die Monatsreihe eines Studenten zurück.
+
+        :param student_code: Der Code des Studenten.
+        :return: DataFrame mit den Spalten monat, credits, kumulierte_credits, durchschnitt und
+                 gleitender_durchschnitt oder None, falls für den Studenten keine Reihe vorliegt.
+        """
+        student_code = str(student_code)
+        if student_code not in self._cache:
+            student_id = self._student_id.get(student_code)
+            reihe = None
+            if student_id is not None and self._offsets[student_id + 1] > self._offsets[student_id]:
+                reihe = self.tabelle.iloc[self._offsets[student_id]:self._offsets[student_id + 1]]
+                reihe = reihe.drop(columns="student_code").reset_index(drop=True)
+            self._cache[student_code] = reihe
+        return self._cache[student_code]
@@ -4,68 +4,159 @@
 # main.py
 
 # Importiere notwendige Module und Klassen
+import argparse  # Für die Kommandozeilenargumente
+import contextlib  # Für das Umleiten der Debug-Ausgaben im Skriptmodus
+import json  # Für die JSON-Ausgabe im Skriptmodus
+import sys  # Für stdin, stdout, stderr und den Exit-Code
 from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
 from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
-from student import Student  # Klasse zur Repräsentation eines Studenten
-import dashboard  # Modul zur Verwaltung des Dashboards
+from gemeinsamerdatensatz import GemeinsamerDatensatz  # Von mehreren Prozessen gemeinsam genutzte Tabellen
+from studentcache import StudentCache  # Festplatten-Cache für Student-Objekte und ViewModels
+from dashboarddaten import dashboard_viewmodel, json_wert  # Vorberechnete Dashboard-Daten je Student
 
-def main():
+def tab_vervollstaendigung_einrichten(suche):
+    """
+    Richtet die Tab-Vervollständigung der Eingabe über readline ein (nur, falls readline verfügbar ist).
+    :param suche: Studentensuche-Objekt, das die Vorschläge liefert.
+    """
+    try:
+        import readline  # Zeileneditor der Kommandozeile (unter Windows meist nicht vorhanden)
+    except ImportError:
+        return
+    vorschlaege = []
+
+    def vervollstaendigen(text, nummer):
+        if nummer == 0:
+            vorschlaege[:] = [code for code, _ in suche.suchen(text, limit=20, unscharf=False)]
+        return vorschlaege[nummer] if nummer < len(vorschlaege) else None
+
+    readline.set_completer(vervollstaendigen)
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
+
+def student_code_abfragen(suche):
+    """
+    Fragt einen Studenten-Code oder Namen ab. Ein exakter Code oder ein einzelner Treffer wird direkt
+    übernommen, sonst werden nummerierte Vorschläge zur Auswahl angezeigt.
+    :param suche: Studentensuche-Objekt
+    :return: Der gewählte Studenten-Code oder die unveränderte Eingabe, falls nichts gefunden wurde.
+    """
+    eingabe = input("Bitte gib den Studenten-Code oder Namen ein: ").strip()
+    if suche.ist_code(eingabe):
+        return eingabe
+    treffer = suche.suchen(eingabe, limit=10)
+    if len(treffer) == 1:
+        return treffer[0][0]
+    if not treffer:
+        return eingabe
+
+    for nummer, (code, name) in enumerate(treffer, start=1):
+        print(f"{nummer:>2}. {code} - {name}")
+    auswahl = input("Nummer des Studenten (Enter für den ersten Treffer): ").strip()
+    if auswahl.isdigit() and 1 <= int(auswahl) <= len(treffer):
+        return treffer[int(auswahl) - 1][0]
+    return treffer[0][0]
+
+def student_codes_lesen(argumente, eingabe=None):
+    """
+    Liefert die Studenten-Codes aus den Kommandozeilenargumenten; das Argument "-" liest weitere Codes
+    (durch Leerraum oder Zeilenumbrüche getrennt) von der Standardeingabe.
+    :param argumente: Liste der Argumente.
+    :param eingabe: Textdatei für "-" (Standard: sys.stdin).
+    :return: Generator der Studenten-Codes in Eingabereihenfolge.
+    """
+    for argument in argumente:
+        if argument == "-":
+            for zeile in eingabe if eingabe is not None else sys.stdin:
+                yield from zeile.split()
+        else:
+            yield argument
+
+def json_ausgeben(dbhandler, student_codes, ausgabe):
+    """
+    Gibt die Dashboard-Daten je Student als eine JSON-Zeile aus (JSON Lines): Informationen, Modullisten,
+    Prüfungsformen, Credits je Plansemester und Kennzahlen inklusive Abstand zur Zielnote.
+    Debug-Ausgaben der Datenzugriffe werden nach stderr umgeleitet, damit die Ausgabe maschinenlesbar bleibt.
+    :param dbhandler: Instanz von DBZugriff mit den geladenen Daten (wird für alle Studenten wiederverwendet).
+    :param student_codes: Iterable von Studenten-Codes.
+    :param ausgabe: Geöffnete Textdatei für die JSON-Zeilen (z. B. sys.stdout).
+    :return: Anzahl der Codes, zu denen kein Student gefunden wurde.
+    """
+    nicht_gefunden = 0
+    for student_code in student_codes:
+        with contextlib.redirect_stdout(sys.stderr):
+            viewmodel = dashboard_viewmodel(dbhandler, student_code)
+        if viewmodel is None:
+            print(f"Kein Student mit dem Code {student_code} gefunden.", file=sys.stderr)
+            nicht_gefunden += 1
+            continue
+        daten = viewmodel.als_dict()
+        daten["noten"]["abstand_zielnote"] = viewmodel.abstand_zielnote
+        ausgabe.write(json.dumps(daten, default=json_wert, ensure_ascii=False) + "\n")
+        ausgabe.flush()
+    return nicht_gefunden
+
+def main(argv=None):
     """
     Hauptfunktion des Programms.
-    - Initialisiert die Zugriffsobjekte (CSV und DB).
-    - Holt die Studentendaten basierend auf Benutzereingabe.
-    - Erstellt ein Student-Objekt und sammelt relevante Daten.
-    - Startet das Dashboard mit den gesammelten Informationen.
+    - Ohne Argumente: interaktiver Modus mit Eingabe des Studenten und Tk-Dashboard.
+    - Mit Studenten-Codes (oder "-" für Codes von stdin): Skriptmodus ohne GUI- und Matplotlib-Importe,
+      die Dashboard-Daten werden aus einem einmal geladenen Datenbestand als JSON Lines ausgegeben.
+    :param argv: Optionale Argumentliste (Standard: sys.argv).
+    :return: Exit-Code (1, falls im Skriptmodus ein Code nicht gefunden wurde).
     """
+    parser = argparse.ArgumentParser(description="Studenten-Dashboard")
+    parser.add_argument("student_codes", nargs="*",
+                        help="Studenten-Codes für die JSON-Ausgabe; \"-\" liest Codes von stdin. "
+                             "Ohne Angabe startet das interaktive Dashboard.")
+    args = parser.parse_args(argv)
+
     # Erstelle eine Instanz von CSVZugriff
     csv_zugriff = CSVZugriff()  # Verwaltet den Zugriff auf die CSV-Datei
 
-    # Erstelle eine Instanz von DBZugriff und übergebe die CSVZugriff-Instanz
-    dbhandler = DBZugriff(csv_zugriff) # Schnittstelle zur Datenbank
-
-    # Benutzereingabe für den Studenten-Code
-    student_code = input("Bitte gib den Studenten-Code ein: ")
-
-    # Versuche, die Studentendaten basierend auf dem Studenten-Code aus der Datenbank zu holen
-    student_data = dbhandler.get_student(student_code)
-
-    if student_data is not None and not student_data.empty:
-        # Wenn die Daten existieren, extrahiere relevante Informationen
+    if args.student_codes:
+        # Skriptmodus: Laden einmalig direkt aus den CSV-Dateien, Meldungen nach stderr. Der gemeinsame
+        # Datensatz lohnt sich nur für die langlebigen Dashboard-Prozesse und würde bei jedem Aufruf
+        # (z. B. aus einem Cron-Job) eine Datei im Arbeitsverzeichnis anlegen
+        with contextlib.redirect_stdout(sys.stderr):
+            dbhandler = DBZugriff(csv_zugriff)
+            dbhandler.read_data()
+        nicht_gefunden = json_ausgeben(dbhandler, student_codes_lesen(args.student_codes), sys.stdout)
+        return 1 if nicht_gefunden else 0
+
+    # Lokaler Import, damit der Skriptmodus ohne Tkinter und Matplotlib auskommt
+    import dashboard  # Modul zur Verwaltung des Dashboards
+
+    # Erstelle eine Instanz von DBZugriff; die Tabellen werden aus dem gemeinsamen Datensatz eingebunden,
+    # den alle Dashboard-Prozesse auf diesem Rechner teilen (bei Bedarf wird er aus den CSV-Dateien erzeugt)
+    dbhandler = DBZugriff(GemeinsamerDatensatz(csv_zugriff)) # Schnittstelle zur Datenbank
+
+    # Benutzereingabe für den Studenten-Code; Namen und Tippfehler werden über den Suchindex aufgelöst
+    suche = dbhandler.get_studentensuche()
+    tab_vervollstaendigung_einrichten(suche)
+    student_code = student_code_abfragen(suche)
+
+    # Hole die vorberechneten Dashboard-Daten; bei wiederholtem Aufruf werden sie aus dem Warmstart-Cache geladen
+    student_cache = StudentCache(dbhandler)
+    viewmodel = student_cache.get_viewmodel(student_code)
+
+    if viewmodel is not None:
+        # Wenn die Daten existieren, starte das Dashboard
         print(f"Studenten-Daten für {student_code} gefunden. Starte Dashboard...")
 
-        # Extrahiere spezifische Felder aus den Studentendaten
-        student_name = student_data['student_name'].values[0]
-        start_studium = student_data.iloc[0]["start_studium"]
-        zielnote = student_data.iloc[0]["zielnote"]
-
-        # Erstelle ein Student-Objekt mit den abgerufenen Informationen
-        student = Student(
-            student_code=student_code,
-            student_name=student_name,
-            start_studium=start_studium,
-            zielnote=zielnote,
-            db_handler=dbhandler
-        )
-
-        # Hole die verschiedenen Module des Studenten
-        booked_not_completed_modules = dbhandler.get_booked_but_not_completed_modules(student_code)
-        not_booked_modules = dbhandler.get_modules_not_booked_yet(student_code)
-        completed_modules = dbhandler.get_completed_modules(student_code)
-        
-        # Erstelle eine grafische Darstellung der gesammelten Studienleistung
-        student_plot = student.plot_combined_credits_per_semester()
-
-        # Starte das Dashboard und übergebe alle gesammelten Daten
-        dashboard.run_dashboard(student, booked_not_completed_modules, not_booked_modules, completed_modules)
+        # Starte das Dashboard mit dem ViewModel
+        # Der Cache wird auch für den Studentenwechsel im laufenden Dashboard genutzt
+        dashboard.run_dashboard(viewmodel, dbhandler, viewmodel_laden=student_cache.get_viewmodel)
 
 
     else:
         # Wenn keine Daten gefunden wurden, gib eine Fehlermeldung aus
         print(f"Kein Student mit dem Code {student_code} gefunden.")
+    return 0
 
 # Prüft, ob die Datei direkt ausgeführt wird, und startet die Hauptfunktion
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 
 # 
@@ -14,16 +14,17 @@ class Modul:
     Repräsentiert ein Modul, das in einem Studiengang angeboten wird. 
     Diese Klasse lädt und speichert die relevanten Daten eines Moduls.
     """
-    def __init__(self, modul_code: str, modul_name: str, credits: int, tutor: str, preufungsform: str, db_handler: DBZugriff):
+    def __init__(self, modul_code: str, modul_name: str, credits: int, tutor: str, pruefungsform: str, db_handler: DBZugriff = None):
         """
-        Initialisiert die Modul-Klasse und lädt die Daten des Moduls aus der Datenbank.
+        Initialisiert die Modul-Klasse und lädt die Daten des Moduls aus der Datenbank,
+        sofern ein db_handler übergeben wird.
 
         :param modul_code: Der eindeutige Code des Moduls.
         :param modul_name: Der Name des Moduls.
         :param credits: Die Anzahl der ECTS-Credits, die für das Modul vergeben werden.
         :param tutor: Der Tutor, der für das Modul verantwortlich ist.
         :param pruefungsform: Die Prüfungsform des Moduls (z. B. Klausur, Hausarbeit).
-        :param db_handler: Eine Instanz der DBZugriff-Klasse für den Zugriff auf die Datenbank.
+        :param db_handler: Optionale Instanz der DBZugriff-Klasse für den Zugriff auf die Datenbank.
         """
         self.modul_code = modul_code
         self.modul_name = modul_name
@@ -32,8 +33,9 @@ class Modul:
         self.pruefungsform = pruefungsform
         self.db_handler = db_handler
         
-        # Lade die Moduldaten sofort beim Erstellen des Moduls
-        self.lade_daten()
+        # Lade die Moduldaten sofort beim Erstellen des Moduls, falls ein DB-Handler vorhanden ist
+        if db_handler is not None:
+            self.lade_daten()
 
     def lade_daten(self):
         """
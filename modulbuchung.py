@@ -7,8 +7,9 @@
 #modulbuchung.py
 
 # Importiere notwendige Module und Klassen
-from datetime import datetime # Für korrekte Datumsanzeige
+import numpy as np # Für die Zielpositionen der Fremdschlüssel
 import pandas as pd # Importiere pandas für die Arbeit mit DataFrames
+from schema import python_werte # Umwandlung typisierter Spalten in Python-Werte
 
 class Modulbuchung:
     """
@@ -19,11 +20,14 @@ class Modulbuchung:
         """
         Initialisiert die Modulbuchung und lädt Modul- sowie Studentendaten.
 
+        Die Werte werden unverändert übernommen; die Typumwandlung erfolgt spaltenweise beim Einlesen
+        (siehe schema.py und aus_tabelle).
+
         :param buchungsnummer: Eindeutige Nummer der Buchung.
-        :param buchungsdatum: Datum der Buchung (als Timestamp oder None).
+        :param buchungsdatum: Datum der Buchung (als datetime oder None).
         :param status: Der Status der Buchung (z. B. "offen", "abgeschlossen").
         :param pruefungsversuch: Anzahl der Prüfungsversuche.
-        :param pruefungsdatum: Datum der Prüfung (optional, als Timestamp oder None).
+        :param pruefungsdatum: Datum der Prüfung (optional, als datetime oder None).
         :param note: Note der Prüfung (optional, als Float).
         :param bestanden: Status, ob die Prüfung bestanden wurde (als bool).
         :param modul_code: Code des zugehörigen Moduls.
@@ -31,13 +35,12 @@ class Modulbuchung:
         :param db_handler: Datenbankzugriffs-Handler für das Laden von Daten.
         """
         self.buchungsnummer = buchungsnummer
-        self.buchungsdatum = buchungsdatum.to_pydatetime() if pd.notna(buchungsdatum) else None
+        self.buchungsdatum = buchungsdatum
         self.status = status
         self.pruefungsversuch = pruefungsversuch
-        # Falls pruefungsdatum ein Timestamp ist, konvertiere ihn in einen String
-        self.pruefungsdatum = datetime.strptime(pruefungsdatum.strftime('%Y-%m-%d'), '%Y-%m-%d') if pd.notna(pruefungsdatum) else None
-        self.note = float(note) if note is not None else None
-        self.bestanden = bool(bestanden)  # Sicherstellen, dass 'bestanden' als bool behandelt wird
+        self.pruefungsdatum = pruefungsdatum
+        self.note = note
+        self.bestanden = bestanden
         self.modul_code = modul_code
         self.student_code = student_code
         self.db_handler = db_handler
@@ -46,6 +49,46 @@ class Modulbuchung:
         self.modul = self.load_modul() if db_handler else None
         self.student = self.lade_student() if db_handler else None
 
+    @classmethod
+    def aus_tabelle(cls, modulbuchung_data: pd.DataFrame, db_handler=None):
+        """
+        Erstellt Modulbuchungen aus einer typisierten Tabelle. Jede Spalte wird einmal als Ganzes in
+        Python-Werte umgewandelt (Datum -> datetime oder None), statt jede Zeile einzeln zu konvertieren.
+        Modul und Student werden nicht je Buchung abgefragt, sondern über die beim Laden aufgelösten
+        Fremdschlüssel aus den geladenen Tabellen übernommen; je Modul und Student entsteht nur ein Objekt.
+
+        :param modulbuchung_data: DataFrame mit Modulbuchungen (Spalten wie in modulbuchung.csv).
+        :param db_handler: Datenbankzugriffs-Handler für das Laden von Modul und Student.
+        :return: Liste von Modulbuchung-Objekten.
+        """
+        spalten = {spalte: python_werte(modulbuchung_data[spalte]) for spalte in modulbuchung_data.columns}
+        buchungen = [cls(**dict(zip(spalten, werte))) for werte in zip(*spalten.values())]
+        if not db_handler:
+            return buchungen
+
+        module = _zuordnen(db_handler, modulbuchung_data, "modul_code", Modul,
+                           ["modul_code", "modul_name", "credits", "tutor", "pruefungsform"])
+        studenten = _zuordnen(db_handler, modulbuchung_data, "student_code", Student,
+                              ["student_code", "student_name", "start_studium", "zielnote"])
+
+        # Ohne geladene Daten wird je Modul- bzw. Studentencode nur einmal abgefragt
+        geladene_module, geladene_studenten = {}, {}
+        for nummer, buchung in enumerate(buchungen):
+            buchung.db_handler = db_handler
+            if module is not None:
+                buchung.modul = module[nummer]
+            else:
+                if buchung.modul_code not in geladene_module:
+                    geladene_module[buchung.modul_code] = buchung.load_modul()
+                buchung.modul = geladene_module[buchung.modul_code]
+            if studenten is not None:
+                buchung.student = studenten[nummer]
+            else:
+                if buchung.student_code not in geladene_studenten:
+                    geladene_studenten[buchung.student_code] = buchung.lade_student()
+                buchung.student = geladene_studenten[buchung.student_code]
+        return buchungen
+
     def load_modul(self):
         """
         Lädt die Daten des zugehörigen Moduls basierend auf modul_code aus der Datenbank.
@@ -55,13 +98,12 @@ class Modulbuchung:
         if not self.db_handler:
             raise ValueError("Kein DB-Handler vorhanden. Modul kann nicht geladen werden.")
         
-        # Abrufen der Modul-Daten
+        # Abrufen der Modul-Daten (Indexzugriff; unbekannte Modulkodes meldet DBZugriff einmalig beim Laden)
         modul_data = self.db_handler.get_modul(self.modul_code)
+        if modul_data is not None and modul_data.empty:
+            return None
         
         if modul_data is not None:
-            # Debugging-Ausgabe der geladenen Daten
-            print(f"Geladene Modul-Daten: {modul_data}")
-            
             # Überprüfen, ob die erwarteten Spalten vorhanden sind
             if "modul_code" in modul_data.columns:
                 return Modul(
@@ -90,10 +132,7 @@ class Modulbuchung:
         # Abrufen der Student-Daten
         student_data = self.db_handler.get_student(self.student_code)
         
-        if student_data is not None:
-            # Debugging-Ausgabe der geladenen Daten
-            print(f"Geladene Student-Daten: {student_data}")
-            
+        if student_data is not None and not student_data.empty:
             # Überprüfen, ob die erwarteten Spalten vorhanden sind
             if "student_code" in student_data.columns:
                 return Student(
@@ -110,6 +149,16 @@ class Modulbuchung:
         return None
 
 
+    def __getstate__(self):
+        """
+        Liefert den Zustand für pickle; der DB-Handler wird nicht mitgespeichert.
+
+        :return: Dictionary mit den Attributen der Modulbuchung ohne db_handler.
+        """
+        state = self.__dict__.copy()
+        state["db_handler"] = None
+        return state
+
     def show_status(self):
         """
         Gibt den Status der Modulbuchung zurück.
@@ -155,6 +204,36 @@ class Modulbuchung:
         student_info = f"Student: {self.student.student_name} (Code: {self.student_code})" if self.student else "Kein Student"
         return f"Buchungsnummer: {self.buchungsnummer} | {modul_info} - {student_info} | Status: {self.status} | Prüfung: {self.pruefungsversuch} - Bestanden: {self.bestanden}"
 
+def _zuordnen(db_handler, modulbuchung_data: pd.DataFrame, spalte: str, klasse, ziel_spalten: list):
+    """
+    Ordnet jeder Buchung das Objekt der Zeile zu, auf die ihr Fremdschlüssel in den geladenen Tabellen zeigt
+    (bei mehrdeutigen Schlüsseln wie bisher die erste Zeile). Je Zielzeile wird ein Objekt erzeugt und von
+    allen Buchungen geteilt.
+
+    :param db_handler: Datenbankzugriffs-Handler mit geladenen Tabellen und aufgelösten Fremdschlüsseln.
+    :param modulbuchung_data: DataFrame mit Modulbuchungen aus der geladenen Tabelle modulbuchung.csv.
+    :param spalte: Fremdschlüsselspalte in modulbuchung.csv ("modul_code" oder "student_code").
+    :param klasse: Klasse der Zielobjekte; sie wird mit den Werten der ziel_spalten erzeugt.
+    :param ziel_spalten: Spalten der Zieltabelle in der Reihenfolge der Konstruktorparameter.
+    :return: Liste mit je Buchung einem Objekt oder None (ohne Treffer) oder None, falls die
+             Fremdschlüssel nicht aufgelöst sind oder die Buchungen nicht aus der geladenen Tabelle stammen.
+    """
+    data = getattr(db_handler, "data", None)
+    beziehung = getattr(db_handler, "fremdschluessel", {}).get(("modulbuchung.csv", spalte))
+    if data is None or beziehung is None:
+        return None
+    quell_positionen = data["modulbuchung.csv"].index.get_indexer(modulbuchung_data.index)
+    if (quell_positionen < 0).any():
+        return None
+
+    ziel = [data[beziehung.ziel][ziel_spalte] for ziel_spalte in ziel_spalten]
+    ziel_positionen = beziehung.erste_position(quell_positionen)
+    objekte = {-1: None}
+    for position in np.unique(ziel_positionen[ziel_positionen >= 0]):
+        objekte[position] = klasse(*(werte.iat[position] for werte in ziel))
+    return [objekte[position] for position in ziel_positionen]
+
+
 class Modul:
     def __init__(self, modul_code, modul_name, credits, tutor, pruefungsform):
         self.modul_code = modul_code
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# modulstatistik.py
+
+# Importiere notwendige Module und Klassen
+from bisect import insort  # Für das sortierte Einfügen neuer Noten
+import numpy as np  # Für die Statistikberechnung einzelner Module
+import pandas as pd  # Für Datenverarbeitung
+
+class Modulstatistik:
+    """
+    Notenstatistik je Modul über alle Studenten (Mittelwert, Median, Quartile, Bestehensquote,
+    Prüfungsversuche). Die Tabelle wird in einem groupby über modulbuchung berechnet und bei
+    neuen Prüfungsergebnissen nur für das betroffene Modul aktualisiert. Für jede Note eines
+    Moduls ist das Perzentil vorberechnet, sodass die Abfrage je Zeile ein Dictionary-Zugriff ist.
+    """
+    def __init__(self, modulbuchung_data: pd.DataFrame):
+        """
+        Berechnet die Statistik aus den Modulbuchungen.
+
+        :param modulbuchung_data: DataFrame aus modulbuchung.csv.
+        """
+        # Nur bewertete Buchungen fließen in die Statistik ein
+        bewertet = modulbuchung_data[modulbuchung_data["note"].notna()][["modul_code", "note", "bestanden", "pruefungsversuch"]]
+
+        gruppen = bewertet.groupby("modul_code", sort=False)
+        self.tabelle = pd.DataFrame({
+            "anzahl": gruppen["note"].size(),
+            "mittelwert": gruppen["note"].mean(),
+            "median": gruppen["note"].median(),
+            "p25": gruppen["note"].quantile(0.25),
+            "p75": gruppen["note"].quantile(0.75),
+            "bestehensquote": gruppen["bestanden"].mean(),
+            "mittlere_versuche": gruppen["pruefungsversuch"].mean()
+        })
+
+        # Sortierte Noten und Summen je Modul für inkrementelle Aktualisierungen
+        self.noten = {modul_code: sorted(noten) for modul_code, noten in gruppen["note"].agg(list).items()}
+        self.bestanden = gruppen["bestanden"].sum().astype(int).to_dict()
+        self.versuche = gruppen["pruefungsversuch"].sum().to_dict()
+
+        # Perzentil je (Modul, Note): Anteil der Ergebnisse, die gleich gut oder schlechter sind (in Prozent).
+        # Niedrigere Noten sind besser, daher wird von der schlechtesten Note her kumuliert.
+        haeufigkeit = bewertet.groupby(["modul_code", "note"]).size().sort_index(ascending=[True, False])
+        kumuliert = haeufigkeit.groupby(level="modul_code").cumsum()
+        perzentil = 100.0 * kumuliert / haeufigkeit.groupby(level="modul_code").transform("sum")
+        self.perzentile = {}
+        for (modul_code, note), wert in perzentil.items():
+            self.perzentile.setdefault(modul_code, {})[note] = wert
+
+    def perzentil(self, modul_code: str, note: float):
+        """
+        Gibt das Perzentil einer Note innerhalb eines Moduls zurück (O(1)).
+
+        :param modul_code: Code des Moduls.
+        :param note: Die Note des Studenten.
+        :return: Anteil der Ergebnisse in Prozent, die gleich gut oder schlechter sind, oder None.
+        """
+        return self.perzentile.get(modul_code, {}).get(note)
+
+    def get_statistik(self, modul_code: str):
+        """
+        Gibt die Statistikzeile eines Moduls zurück.
+
+        :param modul_code: Code des Moduls.
+        :return: Pandas Series mit den Kennzahlen oder None, falls keine Ergebnisse vorliegen.
+        """
+        if modul_code not in self.tabelle.index:
+            return None
+        return self.tabelle.loc[modul_code]
+
+    def aktualisieren(self, modul_code: str, note: float, bestanden: bool, pruefungsversuch: int = 1):
+        """
+        Nimmt ein neues Prüfungsergebnis auf und berechnet nur die Kennzahlen dieses Moduls neu.
+
+        :param modul_code: Code des Moduls.
+        :param note: Die erzielte Note.
+        :param bestanden: Ob die Prüfung bestanden wurde.
+        :param pruefungsversuch: Nummer des Prüfungsversuchs.
+        """
+        if note is None or pd.isna(note):
+            return
+        noten = self.noten.setdefault(modul_code, [])
+        insort(noten, float(note))
+        self.bestanden[modul_code] = self.bestanden.get(modul_code, 0) + int(bool(bestanden))
+        self.versuche[modul_code] = self.versuche.get(modul_code, 0) + pruefungsversuch
+
+        anzahl = len(noten)
+        werte = np.asarray(noten)
+        self.tabelle.loc[modul_code] = [
+            anzahl, werte.mean(), np.median(werte), np.quantile(werte, 0.25), np.quantile(werte, 0.75),
+            self.bestanden[modul_code] / anzahl, self.versuche[modul_code] / anzahl
+        ]
+
+        # Perzentile des Moduls aus der sortierten Liste neu aufbauen
+        eindeutig, anzahl_je_note = np.unique(werte, return_counts=True)
+        gleich_oder_schlechter = np.cumsum(anzahl_je_note[::-1])[::-1]
+        self.perzentile[modul_code] = dict(zip(eindeutig.tolist(), (100.0 * gleich_oder_schlechter / anzahl).tolist()))
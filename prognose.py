@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# prognose.py
+
+# Importiere notwendige Module und Klassen
+import math  # Für die Fehlerfunktion der Normalverteilung
+import numpy as np  # Für die vektorisierten Simulationen
+import pandas as pd  # Für Datenverarbeitung
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+
+# Bereich der Noten, mit denen ein Modul bestanden wird
+BESTE_NOTE = 1.0
+SCHLECHTESTE_NOTE = 4.0
+
+
+def _verteilungsfunktion(x):
+    """
+    Verteilungsfunktion der Standardnormalverteilung, elementweise.
+
+    :param x: Array von Werten (auch ±inf).
+    :return: Array der Wahrscheinlichkeiten P(Z <= x).
+    """
+    x = np.asarray(x, dtype=float)
+    return 0.5 * (1.0 + np.vectorize(math.erf, otypes=[float])(x / math.sqrt(2.0)))
+
+
+def _dichte(x):
+    """
+    Dichte der Standardnormalverteilung, elementweise.
+
+    :param x: Array von Werten (auch ±inf).
+    :return: Array der Dichtewerte.
+    """
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+def begrenzte_momente(mittelwert, streuung):
+    """
+    Berechnet Erwartungswert und Varianz einer Modulnote, die normalverteilt um mittelwert streut und auf
+    BESTE_NOTE bis SCHLECHTESTE_NOTE begrenzt wird (Werte außerhalb zählen als die jeweilige Grenze).
+
+    :param mittelwert: Array der erwarteten Note.
+    :param streuung: Array der Standardabweichung vor der Begrenzung.
+    :return: Tupel (Erwartungswert, Varianz) als Arrays.
+    """
+    mittelwert = np.asarray(mittelwert, dtype=float)
+    streuung = np.asarray(streuung, dtype=float)
+    positiv = streuung > 0
+    sigma = np.where(positiv, streuung, 1.0)
+    alpha = (BESTE_NOTE - mittelwert) / sigma
+    beta = (SCHLECHTESTE_NOTE - mittelwert) / sigma
+
+    unten, oben = _verteilungsfunktion(alpha), _verteilungsfunktion(beta)
+    dichte_alpha, dichte_beta = _dichte(alpha), _dichte(beta)
+    innen = oben - unten
+    erwartung = BESTE_NOTE * unten + SCHLECHTESTE_NOTE * (1 - oben) + mittelwert * innen + sigma * (dichte_alpha - dichte_beta)
+    zweites_moment = (BESTE_NOTE ** 2 * unten + SCHLECHTESTE_NOTE ** 2 * (1 - oben) + mittelwert ** 2 * innen
+                      + 2 * mittelwert * sigma * (dichte_alpha - dichte_beta)
+                      + sigma ** 2 * (innen + alpha * dichte_alpha - beta * dichte_beta))
+    varianz = np.maximum(zweites_moment - erwartung ** 2, 0.0)
+
+    # Ohne Streuung ist die Note fest
+    erwartung = np.where(positiv, erwartung, np.clip(mittelwert, BESTE_NOTE, SCHLECHTESTE_NOTE))
+    return erwartung, np.where(positiv, varianz, 0.0)
+
+
+class Notenprognose:
+    """
+    Prognose-Engine für die Erreichbarkeit der Zielnote.
+    Berechnet credit-gewichtet die Note, die in den verbleibenden Modulen im Schnitt nötig ist,
+    und schätzt über Monte-Carlo-Simulationen die Wahrscheinlichkeit, die Zielnote zu erreichen.
+    Die Simulationen laufen für alle Studenten gemeinsam als NumPy-Arrays, ohne Schleife über Studenten.
+    """
+    def __init__(self, db_handler: DBZugriff, simulationen: int = 2000, streuung: float = None,
+                 seed: int = None, max_elemente: int = 4_000_000):
+        """
+        Initialisiert die Prognose-Engine.
+
+        :param db_handler: Instanz von DBZugriff mit den geladenen Daten.
+        :param simulationen: Anzahl der simulierten Szenarien je Student.
+        :param streuung: Feste Standardabweichung der simulierten Noten; ohne Angabe wird sie je Student geschätzt.
+        :param seed: Optionaler Startwert des Zufallsgenerators für reproduzierbare Ergebnisse.
+        :param max_elemente: Obergrenze für die Größe der Zufallsmatrix je Block (Speicherbedarf).
+        """
+        self.db_handler = db_handler
+        self.simulationen = simulationen
+        self.streuung = streuung
+        self.rng = np.random.default_rng(seed)
+        self.max_elemente = max_elemente
+
+        # Standardabweichung der Kohorte als (Datenversion, Wert), siehe kohortenstreuung
+        self._kohortenstreuung = None
+
+    @staticmethod
+    def benoetigte_note(noten_summe, erreichte_credits, offene_credits, zielnote):
+        """
+        Berechnet credit-gewichtet die Durchschnittsnote, die in den offenen Modulen nötig ist,
+        damit der Gesamtdurchschnitt die Zielnote erreicht. Funktioniert für Einzelwerte und Arrays.
+
+        :param noten_summe: Summe aus Note mal Credits der bestandenen Module.
+        :param erreichte_credits: Summe der Credits der bestandenen Module.
+        :param offene_credits: Summe der Credits der noch offenen Module.
+        :param zielnote: Zielnote des Studenten.
+        :return: Benötigte Durchschnittsnote (NaN, falls keine Module offen sind).
+        """
+        noten_summe, erreichte_credits, offene_credits, zielnote = (
+            np.asarray(wert, dtype=float) for wert in (noten_summe, erreichte_credits, offene_credits, zielnote)
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(offene_credits > 0,
+                            (zielnote * (erreichte_credits + offene_credits) - noten_summe) / offene_credits,
+                            np.nan)
+
+    def _simulieren(self, mittelwert, streuung, noten_summe, erreichte_credits, zielnote, anzahl_noten,
+                    offene_credits, quadrat_credits):
+        """
+        Simuliert die Noten der offenen Module aller Studenten und gibt je Student die
+        Wahrscheinlichkeit zurück, die Zielnote zu erreichen.
+
+        Jede Modulnote streut normalverteilt um den Mittelwert des Studenten und wird auf 1,0 bis 4,0 begrenzt.
+        Simuliert wird je Szenario direkt die credit-gewichtete Notensumme der offenen Module: eine Normalverteilung
+        mit Erwartungswert und Varianz der Summe der begrenzten Modulnoten. Die Zufallsmatrix hat dadurch eine
+        Spalte je Student statt je offenem Modul.
+
+        :param mittelwert: Array der erwarteten Note je Student.
+        :param streuung: Array der Standardabweichung je Student.
+        :param noten_summe: Array Summe Note mal Credits der bestandenen Module je Student.
+        :param erreichte_credits: Array der bestandenen Credits je Student.
+        :param zielnote: Array der Zielnote je Student.
+        :param anzahl_noten: Array der Anzahl eigener Noten je Student; ohne Noten ist keine Prognose möglich.
+        :param offene_credits: Array der Summe der Credits der offenen Module je Student.
+        :param quadrat_credits: Array der Summe der quadrierten Credits der offenen Module je Student.
+        :return: Array der Wahrscheinlichkeiten je Student (NaN ohne Zielnote oder ohne eigene Noten).
+        """
+        anzahl_studenten = len(mittelwert)
+
+        # Ohne offene Module steht das Ergebnis bereits fest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            aktueller_schnitt = noten_summe / erreichte_credits
+        wahrscheinlichkeit = np.where(aktueller_schnitt <= zielnote, 1.0, 0.0)
+
+        # Notensumme der offenen Module: Erwartungswert und Standardabweichung je Student, daraus die
+        # Wahrscheinlichkeit, dass eine standardnormalverteilte Abweichung unter der Schwelle zur Zielnote bleibt
+        simuliert = np.flatnonzero((offene_credits > 0) & ~np.isnan(zielnote) & (anzahl_noten > 0))
+        erwartung, varianz = begrenzte_momente(mittelwert[simuliert], streuung[simuliert])
+        summe_mittel = erwartung * offene_credits[simuliert]
+        summe_streuung = np.sqrt(varianz * quadrat_credits[simuliert])
+        grenze = zielnote[simuliert] * (erreichte_credits[simuliert] + offene_credits[simuliert]) - noten_summe[simuliert]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            schwelle = np.where(summe_streuung > 0, (grenze - summe_mittel) / summe_streuung,
+                                np.where(summe_mittel <= grenze, np.inf, -np.inf))
+        unter_schwelle = _verteilungsfunktion(schwelle).astype(np.float32)
+
+        # Blockweise über Studenten, damit die Zufallsmatrix (Zeile je Szenario, Spalte je Student) begrenzt bleibt.
+        # Die Szenarien werden per Inversionsmethode gezogen: Z = Φ⁻¹(U) liegt genau dann unter der Schwelle,
+        # wenn die gleichverteilte Zufallszahl U unter Φ(Schwelle) liegt; das spart die Normalverteilungs-Transformation.
+        block = max(self.max_elemente // max(self.simulationen, 1), 1)
+        for von in range(0, len(simuliert), block):
+            bis = min(von + block, len(simuliert))
+            zufall = self.rng.random((self.simulationen, bis - von), dtype=np.float32)
+            treffer = np.count_nonzero(zufall < unter_schwelle[von:bis], axis=0)
+            wahrscheinlichkeit[simuliert[von:bis]] = treffer / self.simulationen
+
+        wahrscheinlichkeit[np.isnan(zielnote) | (anzahl_noten == 0)] = np.nan
+        return wahrscheinlichkeit
+
+    def _standardstreuung(self, noten):
+        """
+        Schätzt die Standardabweichung der Noten über alle übergebenen Noten.
+
+        :param noten: Array von Noten.
+        :return: Standardabweichung (0.7, falls zu wenige Noten vorhanden sind).
+        """
+        noten = np.asarray(noten, dtype=float)
+        noten = noten[~np.isnan(noten)]
+        return float(noten.std()) if len(noten) > 1 else 0.7
+
+    def kohortenstreuung(self):
+        """
+        Gibt die Standardabweichung der Noten aller bestandenen Buchungen von Studenten aus student.csv zurück.
+        Sie gilt für Studenten mit höchstens einer eigenen Note, in fuer_kohorte wie in fuer_student, und wird
+        einmal je Datenversion berechnet.
+
+        :return: Standardabweichung (0.7, falls zu wenige Noten vorhanden sind).
+        """
+        if self.streuung is not None:
+            return self.streuung
+        version = self.db_handler.data_version
+        if self._kohortenstreuung is None or self._kohortenstreuung[0] != version:
+            data = self.db_handler.read_data()
+            modulbuchung_data = data["modulbuchung.csv"]
+            bestanden = modulbuchung_data["bestanden"].to_numpy(dtype=bool) \
+                & modulbuchung_data["student_code"].isin(data["student.csv"]["student_code"]).to_numpy(dtype=bool)
+            noten = modulbuchung_data["note"].to_numpy(dtype=float)[bestanden]
+            self._kohortenstreuung = (version, self._standardstreuung(noten))
+        return self._kohortenstreuung[1]
+
+    def fuer_kohorte(self):
+        """
+        Berechnet die Prognose für alle Studenten in einem vektorisierten Durchlauf.
+
+        :return: Pandas DataFrame mit einer Zeile je student_code und den Spalten erreichte_credits,
+                 gewichteter_schnitt, offene_credits, benoetigte_note und wahrscheinlichkeit.
+        """
+        data = self.db_handler.read_data()
+        student_data = data["student.csv"]
+        modul_data = data["modul.csv"]
+        modulbuchung_data = data["modulbuchung.csv"]
+        student_codes = student_data["student_code"].drop_duplicates()
+        student_index = pd.Index(student_codes)
+
+        # Credits je Buchung über den beim Laden aufgelösten Fremdschlüssel
+        modul_position = self.db_handler.fremdschluessel[("modulbuchung.csv", "modul_code")].erste_position(np.arange(len(modulbuchung_data)))
+        buchung_credits = modul_data["credits"].array.take(modul_position, allow_fill=True).astype(float)
+        buchungen = pd.DataFrame({
+            "student": student_index.get_indexer(modulbuchung_data["student_code"]),
+            "modul_code": modulbuchung_data["modul_code"].to_numpy(dtype=object),
+            "credits": buchung_credits,
+            "note": modulbuchung_data["note"].to_numpy(dtype=float),
+            "bestanden": modulbuchung_data["bestanden"].to_numpy(dtype=bool)
+        })
+        buchungen = buchungen[buchungen["student"] >= 0]
+
+        # Kennzahlen der bestandenen Module je Student
+        bestanden = buchungen[buchungen["bestanden"]].assign(gewichtet=lambda b: b["note"] * b["credits"])
+        gruppen = bestanden.groupby("student")
+        anzahl = len(student_codes)
+        noten_summe = np.zeros(anzahl)
+        erreichte_credits = np.zeros(anzahl)
+        summen = gruppen["gewichtet"].sum()
+        noten_summe[summen.index.to_numpy()] = summen.to_numpy()
+        credits = gruppen["credits"].sum()
+        erreichte_credits[credits.index.to_numpy()] = credits.to_numpy()
+
+        # Simulationsparameter: Mittelwert wie Student.calculate_average_grade, Streuung der eigenen Noten
+        standardstreuung = self.kohortenstreuung()
+        mittelwert = np.full(anzahl, float(bestanden["note"].mean()) if len(bestanden) else 2.5)
+        streuung = np.full(anzahl, standardstreuung)
+        anzahl_noten = np.zeros(anzahl, dtype=np.int64)
+        mittel = gruppen["note"].mean()
+        mittelwert[mittel.index.to_numpy()] = mittel.to_numpy()
+        benotet = gruppen["note"].count()
+        anzahl_noten[benotet.index.to_numpy()] = benotet.to_numpy()
+        if self.streuung is None:
+            eigene_streuung = gruppen["note"].std(ddof=0)
+            eigene_streuung = eigene_streuung[benotet > 1]
+            streuung[eigene_streuung.index.to_numpy()] = np.maximum(eigene_streuung.to_numpy(), 0.1)
+        mittelwert = np.nan_to_num(mittelwert, nan=2.5)
+        streuung = np.nan_to_num(streuung, nan=standardstreuung)
+
+        # Offene Module: Lehrplanmodule ohne Buchung und gebuchte, noch nicht bestandene Module
+        student_studiengang = data["student_studiengang.csv"].drop_duplicates("student_code")
+        lehrplan_module = pd.DataFrame([
+            (studiengang_code, modul.modul_code, modul.credits)
+            for studiengang_code in student_studiengang["studiengang_code"].unique()
+            for sem in self.db_handler.get_lehrplan(studiengang_code).semester
+            for modul in sem.module
+        ], columns=["studiengang_code", "modul_code", "credits"]).drop_duplicates(["studiengang_code", "modul_code"])
+        lehrplan_paare = student_studiengang.merge(lehrplan_module, on="studiengang_code")
+        lehrplan_paare = pd.DataFrame({
+            "student": student_index.get_indexer(lehrplan_paare["student_code"]),
+            "modul_code": lehrplan_paare["modul_code"].to_numpy(dtype=object),
+            "credits": lehrplan_paare["credits"].to_numpy(dtype=float)
+        })
+
+        gebucht = buchungen[["student", "modul_code"]].drop_duplicates()
+        nicht_gebucht = lehrplan_paare.merge(gebucht, on=["student", "modul_code"], how="left", indicator=True)
+        nicht_gebucht = nicht_gebucht[nicht_gebucht["_merge"] == "left_only"][["student", "modul_code", "credits"]]
+        offen_gebucht = buchungen[~buchungen["bestanden"]][["student", "modul_code", "credits"]]
+        offen_gebucht = offen_gebucht.merge(bestanden[["student", "modul_code"]].drop_duplicates(),
+                                            on=["student", "modul_code"], how="left", indicator=True)
+        offen_gebucht = offen_gebucht[offen_gebucht["_merge"] == "left_only"][["student", "modul_code", "credits"]]
+
+        offen = pd.concat([nicht_gebucht, offen_gebucht]).drop_duplicates(["student", "modul_code"])
+        offen = offen[(offen["student"] >= 0) & offen["credits"].notna()]
+        paar_student = offen["student"].to_numpy(dtype=np.intp)
+        paar_credits = offen["credits"].to_numpy(dtype=float)
+
+        zielnote = student_data.drop_duplicates("student_code")["zielnote"].to_numpy(dtype=float)
+        offene_credits = np.bincount(paar_student, weights=paar_credits, minlength=anzahl)
+        quadrat_credits = np.bincount(paar_student, weights=paar_credits ** 2, minlength=anzahl)
+        wahrscheinlichkeit = self._simulieren(mittelwert, streuung, noten_summe, erreichte_credits, zielnote,
+                                              anzahl_noten, offene_credits, quadrat_credits)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gewichteter_schnitt = np.where(erreichte_credits > 0, noten_summe / erreichte_credits, np.nan)
+        return pd.DataFrame({
+            "student_code": student_codes.to_numpy(),
+            "zielnote": zielnote,
+            "erreichte_credits": erreichte_credits,
+            "gewichteter_schnitt": gewichteter_schnitt,
+            "offene_credits": offene_credits,
+            "benoetigte_note": self.benoetigte_note(noten_summe, erreichte_credits, offene_credits, zielnote),
+            "wahrscheinlichkeit": wahrscheinlichkeit
+        })
+
+    def fuer_student(self, student):
+        """
+        Berechnet die Prognose für einen einzelnen Studenten auf Basis seines Objektgraphen.
+        Der Mittelwert der Simulation ist Student.calculate_average_grade, die offenen Module sind
+        die gebuchten, aber nicht abgeschlossenen und die noch nicht gebuchten Module.
+
+        :param student: Ein Student-Objekt mit geladenen Modulbuchungen.
+        :return: Dictionary mit gewichteter_schnitt, offene_credits, benoetigte_note, wahrscheinlichkeit und erreichbar.
+        """
+        bestanden = [mb for mb in student.modulbuchungen if mb.bestanden and mb.modul is not None and mb.note is not None]
+        noten = np.array([mb.note for mb in bestanden], dtype=float)
+        credits = np.array([mb.modul.credits for mb in bestanden], dtype=float)
+        noten_summe = float((noten * credits).sum())
+        erreichte_credits = float(credits.sum())
+
+        # Eigene Noten aller bestandenen Buchungen, wie in fuer_kohorte auch ohne bekanntes Modul
+        noten = np.array([mb.note for mb in student.modulbuchungen if mb.bestanden and mb.note is not None], dtype=float)
+        noten = noten[~np.isnan(noten)]
+
+        zielnote = float(student.zielnote) if student.zielnote is not None else np.nan
+        return self._einzelprognose(student.student_code, noten_summe, erreichte_credits, noten,
+                                    {mb.modul_code for mb in bestanden}, student.calculate_average_grade(), zielnote)
+
+    def fuer_student_code(self, student_code: str):
+        """
+        Berechnet die Prognose für einen einzelnen Studenten direkt aus den geladenen Tabellen, ohne das
+        Student-Objekt und seine Modulbuchungen aufzubauen (z. B. für das Dashboard). Das Ergebnis entspricht
+        dem von fuer_student.
+
+        :param student_code: Code des Studenten.
+        :return: Dictionary wie bei fuer_student oder None, falls der Student nicht existiert.
+        """
+        data = self.db_handler.read_data()
+        student_positionen = self.db_handler.positionen("student.csv", {"student_code": student_code})
+        if not len(student_positionen):
+            return None
+        zielnote = data["student.csv"]["zielnote"].iat[student_positionen[0]]
+        zielnote = float(zielnote) if zielnote is not None else np.nan
+
+        # Bestandene Buchungen; Credits nur für Buchungen mit bekanntem Modul (wie mb.modul im Objektgraphen)
+        modulbuchung_data = data["modulbuchung.csv"]
+        positionen = self.db_handler.positionen("modulbuchung.csv", {"student_code": student_code, "bestanden": True})
+        alle_noten = modulbuchung_data["note"].to_numpy(dtype=float)[positionen]
+        modul_position = self.db_handler.fremdschluessel[("modulbuchung.csv", "modul_code")].erste_position(positionen)
+        mit_modul = modul_position >= 0
+        credits = data["modul.csv"]["credits"].to_numpy(dtype=float)[modul_position[mit_modul]]
+        noten_summe = float((alle_noten[mit_modul] * credits).sum())
+        erreichte_credits = float(credits.sum())
+
+        # Durchschnitt wie Student.calculate_average_grade über alle bestandenen Buchungen
+        durchschnitt = float(alle_noten.mean()) if len(alle_noten) else None
+        bestandene_codes = set(modulbuchung_data["modul_code"].array.take(positionen[mit_modul]))
+        return self._einzelprognose(student_code, noten_summe, erreichte_credits, alle_noten[~np.isnan(alle_noten)],
+                                    bestandene_codes, durchschnitt, zielnote)
+
+    def _einzelprognose(self, student_code: str, noten_summe: float, erreichte_credits: float, noten,
+                        bestandene_codes: set, durchschnitt, zielnote: float):
+        """
+        Gemeinsamer Teil von fuer_student und fuer_student_code: ermittelt die offenen Module und simuliert.
+
+        :param student_code: Code des Studenten.
+        :param noten_summe: Summe aus Note mal Credits der bestandenen Module.
+        :param erreichte_credits: Summe der Credits der bestandenen Module.
+        :param noten: Array der eigenen Noten (ohne fehlende Werte).
+        :param bestandene_codes: Codes der bestandenen Module.
+        :param durchschnitt: Notendurchschnitt der bestandenen Buchungen oder None.
+        :param zielnote: Zielnote des Studenten (NaN, falls keine gesetzt ist).
+        :return: Dictionary mit gewichteter_schnitt, offene_credits, benoetigte_note, wahrscheinlichkeit und erreichbar.
+        """
+        # Offene Module: gebuchte, nicht bestandene und noch nicht gebuchte Module des Studiengangs, ohne bereits
+        # bestandene Module, ohne fehlende Credits und ohne Duplikate (der erste Eintrag zählt)
+        teile = []
+        gebucht = self.db_handler.modulbuchungen_verbinden(student_code, False, ["modul_code"])
+        if gebucht is not None:
+            teile.append((gebucht["modul_code"], gebucht["credits"]))
+        nicht_gebucht = self.db_handler.nicht_gebuchte_module(student_code)
+        if nicht_gebucht is not None:
+            modul_data = self.db_handler.read_data()["modul.csv"]
+            teile.append((modul_data["modul_code"].array.take(nicht_gebucht), modul_data["credits"].array.take(nicht_gebucht)))
+        offen = {}
+        for modul_codes, modul_credits in teile:
+            for modul_code, credits in zip(modul_codes, np.asarray(modul_credits, dtype=float)):
+                if modul_code not in bestandene_codes and not np.isnan(credits):
+                    offen.setdefault(modul_code, credits)
+        paar_credits = np.array(list(offen.values()), dtype=float)
+
+        mittelwert = durchschnitt if durchschnitt is not None and not np.isnan(durchschnitt) else 2.5
+        if self.streuung is not None:
+            streuung = self.streuung
+        else:
+            streuung = max(float(noten.std()), 0.1) if len(noten) > 1 else self.kohortenstreuung()
+        offene_credits = float(paar_credits.sum())
+
+        wahrscheinlichkeit = self._simulieren(
+            np.array([mittelwert]), np.array([streuung]), np.array([noten_summe]), np.array([erreichte_credits]),
+            np.array([zielnote]), np.array([len(noten)]), np.array([offene_credits]), np.array([float((paar_credits ** 2).sum())])
+        )[0]
+        benoetigte_note = float(self.benoetigte_note(noten_summe, erreichte_credits, offene_credits, zielnote))
+        return {
+            "gewichteter_schnitt": noten_summe / erreichte_credits if erreichte_credits else None,
+            "offene_credits": offene_credits,
+            "benoetigte_note": benoetigte_note,
+            "wahrscheinlichkeit": float(wahrscheinlichkeit),
+            "erreichbar": bool(benoetigte_note >= BESTE_NOTE) if not np.isnan(benoetigte_note) else None
+        }
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# ranglisten.py
+
+# Importiere notwendige Module und Klassen
+import math  # Für die Prüfung auf endliche Schlüssel
+from bisect import bisect_left, insort  # Für die sortierte Liste der besten Einträge
+import numpy as np  # Für die vektorisierten Summen und die Teilsortierung
+import pandas as pd  # Für Datenverarbeitung
+
+# Mindestgröße der vorgehaltenen Bestenliste; Abfragen bis zu dieser Länge kommen ohne Neuberechnung aus
+MINDESTUMFANG = 64
+
+
+def _positionen(index: pd.Index, werte: pd.Series):
+    """
+    Ordnet Codes ihren Positionen in einem Index zu; die Hash-Suche erfolgt nur je eindeutigem Code.
+
+    :param index: Index der eindeutigen Codes.
+    :param werte: Series der zuzuordnenden Codes.
+    :return: Array der Positionen, -1 für unbekannte Codes.
+    """
+    ids, eindeutig = pd.factorize(werte.astype(str))
+    return np.append(index.get_indexer(eindeutig), -1)[ids]
+
+
+class _TopK:
+    """
+    Bestenliste über ein Array von Schlüsseln (kleinerer Schlüssel ist besser, unendlich bedeutet
+    "nicht gewertet"). Vorgehalten werden nur die besten Einträge als sortierte Liste von (Schlüssel, id);
+    alle übrigen Einträge sind schlechter als der letzte der Liste. Änderungen einzelner Schlüssel passen
+    die Liste per binärer Suche an. Nur wenn sich ein Eintrag der Liste über ihr Ende hinaus verschlechtert,
+    fällt er heraus; ist die Liste dadurch für eine Abfrage zu kurz, wird sie per Teilsortierung (np.partition)
+    neu bestimmt.
+    """
+    def __init__(self, schluessel: np.ndarray):
+        """
+        Initialisiert die Bestenliste; sie wird erst bei der ersten Abfrage berechnet.
+
+        :param schluessel: Float-Array der Schlüssel je id.
+        """
+        self.schluessel = schluessel
+        self.liste = None
+        self.mitglieder = {}  # id -> Schlüssel der Einträge in der Liste
+        self.umfang = 0
+        self.vollstaendig = False  # Die Liste enthält alle gewerteten Einträge
+        self.neuberechnungen = 0
+
+    def _berechnen(self, umfang: int):
+        """
+        Bestimmt die besten Einträge per Teilsortierung neu.
+
+        :param umfang: Anzahl der vorzuhaltenden Einträge.
+        """
+        gewertet = np.flatnonzero(np.isfinite(self.schluessel))
+        self.vollstaendig = umfang >= len(gewertet)
+        ids = gewertet
+        if not self.vollstaendig:
+            # Schlüssel an der Grenze per Teilsortierung; bei Gleichstand entscheidet die kleinere id,
+            # damit alle nicht vorgehaltenen Einträge hinter dem letzten Listeneintrag liegen
+            werte = self.schluessel[gewertet]
+            grenze = np.partition(werte, umfang - 1)[umfang - 1]
+            besser = gewertet[werte < grenze]
+            ids = np.concatenate([besser, gewertet[werte == grenze][:umfang - len(besser)]])
+        ids = ids[np.lexsort((ids, self.schluessel[ids]))]
+        self.liste = list(zip(self.schluessel[ids].tolist(), ids.tolist()))
+        self.mitglieder = {eintrag_id: wert for wert, eintrag_id in self.liste}
+        self.umfang = umfang
+        self.neuberechnungen += 1
+
+    def beste(self, k: int):
+        """
+        Gibt die ids der k besten Einträge zurück, der beste zuerst.
+
+        :param k: Anzahl der Einträge.
+        :return: Liste der ids.
+        """
+        if self.liste is None or (len(self.liste) < k and not self.vollstaendig):
+            self._berechnen(max(2 * k, self.umfang, MINDESTUMFANG))
+        return [eintrag_id for _, eintrag_id in self.liste[:k]]
+
+    def aendern(self, ids, werte):
+        """
+        Übernimmt neue Schlüssel einzelner Einträge und passt die vorgehaltene Liste an.
+
+        :param ids: Iterable der geänderten ids.
+        :param werte: Iterable der neuen Schlüssel.
+        """
+        for eintrag_id, wert in zip(ids, werte):
+            self.schluessel[eintrag_id] = wert
+            if self.liste is None:
+                continue
+            if eintrag_id in self.mitglieder:
+                self.liste.pop(bisect_left(self.liste, (self.mitglieder.pop(eintrag_id), eintrag_id)))
+                # Ohne Kenntnis der übrigen Einträge darf ein Eintrag nur bis zum Listenende zurückfallen
+                bleibt = self.vollstaendig or (self.liste and (wert, eintrag_id) <= self.liste[-1])
+            else:
+                bleibt = self.vollstaendig or (self.liste and (wert, eintrag_id) < self.liste[-1])
+            if not bleibt or not math.isfinite(wert):
+                continue
+            insort(self.liste, (wert, eintrag_id))
+            self.mitglieder[eintrag_id] = wert
+            if not self.vollstaendig and len(self.liste) > self.umfang:
+                del self.mitglieder[self.liste.pop()[1]]
+
+
+class Ranglisten:
+    """
+    Ranglisten über die gesamte Kohorte: Studenten mit dem besten credit-gewichteten Notendurchschnitt,
+    Studenten mit den meisten fehlenden Credits und Module mit der niedrigsten Bestehensquote.
+    Die Summen je Student und Modul werden einmal vektorisiert berechnet und bei neuen oder geänderten
+    Prüfungsergebnissen nur um die Differenz der betroffenen Buchungen angepasst. Je Rangliste werden
+    nur die besten Einträge sortiert vorgehalten (siehe _TopK), sodass eine Abfrage nicht die ganze
+    Kohorte sortiert.
+    """
+    def __init__(self, data: dict, mindestanzahl: int = 5):
+        """
+        Berechnet die Summen je Student und Modul.
+
+        :param data: Dictionary mit den geladenen DataFrames (student.csv, modulbuchung.csv, modul.csv,
+                     student_studiengang.csv, studiengang.csv).
+        :param mindestanzahl: Mindestanzahl bewerteter Ergebnisse, ab der ein Modul in der Rangliste der
+                              Bestehensquoten erscheint.
+        """
+        self.mindestanzahl = mindestanzahl
+        student_data = data["student.csv"].drop_duplicates("student_code")
+        modul_data = data["modul.csv"].drop_duplicates("modul_code")
+        self.student_codes = pd.Index(student_data["student_code"].astype(str))
+        self.modul_codes = pd.Index(modul_data["modul_code"].astype(str))
+        self.modul_credits = modul_data["credits"].to_numpy(dtype=float, na_value=np.nan)
+        # Codes als Listen für den schnellen Zugriff je Ergebniszeile
+        self._student_code_liste = self.student_codes.tolist()
+        self._modul_code_liste = self.modul_codes.tolist()
+
+        # Benötigte Credits über den Studiengang des Studenten; ohne Studiengang NaN
+        student_studiengang = data["student_studiengang.csv"].drop_duplicates("student_code")
+        studiengang = data["studiengang.csv"].drop_duplicates("studiengang_code")
+        studiengang_position = _positionen(pd.Index(studiengang["studiengang_code"].astype(str)),
+                                           student_studiengang["studiengang_code"])
+        benoetigt = np.append(studiengang["benötigte_credits"].to_numpy(dtype=float, na_value=np.nan), np.nan)[studiengang_position]
+        self.benoetigte_credits = np.full(len(self.student_codes), np.nan)
+        student_position = _positionen(self.student_codes, student_studiengang["student_code"])
+        self.benoetigte_credits[student_position[student_position >= 0]] = benoetigt[student_position >= 0]
+
+        # Summen je Student und Modul
+        self.erreichte_credits = np.zeros(len(self.student_codes))
+        self.gewichtete_credits = np.zeros(len(self.student_codes))
+        self.noten_summe = np.zeros(len(self.student_codes))
+        self.ergebnisse = np.zeros(len(self.modul_codes))
+        self.bestandene = np.zeros(len(self.modul_codes))
+        self._summen_anpassen(data["modulbuchung.csv"], 1.0)
+
+        self.bester_schnitt = _TopK(self._schnitt_schluessel(slice(None)))
+        self.meiste_fehlende_credits = _TopK(self._fehlend_schluessel(slice(None)))
+        self.niedrigste_quote = _TopK(self._quote_schluessel(slice(None)))
+
+    def _summen_anpassen(self, buchungen: pd.DataFrame, vorzeichen: float):
+        """
+        Addiert (oder subtrahiert) die Beiträge von Buchungen zu den Summen je Student und Modul.
+
+        :param buchungen: DataFrame mit den Spalten student_code, modul_code, note und bestanden.
+        :param vorzeichen: 1.0 zum Hinzufügen, -1.0 zum Entfernen.
+        :return: Tupel (Array der betroffenen Studenten-ids, Array der betroffenen Modul-ids).
+        """
+        student_id = _positionen(self.student_codes, buchungen["student_code"])
+        modul_id = _positionen(self.modul_codes, buchungen["modul_code"])
+        note = buchungen["note"].to_numpy(dtype=float, na_value=np.nan)
+        bestanden = buchungen["bestanden"].to_numpy(dtype=bool, na_value=False)
+        credits = np.where(modul_id >= 0, np.append(self.modul_credits, np.nan)[modul_id], np.nan)
+
+        # Credits bestandener Module je Student; der Notendurchschnitt nur über bewertete bestandene Module
+        zaehlt = (student_id >= 0) & bestanden & ~np.isnan(credits)
+        gewichtet = zaehlt & ~np.isnan(note)
+        anzahl = len(self.student_codes)
+        self.erreichte_credits += vorzeichen * np.bincount(student_id[zaehlt], weights=credits[zaehlt], minlength=anzahl)
+        self.gewichtete_credits += vorzeichen * np.bincount(student_id[gewichtet], weights=credits[gewichtet], minlength=anzahl)
+        self.noten_summe += vorzeichen * np.bincount(student_id[gewichtet], weights=(note * credits)[gewichtet], minlength=anzahl)
+
+        # Bewertete Ergebnisse und bestandene Ergebnisse je Modul
+        bewertet = (modul_id >= 0) & ~np.isnan(note)
+        self.ergebnisse += vorzeichen * np.bincount(modul_id[bewertet], minlength=len(self.modul_codes))
+        self.bestandene += vorzeichen * np.bincount(modul_id[bewertet & bestanden], minlength=len(self.modul_codes))
+        return np.unique(student_id[zaehlt]), np.unique(modul_id[bewertet])
+
+    def _schnitt_schluessel(self, ids):
+        """
+        Schlüssel der Rangliste "bester Notendurchschnitt": der credit-gewichtete Durchschnitt.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.gewichtete_credits[ids] > 0, self.noten_summe[ids] / self.gewichtete_credits[ids], np.inf)
+
+    def _fehlend_schluessel(self, ids):
+        """
+        Schlüssel der Rangliste "meiste fehlende Credits": die negativen fehlenden Credits.
+        """
+        fehlend = self.benoetigte_credits[ids] - self.erreichte_credits[ids]
+        return np.where(np.isnan(fehlend), np.inf, -fehlend)
+
+    def _quote_schluessel(self, ids):
+        """
+        Schlüssel der Rangliste "niedrigste Bestehensquote": die Bestehensquote ab der Mindestanzahl Ergebnisse.
+        """
+        ergebnisse = self.ergebnisse[ids]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((ergebnisse >= self.mindestanzahl) & (ergebnisse > 0), self.bestandene[ids] / ergebnisse, np.inf)
+
+    def aktualisieren(self, alte_buchungen: pd.DataFrame, neue_buchungen: pd.DataFrame):
+        """
+        Übernimmt geänderte Buchungen: Die Beiträge der bisherigen Zeilen werden abgezogen, die der neuen
+        Zeilen addiert, und nur die Schlüssel der betroffenen Studenten und Module werden neu berechnet.
+
+        :param alte_buchungen: Bisherige Werte der geänderten Zeilen (student_code, modul_code, note, bestanden).
+        :param neue_buchungen: Neue Werte der geänderten Zeilen und neu hinzugefügte Zeilen.
+        """
+        alte_studenten, alte_module = self._summen_anpassen(alte_buchungen, -1.0)
+        neue_studenten, neue_module = self._summen_anpassen(neue_buchungen, 1.0)
+        studenten = np.union1d(alte_studenten, neue_studenten)
+        module = np.union1d(alte_module, neue_module)
+        self.bester_schnitt.aendern(studenten.tolist(), self._schnitt_schluessel(studenten).tolist())
+        self.meiste_fehlende_credits.aendern(studenten.tolist(), self._fehlend_schluessel(studenten).tolist())
+        self.niedrigste_quote.aendern(module.tolist(), self._quote_schluessel(module).tolist())
+
+    def beste_studenten(self, k: int = 10):
+        """
+        Gibt die Studenten mit dem besten credit-gewichteten Notendurchschnitt zurück.
+
+        :param k: Anzahl der Studenten.
+        :return: Liste von Tupeln (student_code, gewichteter_schnitt, erreichte_credits).
+        """
+        return [(self._student_code_liste[i], float(self.noten_summe[i] / self.gewichtete_credits[i]), float(self.erreichte_credits[i]))
+                for i in self.bester_schnitt.beste(k)]
+
+    def rueckstaendige_studenten(self, k: int = 10):
+        """
+        Gibt die Studenten zurück, denen die meisten Credits bis zu den benötigten Credits ihres Studiengangs fehlen.
+
+        :param k: Anzahl der Studenten.
+        :return: Liste von Tupeln (student_code, fehlende_credits, erreichte_credits, benoetigte_credits).
+        """
+        return [(self._student_code_liste[i], float(self.benoetigte_credits[i] - self.erreichte_credits[i]),
+                 float(self.erreichte_credits[i]), float(self.benoetigte_credits[i]))
+                for i in self.meiste_fehlende_credits.beste(k)]
+
+    def schwierigste_module(self, k: int = 10):
+        """
+        Gibt die Module mit der niedrigsten Bestehensquote zurück (ab der Mindestanzahl bewerteter Ergebnisse).
+
+        :param k: Anzahl der Module.
+        :return: Liste von Tupeln (modul_code, bestehensquote, ergebnisse).
+        """
+        return [(self._modul_code_liste[i], float(self.bestandene[i] / self.ergebnisse[i]), int(self.ergebnisse[i]))
+                for i in self.niedrigste_quote.beste(k)]
+
+    def rangliste(self, name: str, k: int = 10):
+        """
+        Gibt eine Rangliste als Liste von Dictionaries zurück (z. B. für die API).
+
+        :param name: Name der Rangliste (siehe RANGLISTEN).
+        :param k: Anzahl der Einträge.
+        :return: Liste von Dictionaries oder None, falls die Rangliste unbekannt ist.
+        """
+        if name not in RANGLISTEN:
+            return None
+        methode, felder = RANGLISTEN[name]
+        return [dict(zip(felder, eintrag)) for eintrag in getattr(self, methode)(k)]
+
+
+# Abrufbare Ranglisten: Name -> (Methode, Felder der Einträge)
+RANGLISTEN = {
+    "beste_studenten": ("beste_studenten", ("student_code", "gewichteter_schnitt", "erreichte_credits")),
+    "rueckstaendige_studenten": ("rueckstaendige_studenten", ("student_code", "fehlende_credits", "erreichte_credits", "benoetigte_credits")),
+    "schwierigste_module": ("schwierigste_module", ("modul_code", "bestehensquote", "ergebnisse"))
+}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# schema.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die Umwandlung in Python-Werte
+import pandas as pd  # Für die spaltenweise Typumwandlung
+
+# Spaltentypen je Datei: "str", "int", "float", "bool" oder "date"
+SCHEMA = {
+    "modul.csv": {"modul_code": "str", "modul_name": "str", "tutor": "str", "pruefungsform": "str", "credits": "int"},
+    "modulbuchung.csv": {"buchungsnummer": "int", "buchungsdatum": "date", "status": "str", "pruefungsversuch": "int",
+                         "pruefungsdatum": "date", "note": "float", "bestanden": "bool", "modul_code": "str",
+                         "student_code": "str"},
+    "semester.csv": {"semester_code": "str", "semester_name": "str"},
+    "semester_modul.csv": {"semester_code": "str", "modul_code": "str"},
+    "student.csv": {"student_code": "str", "student_name": "str", "start_studium": "date", "zielnote": "float"},
+    "student_studiengang.csv": {"student_code": "str", "studiengang_code": "str"},
+    "studiengang.csv": {"studiengang_code": "str", "studiengang_name": "str", "benötigte_credits": "int",
+                        "anzahl_semester": "int"},
+    "studiengang_semester.csv": {"studiengang_code": "str", "semester_code": "str"}
+}
+
+# Festes Datumsformat der Quelldateien; es wird nicht je Datei geraten
+DATUMSFORMAT = "%Y-%m-%d"
+
+# Schreibweisen für Wahrheitswerte (nach Kleinschreibung) und für fehlende Werte
+WAHR = ["true", "1"]
+FALSCH = ["false", "0"]
+FEHLWERTE = ["", "NA", "N/A", "NaN", "nan", "null", "NULL"]
+
+
+def bloecke_zusammenfassen(werte: pd.Series):
+    """
+    Fasst eine Arrow-gestützte Spalte, die der CSV-Parser in vielen Blöcken liefert, zu einem Block zusammen.
+    Zeilenzugriffe (take) auf die Spalte kosten dann nur noch die Anzahl der gelesenen Zeilen, statt bei
+    jedem Zugriff alle Blöcke der Tabelle zu durchlaufen.
+
+    :param werte: Die eingelesene Spalte.
+    :return: Spalte mit höchstens einem Arrow-Block (andere Spalten unverändert).
+    """
+    if not hasattr(werte.array, "__arrow_array__"):
+        return werte
+    bloecke = werte.array.__arrow_array__()
+    if getattr(bloecke, "num_chunks", 1) <= 1:
+        return werte
+    return pd.Series(bloecke.combine_chunks(), dtype=werte.dtype, index=werte.index, name=werte.name)
+
+
+def spalte_konvertieren(werte: pd.Series, typ: str):
+    """
+    Wandelt eine Spalte vektorisiert in den Zieltyp um. Bereits passend typisierte Spalten werden
+    unverändert übernommen, Zeichenketten werden einmal je Spalte geparst. Ganzzahlen mit fehlenden
+    Werten werden wie beim Einlesen durch pandas zu float64, fehlende Wahrheitswerte zu False.
+
+    :param werte: Die eingelesene Spalte (Zeichenketten oder bereits typisierte Werte).
+    :param typ: Zieltyp aus SCHEMA.
+    :return: Tupel (umgewandelte Spalte, Anzahl nicht umwandelbarer Werte).
+    """
+    vorhanden = werte.notna()
+    if typ == "str":
+        if pd.api.types.is_string_dtype(werte.dtype):
+            return bloecke_zusammenfassen(werte), 0
+        return werte.astype("str").where(vorhanden), 0
+    if typ in ("int", "float"):
+        zahlen = werte if pd.api.types.is_numeric_dtype(werte.dtype) and werte.dtype != bool else pd.to_numeric(werte, errors="coerce")
+        ungueltig = int((zahlen.isna() & vorhanden).sum())
+        if typ == "int" and not zahlen.isna().any():
+            return zahlen.astype(np.int64), ungueltig
+        return zahlen.astype(np.float64), ungueltig
+    if typ == "bool":
+        if werte.dtype == bool:
+            return werte, 0
+        text = werte.astype("str").str.strip().str.lower()
+        ungueltig = int((vorhanden & ~text.isin(WAHR + FALSCH)).sum())
+        return text.isin(WAHR).astype(bool), ungueltig
+    if typ == "date":
+        if pd.api.types.is_datetime64_dtype(werte.dtype):
+            return werte.astype("datetime64[us]"), 0
+        datum = pd.to_datetime(werte, format=DATUMSFORMAT, errors="coerce").astype("datetime64[us]")
+        return datum, int((datum.isna() & vorhanden).sum())
+    raise ValueError(f"Unbekannter Spaltentyp: {typ}")
+
+
+def tabelle_konvertieren(file_name: str, data: pd.DataFrame):
+    """
+    Wandelt alle im Schema beschriebenen Spalten einer Tabelle in ihre Zieltypen um.
+    Nicht umwandelbare Werte werden als fehlend übernommen und je Spalte gemeldet.
+
+    :param file_name: Dateiname der Tabelle (z. B. "modulbuchung.csv").
+    :param data: Die eingelesene Tabelle.
+    :return: DataFrame mit umgewandelten Spalten.
+    """
+    typen = SCHEMA.get(file_name, {})
+    umgewandelt = {}
+    for spalte in data.columns:
+        if spalte not in typen:
+            continue
+        umgewandelt[spalte], ungueltig = spalte_konvertieren(data[spalte], typen[spalte])
+        if ungueltig:
+            print(f"{ungueltig} ungültige Werte in {file_name}.{spalte} (erwartet: {typen[spalte]}) wurden als fehlend eingelesen.")
+    return data.assign(**umgewandelt) if umgewandelt else data
+
+
+def python_werte(werte: pd.Series):
+    """
+    Gibt die Werte einer umgewandelten Spalte als Liste von Python-Objekten zurück, z. B. für
+    Modell-Konstruktoren: Datumswerte als datetime (fehlende als None), Zahlen als int/float, Wahrheitswerte als bool.
+
+    :param werte: Eine mit spalte_konvertieren umgewandelte Spalte.
+    :return: Liste der Werte.
+    """
+    if pd.api.types.is_datetime64_dtype(werte.dtype):
+        # datetime64[us] -> datetime.datetime, NaT -> None
+        return werte.to_numpy(dtype="datetime64[us]").astype(object).tolist()
+    return werte.tolist()
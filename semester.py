@@ -14,15 +14,22 @@ class Semester:
     """
     Repräsentiert ein Semester mit zugehörigen Modulen.
     """
-    def __init__(self, semester_code: str, semester_name: str):
+    def __init__(self, semester_code: str, semester_name: str, module: list = None, modul_codes: list = None):
         """
         Initialisiert ein Semester-Objekt.
 
         :param semester_code: Eindeutiger Code des Semesters.
         :param semester_name: Name des Semesters.
+        :param module: Optionale, bereits geladene Liste von Modul-Objekten (z. B. aus dem Lehrplan).
+        :param modul_codes: Optionale Liste aller zugeordneten Modulkodes (auch ohne Eintrag in modul.csv).
         """
         self.semester_code = semester_code
         self.semester_name = semester_name
+        self.module = module
+        self.modul_codes = modul_codes if modul_codes is not None else [modul.modul_code for modul in module or []]
+
+        # Vorberechnete Summe der Credits aller geladenen Module dieses Semesters
+        self.gesamt_credits = sum(modul.credits for modul in module or [])
 
     def __str__(self):
         """
@@ -35,17 +42,29 @@ class Semester:
     def load_moduls(self, db_handler: DBZugriff):
         """
         Lädt und gibt die Module zurück, die diesem Semester zugeordnet sind.
+        Wurden die Module bereits über den Lehrplan geladen, werden diese ohne
+        erneuten Datenbankzugriff zurückgegeben.
         :param db_handler: Instanz von DBZugriff, um Daten zu laden
         :return: Liste von Modul-Objekten
         """
+        if self.module is not None:
+            return self.module
+
         # Daten aus der semester_modul.csv laden
-        semester_modul_data = db_handler.get_semester_modul()
+        semester_modul_data = db_handler.get_semester_modul(self.semester_code)
         
         # Die Modulkodes, die diesem Semester zugeordnet sind
-        modul_codes = semester_modul_data[semester_modul_data["semester_code"] == self.semester_code]["modul_code"]
+        self.modul_codes = list(semester_modul_data["modul_code"]) if not semester_modul_data.empty else []
         
         # Für jedes Modul einen Modul-Objekt erstellen
-        module = [Modul(modul_code) for modul_code in modul_codes]
+        module = []
+        for modul_code in self.modul_codes:
+            modul_data = db_handler.get_modul(modul_code)
+            if not modul_data.empty:
+                modul_row = modul_data.iloc[0]
+                module.append(Modul(modul_code, modul_row["modul_name"], modul_row["credits"], modul_row["tutor"], modul_row["pruefungsform"]))
+        self.module = module
+        self.gesamt_credits = sum(modul.credits for modul in module)
         return module
 
     def show_modul(self, db_handler: DBZugriff):
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# speicher.py
+
+# Importiere notwendige Module und Klassen
+import argparse  # Für Kommandozeilenargumente
+import sys  # Für Objektgrößen und die Prüfung geladener Module
+import tracemalloc  # Für Schnappschüsse der Python-Speicherbelegung
+import types  # Für das Überspringen von Modulen und Funktionen
+import numpy as np  # Für die Größe von Arrays
+import pandas as pd  # Für Datenverarbeitung
+
+# Typen, die beim Durchlaufen eines Objektgraphen nicht mitgezählt werden (gemeinsam genutzt oder nicht relevant)
+_UEBERSPRINGEN = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def tiefe_groesse(wurzeln, ausschliessen=(), je_typ: dict = None):
+    """
+    Ermittelt die Größe eines Objektgraphen in Bytes. Jedes Objekt wird nur einmal gezählt; NumPy-Arrays
+    mit ihrem Datenpuffer, DataFrames und Series mit memory_usage(deep=True).
+
+    :param wurzeln: Liste der Objekte, von denen aus der Graph durchlaufen wird.
+    :param ausschliessen: Tupel von Typen, deren Instanzen nicht gezählt und nicht durchlaufen werden
+                          (z. B. DBZugriff, auf den jedes Student-Objekt verweist).
+    :param je_typ: Optionales Dictionary, in dem Anzahl und Bytes je Typname aufsummiert werden.
+    :return: Größe in Bytes.
+    """
+    gesehen = set()
+    stapel = list(wurzeln)
+    gesamt = 0
+    while stapel:
+        objekt = stapel.pop()
+        if id(objekt) in gesehen or isinstance(objekt, _UEBERSPRINGEN) or (ausschliessen and isinstance(objekt, ausschliessen)):
+            continue
+        gesehen.add(id(objekt))
+
+        if isinstance(objekt, (pd.DataFrame, pd.Series, pd.Index)):
+            groesse = int(np.sum(objekt.memory_usage(deep=True)))
+        elif isinstance(objekt, np.ndarray):
+            groesse = sys.getsizeof(objekt) + (objekt.nbytes if objekt.base is not None else 0)
+            if objekt.dtype == object:
+                stapel.extend(objekt.ravel().tolist())
+        else:
+            groesse = sys.getsizeof(objekt)
+            if isinstance(objekt, dict):
+                stapel.extend(objekt.keys())
+                stapel.extend(objekt.values())
+            elif isinstance(objekt, (list, tuple, set, frozenset)):
+                stapel.extend(objekt)
+            if hasattr(objekt, "__dict__"):
+                groesse += sys.getsizeof(objekt.__dict__)
+                stapel.extend(objekt.__dict__.values())
+
+        gesamt += groesse
+        if je_typ is not None:
+            anzahl, summe = je_typ.get(type(objekt).__name__, (0, 0))
+            je_typ[type(objekt).__name__] = (anzahl + 1, summe + groesse)
+    return gesamt
+
+
+def tabellen_groessen(data: dict):
+    """
+    Ermittelt den Speicherbedarf der geladenen Tabellen (inklusive Zeichenketten).
+
+    :param data: Dictionary Dateiname -> DataFrame, z. B. aus CSVZugriff.read_data oder DBZugriff.read_data.
+    :return: DataFrame mit den Spalten tabelle, zeilen und bytes, absteigend nach bytes.
+    """
+    zeilen = [(name, len(tabelle), int(tabelle.memory_usage(deep=True).sum())) for name, tabelle in data.items()]
+    return pd.DataFrame(zeilen, columns=["tabelle", "zeilen", "bytes"]).sort_values("bytes", ascending=False, ignore_index=True)
+
+
+def objekt_groessen(wurzeln, ausschliessen=()):
+    """
+    Ermittelt Anzahl und Speicherbedarf je Objekttyp in einem Objektgraphen, z. B. für die Student-,
+    Modulbuchung- und Modul-Objekte im StudentCache.
+
+    :param wurzeln: Liste der Objekte, von denen aus der Graph durchlaufen wird.
+    :param ausschliessen: Tupel von Typen, die nicht gezählt und nicht durchlaufen werden.
+    :return: DataFrame mit den Spalten typ, anzahl und bytes, absteigend nach bytes.
+    """
+    je_typ = {}
+    tiefe_groesse(wurzeln, ausschliessen, je_typ)
+    zeilen = [(typ, anzahl, summe) for typ, (anzahl, summe) in je_typ.items()]
+    return pd.DataFrame(zeilen, columns=["typ", "anzahl", "bytes"]).sort_values("bytes", ascending=False, ignore_index=True)
+
+
+def figuren_groessen():
+    """
+    Schätzt den Speicherbedarf der geöffneten Matplotlib-Figuren: Pixelpuffer des Renderers (4 Bytes je
+    Pixel) und Anzahl der Artists. Matplotlib wird dafür nicht importiert; ohne geladenes pyplot ist das
+    Ergebnis leer.
+
+    :return: DataFrame mit den Spalten figur, artists und bytes.
+    """
+    zeilen = []
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        for nummer in plt.get_fignums():
+            figur = plt.figure(nummer)
+            breite, hoehe = figur.canvas.get_width_height()
+            zeilen.append((nummer, len(figur.findobj()), breite * hoehe * 4))
+    return pd.DataFrame(zeilen, columns=["figur", "artists", "bytes"])
+
+
+class Speicherprofil:
+    """
+    Optionales Profil der Python-Speicherbelegung über tracemalloc. Jeder Schnappschuss wird mit dem
+    vorherigen verglichen, sodass wachsende Allokationsstellen in lang laufenden Sitzungen auffallen.
+    Das Tracing verlangsamt Allokationen und wird daher nur auf Anforderung gestartet.
+    """
+    def __init__(self, tiefe: int = 1):
+        """
+        Initialisiert das Profil.
+
+        :param tiefe: Anzahl der gespeicherten Stack-Frames je Allokation.
+        """
+        self.tiefe = tiefe
+        self.letzter = None
+
+    def starten(self):
+        """
+        Startet tracemalloc, falls es nicht bereits läuft.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tiefe)
+
+    def stoppen(self):
+        """
+        Beendet tracemalloc und verwirft den letzten Schnappschuss.
+        """
+        tracemalloc.stop()
+        self.letzter = None
+
+    def schnappschuss(self, anzahl: int = 10):
+        """
+        Erstellt einen Schnappschuss und gibt die größten Allokationsstellen mit ihrer Veränderung seit dem
+        vorherigen Schnappschuss zurück.
+
+        :param anzahl: Anzahl der ausgegebenen Stellen.
+        :return: Dictionary mit aktueller und maximaler Belegung in Bytes und der Liste der Stellen
+                 (ort, bytes, differenz, anzahl) oder None, falls tracemalloc nicht läuft.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        aktuell, spitze = tracemalloc.get_traced_memory()
+        schnappschuss = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+        ])
+        if self.letzter is not None:
+            statistik = schnappschuss.compare_to(self.letzter, "lineno")
+            stellen = [(str(s.traceback), s.size, s.size_diff, s.count) for s in statistik[:anzahl]]
+        else:
+            statistik = schnappschuss.statistics("lineno")
+            stellen = [(str(s.traceback), s.size, s.size, s.count) for s in statistik[:anzahl]]
+        self.letzter = schnappschuss
+        return {"aktuell": aktuell, "spitze": spitze, "stellen": stellen}
+
+
+class Speicherbudget:
+    """
+    Erfasst den Speicherbedarf der geladenen Daten und der Caches und vergleicht ihn mit einem Budget.
+    Wird das Budget überschritten, wird eine Warnung ausgegeben oder (modus="verdraengen") werden die
+    wiederherstellbaren Caches geleert: zuerst die Student-Objekte im StudentCache (sie liegen zusätzlich
+    auf der Festplatte), danach die abgeleiteten Strukturen des DBZugriff. Die Tabellen selbst bleiben geladen.
+    """
+    def __init__(self, limit_mb: float, modus: str = "warnen"):
+        """
+        Initialisiert das Budget.
+
+        :param limit_mb: Budget in Megabyte.
+        :param modus: "warnen" (nur Meldung) oder "verdraengen" (Caches leeren).
+        """
+        if modus not in ("warnen", "verdraengen"):
+            raise ValueError(f"Unbekannter Modus: {modus}")
+        self.limit = int(limit_mb * 1e6)
+        self.modus = modus
+
+    @staticmethod
+    def messen(dbhandler, student_cache=None, weitere: dict = None):
+        """
+        Ermittelt den Speicherbedarf je Bereich in Bytes.
+
+        :param dbhandler: Instanz von DBZugriff.
+        :param student_cache: Optionaler StudentCache mit geladenen Student-Objekten.
+        :param weitere: Optionale weitere Bereiche, Name -> Objekt (z. B. der Antwort-Cache des API-Servers).
+        :return: Dictionary Bereich -> Bytes, inklusive "gesamt".
+        """
+        dbzugriff_typ = type(dbhandler)
+        bereiche = {
+            "tabellen": int(tabellen_groessen(dbhandler.data or {})["bytes"].sum()),
+            "indizes": tiefe_groesse([dbhandler.indexes, dbhandler.fremdschluessel]),
+            "abgeleitet": tiefe_groesse([dbhandler.lehrplan_cache, dbhandler.modulstatistik,
+                                         dbhandler.studentensuche, dbhandler.lernverlauf,
+                                         dbhandler.ranglisten], (dbzugriff_typ,)),
+            "student_objekte": tiefe_groesse([student_cache.eintraege], (dbzugriff_typ,)) if student_cache is not None else 0,
+            "figuren": int(figuren_groessen()["bytes"].sum())
+        }
+        for name, objekt in (weitere or {}).items():
+            bereiche[name] = tiefe_groesse([objekt], (dbzugriff_typ,))
+        bereiche["gesamt"] = sum(bereiche.values())
+        return bereiche
+
+    def pruefen(self, dbhandler, student_cache=None, weitere: dict = None):
+        """
+        Misst den Speicherbedarf und reagiert bei Überschreitung des Budgets gemäß Modus.
+
+        :param dbhandler: Instanz von DBZugriff.
+        :param student_cache: Optionaler StudentCache.
+        :param weitere: Optionale weitere Bereiche, Name -> Objekt; sie werden beim Verdrängen geleert,
+                        sofern sie eine clear-Methode besitzen.
+        :return: Dictionary Bereich -> Bytes nach einer eventuellen Verdrängung.
+        """
+        bereiche = self.messen(dbhandler, student_cache, weitere)
+        if bereiche["gesamt"] <= self.limit:
+            return bereiche
+
+        print(f"Speicherbudget überschritten: {bereiche['gesamt'] / 1e6:.1f} MB von {self.limit / 1e6:.1f} MB "
+              f"({', '.join(f'{name} {wert / 1e6:.1f} MB' for name, wert in bereiche.items() if name != 'gesamt')}).")
+        if self.modus != "verdraengen":
+            return bereiche
+
+        if student_cache is not None:
+            student_cache.eintraege.clear()
+        for objekt in (weitere or {}).values():
+            if hasattr(objekt, "clear"):
+                objekt.clear()
+        dbhandler.caches_leeren()
+        bereiche = self.messen(dbhandler, student_cache, weitere)
+        print(f"Caches geleert, belegt: {bereiche['gesamt'] / 1e6:.1f} MB.")
+        if bereiche["gesamt"] > self.limit:
+            print("Die geladenen Tabellen allein überschreiten das Speicherbudget.")
+        return bereiche
+
+
+# Bericht über den Speicherbedarf, wenn die Datei direkt ausgeführt wird
+if __name__ == "__main__":
+    from csvzugriff import CSVZugriff  # Klasse zum Arbeiten mit CSV-Dateien
+    from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+    from studentcache import StudentCache  # Cache für aufgebaute Student-Objekte
+
+    parser = argparse.ArgumentParser(description="Speicherbedarf der geladenen Daten, Objekte und Caches")
+    parser.add_argument("--studenten", type=int, default=100, help="Anzahl der aufzubauenden Student-Objekte")
+    parser.add_argument("--budget", type=float, default=None, help="Speicherbudget in MB")
+    parser.add_argument("--tracemalloc", action="store_true", help="Allokationen mit tracemalloc verfolgen")
+    args = parser.parse_args()
+
+    profil = Speicherprofil()
+    if args.tracemalloc:
+        profil.starten()
+
+    dbhandler = DBZugriff(CSVZugriff())
+    data = dbhandler.read_data()
+    student_cache = StudentCache(dbhandler)
+    for student_code in data["student.csv"]["student_code"].head(args.studenten):
+        student_cache.get_student(student_code)
+    dbhandler.get_modulstatistik()
+    dbhandler.get_studentensuche()
+
+    print(tabellen_groessen(data).to_string(index=False))
+    print(objekt_groessen([student_cache.eintraege], (DBZugriff,)).head(10).to_string(index=False))
+    for bereich, wert in Speicherbudget.messen(dbhandler, student_cache).items():
+        print(f"{bereich}: {wert / 1e6:.2f} MB")
+    if args.budget is not None:
+        Speicherbudget(args.budget).pruefen(dbhandler, student_cache)
+
+    bericht = profil.schnappschuss()
+    if bericht is not None:
+        print(f"tracemalloc: aktuell {bericht['aktuell'] / 1e6:.1f} MB, Spitze {bericht['spitze'] / 1e6:.1f} MB")
+        for ort, groesse, _, anzahl in bericht["stellen"]:
+            print(f"  {ort}: {groesse / 1e3:.1f} kB in {anzahl} Blöcken")
@@ -11,7 +11,6 @@ from datetime import datetime # Für korrekte Datumsanzeige
 from dbzugriff import DBZugriff # Klasse zur Verwaltung der Datenbankzugriffe
 from modulbuchung import Modulbuchung # Import von Modulbuchungen
 import pandas as pd # Importiere pandas für die Arbeit mit DataFrames
-import matplotlib.pyplot as plt # Für Diagramme
 from studiengang import Studiengang  # Sicherstellen, dass Studiengang korrekt importiert wird
 
 class Student:
@@ -36,6 +35,36 @@ class Student:
         self.studiengang = self.load_studiengang()  # Studiengang wird immer über den DB-Handler geladen
         self.modulbuchungen = self.load_modulbuchungen()  # Modulbuchungen werden immer über den DB-Handler geladen
 
+    @classmethod
+    def aus_datenbank(cls, db_handler, student_code: str):
+        """
+        Erstellt ein Student-Objekt anhand des student_code aus den Daten des DB-Handlers.
+
+        :param db_handler: Instanz des DBZugriff für Datenbankoperationen.
+        :param student_code: Code des Studenten.
+        :return: Instanz von Student oder None, falls kein Student mit diesem Code existiert.
+        """
+        student_data = db_handler.get_student(student_code)
+        if student_data is None or student_data.empty:
+            return None
+        return cls(
+            student_code=student_code,
+            student_name=student_data['student_name'].values[0],
+            start_studium=student_data.iloc[0]["start_studium"],
+            zielnote=student_data.iloc[0]["zielnote"],
+            db_handler=db_handler
+        )
+
+    def __getstate__(self):
+        """
+        Liefert den Zustand für pickle; der DB-Handler mit allen geladenen Tabellen wird nicht mitgespeichert.
+
+        :return: Dictionary mit den Attributen des Studenten ohne db_handler.
+        """
+        state = self.__dict__.copy()
+        state["db_handler"] = None
+        return state
+
     def load_studiengang(self):
         """
         Lädt den Studiengang des Studenten.
@@ -45,8 +74,7 @@ class Student:
         student_studiengang_data = self.db_handler.get_student_studiengang(self.student_code)
         if student_studiengang_data is not None and not student_studiengang_data.empty:
             studiengang_code = student_studiengang_data.iloc[0]["studiengang_code"]
-            studiengang_data = self.db_handler.read_data().get("studiengang.csv")
-            studiengang_info = studiengang_data[studiengang_data["studiengang_code"] == studiengang_code].iloc[0]
+            studiengang_info = self.db_handler.query("studiengang.csv", where={"studiengang_code": studiengang_code}).iloc[0]
             return Studiengang(
                 studiengang_code=studiengang_info["studiengang_code"],
                 studiengang_name=studiengang_info["studiengang_name"],
@@ -65,9 +93,7 @@ class Student:
         """
         modulbuchung_data = self.db_handler.get_modulbuchung(self.student_code)
         if modulbuchung_data is not None and not modulbuchung_data.empty:
-            return [
-                Modulbuchung(**row, db_handler=self.db_handler) for _, row in modulbuchung_data.iterrows()
-            ]
+            return Modulbuchung.aus_tabelle(modulbuchung_data, db_handler=self.db_handler)
         else:
             print(f"Keine Modulbuchungen für den Studenten {self.student_code} gefunden.")
             return []
@@ -102,12 +128,14 @@ class Student:
         achieved_credits = self.calculate_total_credits()
         return required_credits - achieved_credits
 
-    def plot_combined_credits_per_semester(self):
+    def plot_combined_credits_per_semester(self, ax=None):
         """
         Erstellt ein Balkendiagramm für:
         - Gesamte Credits pro Semester.
         - Credits aus bestandenen Modulen pro Semester.
 
+        :param ax: Optionale Matplotlib-Achse, die geleert und neu gezeichnet wird (z. B. beim Studentenwechsel im Dashboard).
+                   Ohne Angabe wird eine neue Figure erstellt.
         :return: Matplotlib-Figure oder None bei Fehlern.
         """
         try:
@@ -116,60 +144,27 @@ class Student:
                 print(f"Kein Studiengang für den Studenten {self.student_code} gefunden.")
                 return None
     
-            studiengang_code = self.studiengang.studiengang_code
-    
-            # Daten für den Studiengang laden
-            studiengang_semester_data = self.db_handler.get_studiengang_semester(studiengang_code)
-            if studiengang_semester_data is None or studiengang_semester_data.empty:
-                print(f"Keine Semester für den Studiengang {studiengang_code} gefunden.")
-                return None
-    
-            semester_total_credits = {}
-            semester_completed_credits = {}
-    
-            # Abgeschlossene Modulbuchungen des Studenten laden
-            completed_modules = self.db_handler.get_completed_modules(self.student_code)
-            if completed_modules is None or completed_modules.empty:
-                print(f"Keine abgeschlossenen Module für den Studenten {self.student_code} gefunden.")
+            # Gesamte und bestandene Credits je Plansemester ermitteln
+            credits_per_semester = self.db_handler.get_credits_per_semester(self.student_code, self.studiengang.studiengang_code)
+            if credits_per_semester is None:
                 return None
     
-            # Für jedes Semester die Module laden und analysieren
-            for _, semester_row in studiengang_semester_data.iterrows():
-                semester_code = semester_row["semester_code"]
-                semester_name = self.db_handler.get_semester(semester_code).iloc[0]["semester_name"] \
-                    if not self.db_handler.get_semester(semester_code).empty else f"Semester {semester_code}"
-                
-                semester_module_data = self.db_handler.get_semester_modul(semester_code)
-                if semester_module_data is None or semester_module_data.empty:
-                    semester_total_credits[semester_name] = 0
-                    semester_completed_credits[semester_name] = 0
-                    continue
-    
-                total_credits = 0
-                completed_credits = 0
-    
-                for _, module_row in semester_module_data.iterrows():
-                    modul_code = module_row["modul_code"]
-                    modul_data = self.db_handler.get_modul(modul_code)
-                    if not modul_data.empty:
-                        credits = modul_data.iloc[0]["credits"]
-                        total_credits += credits
-                        if modul_code in completed_modules["modul_code"].values:
-                            completed_credits += credits
-    
-                semester_total_credits[semester_name] = total_credits
-                semester_completed_credits[semester_name] = completed_credits
-    
             # Daten für das Diagramm vorbereiten
-            semesters = list(semester_total_credits.keys())
-            total_credits_values = [semester_total_credits[sem] for sem in semesters]
-            completed_credits_values = [semester_completed_credits[sem] for sem in semesters]
+            semesters = list(credits_per_semester["semester_name"])
+            total_credits_values = list(credits_per_semester["gesamt_credits"])
+            completed_credits_values = list(credits_per_semester["bestandene_credits"])
     
-            # Diagramm erstellen
+            # Diagramm erstellen oder vorhandene Achse wiederverwenden
             x = range(len(semesters))
             width = 0.2  # Breite der Balken
     
-            fig, ax = plt.subplots(figsize=(6, 3))
+            if ax is None:
+                # Lokaler Import, damit Kennzahlen und Export ohne Matplotlib auskommen
+                import matplotlib.pyplot as plt # Für Diagramme
+                fig, ax = plt.subplots(figsize=(6, 3))
+            else:
+                fig = ax.figure
+                ax.clear()
             ax.bar(x, total_credits_values, width=width, label="Gesamte Credits", color='skyblue', align='center')
             ax.bar([i + width for i in x], completed_credits_values, width=width, label="Bestandene Credits", color='green', align='center')
     
@@ -180,7 +175,7 @@ class Student:
             ax.set_xticks([i + width / 2 for i in x])
             ax.set_xticklabels(semesters, rotation=45)
             ax.legend()
-            plt.tight_layout()
+            fig.tight_layout()
     
             return fig
     
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# studentcache.py
+
+# Importiere notwendige Module und Klassen
+import hashlib  # Für den Hash der Quelltabellen
+import os  # Für Dateipfade und atomares Ersetzen der Cache-Dateien
+import pickle  # Für das Speichern der Objektgraphen
+from aenderungen import Datenstand, betroffene_studenten  # Hash je Schlüssel und daraus betroffene Studenten
+from dashboarddaten import dashboard_viewmodel  # Vorberechnete Dashboard-Daten je Student
+from dbzugriff import DBZugriff  # Klasse zur Verwaltung der Datenbankzugriffe
+from student import Student  # Klasse zur Repräsentation eines Studenten
+
+# Version des Cache-Formats; bei Änderungen an den Modellklassen erhöhen
+CACHE_FORMAT = 3
+
+# Anzahl der gemerkten Datenänderungen, über die Einträge älterer Datenstände weiterverwendet werden
+VERLAUF_LAENGE = 10
+
+
+class StudentCache:
+    """
+    Festplatten-Cache für vollständig aufgebaute Student-Objekte (inklusive Studiengang und
+    Modulbuchungen), deren berechnete Kennzahlen und deren DashboardViewModel. Jeder Eintrag ist an einen Hash der
+    CSV-Quelldateien gebunden. Nach einer Datenänderung werden die Tabellen mit dem Datenstand des Caches verglichen
+    (siehe aenderungen.py); nur die Einträge der betroffenen Studenten werden neu aufgebaut.
+    """
+    def __init__(self, db_handler: DBZugriff, cache_dir: str = None):
+        """
+        Initialisiert den Cache.
+
+        :param db_handler: Instanz von DBZugriff, über die fehlende Einträge aufgebaut werden.
+        :param cache_dir: Verzeichnis der Cache-Dateien (Standard: .dashboard_cache im Datenverzeichnis).
+        """
+        self.db_handler = db_handler
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(db_handler.data_dir or "", ".dashboard_cache")
+
+        # Bereits in diesem Prozess geladene Einträge: student_code -> Eintrag
+        self.eintraege = {}
+
+        # Hash der Quelldateien und die Datenversion, zu der er berechnet wurde
+        self._quell_hash = None
+        self._quell_hash_version = None
+
+        # Quell-Hash, zu dem der Cache zuletzt abgeglichen wurde, und je früherem Quell-Hash
+        # die Studenten, deren Einträge seitdem ungültig sind
+        self._abgeglichen = None
+        self._ungueltig = {}
+
+    def quell_hash(self):
+        """
+        Berechnet den Hash über Namen und Inhalt aller CSV-Quelldateien und des Journals. Das Ergebnis wird
+        je Datenversion des DB-Handlers nur einmal berechnet.
+
+        :return: Hexadezimaler SHA-256-Hash.
+        """
+        if self._quell_hash is None or self._quell_hash_version != self.db_handler.data_version:
+            sha = hashlib.sha256(f"format={CACHE_FORMAT}".encode("utf-8"))
+            for file_path in [*self.db_handler.db_handler.file_paths, self.db_handler.journal.pfad]:
+                sha.update(file_path.encode("utf-8"))
+                try:
+                    with open(file_path, "rb") as datei:
+                        for block in iter(lambda: datei.read(1 << 20), b""):
+                            sha.update(block)
+                except FileNotFoundError:
+                    sha.update(b"<fehlt>")
+            self._quell_hash = sha.hexdigest()
+            self._quell_hash_version = self.db_handler.data_version
+        return self._quell_hash
+
+    def abgleichen(self):
+        """
+        Gleicht den Cache mit dem aktuellen Datenstand ab. Hat sich der Hash der Quelldateien seit dem letzten
+        Abgleich geändert, werden die Tabellen mit dem im Cache-Verzeichnis gespeicherten Datenstand verglichen.
+        Einträge früherer Quell-Hashes bleiben für alle Studenten gültig, die von keiner der seitdem
+        gemerkten Änderungen betroffen sind.
+
+        :return: Aktueller Quell-Hash.
+        """
+        quell_hash = self.quell_hash()
+        if self._abgeglichen == quell_hash:
+            return quell_hash
+
+        pfad = os.path.join(self.cache_dir, "datenstand.pkl")
+        stand = None
+        try:
+            with open(pfad, "rb") as datei:
+                stand = pickle.load(datei)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Datenstand des Caches unbrauchbar, alle Einträge werden neu aufgebaut: {e}")
+        if not isinstance(stand, dict) or stand.get("format") != CACHE_FORMAT:
+            stand = {"format": CACHE_FORMAT, "hash": None, "datenstand": None, "verlauf": []}
+
+        if stand["hash"] != quell_hash:
+            data = self.db_handler.read_data()
+            datenstand = Datenstand(data)
+            verlauf = []
+            if stand["datenstand"] is not None:
+                betroffene = betroffene_studenten(data, datenstand.geaenderte_schluessel(stand["datenstand"]))
+                verlauf = (stand["verlauf"] + [(stand["hash"], frozenset(betroffene))])[-VERLAUF_LAENGE:]
+            stand = {"format": CACHE_FORMAT, "hash": quell_hash, "datenstand": datenstand, "verlauf": verlauf}
+            self._speichern_datei(pfad, stand, "Datenstand des Caches")
+
+        # Von der jüngsten Änderung aus rückwärts sammeln, welche Studenten seit einem Quell-Hash betroffen sind
+        self._ungueltig = {}
+        seitdem = frozenset()
+        for alter_hash, betroffene in reversed(stand["verlauf"]):
+            seitdem = seitdem | betroffene
+            self._ungueltig[alter_hash] = seitdem
+        self._abgeglichen = quell_hash
+        return quell_hash
+
+    def _gueltig(self, eintrag: dict):
+        """
+        Prüft, ob ein Eintrag zum zuletzt abgeglichenen Datenstand passt.
+
+        :param eintrag: Der Cache-Eintrag.
+        :return: True, falls der Eintrag zum aktuellen Quell-Hash gehört oder sein Student seitdem nicht betroffen ist.
+        """
+        if eintrag.get("hash") == self._abgeglichen:
+            return True
+        ungueltig = self._ungueltig.get(eintrag.get("hash"))
+        return ungueltig is not None and eintrag.get("student_code") not in ungueltig
+
+    def _pfad(self, student_code: str):
+        """
+        Gibt den Pfad der Cache-Datei eines Studenten zurück.
+
+        :param student_code: Code des Studenten.
+        :return: Dateipfad.
+        """
+        return os.path.join(self.cache_dir, f"student_{hashlib.sha1(str(student_code).encode('utf-8')).hexdigest()}.pkl")
+
+    def _eintrag(self, student_code: str):
+        """
+        Gibt den gültigen Cache-Eintrag eines Studenten zurück und baut ihn bei Bedarf neu auf.
+
+        :param student_code: Code des Studenten.
+        :return: Dictionary mit Student-Objekt, Kennzahlen und ViewModel oder None, falls der Student nicht existiert.
+        """
+        quell_hash = self.abgleichen()
+
+        eintrag = self.eintraege.get(student_code)
+        if eintrag is not None and self._gueltig(eintrag):
+            return eintrag
+
+        # Warmstart von der Festplatte
+        try:
+            with open(self._pfad(student_code), "rb") as datei:
+                eintrag = pickle.load(datei)
+            if eintrag.get("student_code") == student_code and self._gueltig(eintrag):
+                self._anbinden(eintrag["student"])
+                self.eintraege[student_code] = eintrag
+                return eintrag
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Cache-Datei für Student {student_code} unbrauchbar, wird neu aufgebaut: {e}")
+
+        # Kaltstart: Objektgraph aus den Tabellen aufbauen und speichern
+        student = Student.aus_datenbank(self.db_handler, student_code)
+        if student is None:
+            return None
+        eintrag = {
+            "hash": quell_hash,
+            "student_code": student_code,
+            "student": student,
+            "aggregate": {
+                "total_credits": student.calculate_total_credits(),
+                "average_grade": student.calculate_average_grade(),
+                "missing_credits": student.calculate_missing_credits()
+            },
+            "viewmodel": dashboard_viewmodel(self.db_handler, student_code)
+        }
+        self._speichern(student_code, eintrag)
+        self.eintraege[student_code] = eintrag
+        return eintrag
+
+    def _anbinden(self, student: Student):
+        """
+        Verbindet einen aus dem Cache geladenen Objektgraphen wieder mit dem aktuellen DB-Handler.
+
+        :param student: Das geladene Student-Objekt.
+        """
+        student.db_handler = self.db_handler
+        for modulbuchung in student.modulbuchungen:
+            modulbuchung.db_handler = self.db_handler
+
+    def _speichern(self, student_code: str, eintrag: dict):
+        """
+        Schreibt einen Eintrag in das Cache-Verzeichnis.
+
+        :param student_code: Code des Studenten.
+        :param eintrag: Der zu speichernde Eintrag.
+        """
+        self._speichern_datei(self._pfad(student_code), eintrag, f"Cache-Datei für Student {student_code}")
+
+    def _speichern_datei(self, pfad: str, objekt, beschreibung: str):
+        """
+        Schreibt ein Objekt atomar (temporäre Datei und Umbenennen) in das Cache-Verzeichnis.
+
+        :param pfad: Zieldatei im Cache-Verzeichnis.
+        :param objekt: Das zu speichernde Objekt.
+        :param beschreibung: Bezeichnung der Datei für die Fehlermeldung.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(pfad + ".tmp", "wb") as datei:
+                pickle.dump(objekt, datei, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(pfad + ".tmp", pfad)
+        except Exception as e:
+            print(f"{beschreibung} konnte nicht geschrieben werden: {e}")
+
+    def get_student(self, student_code: str):
+        """
+        Gibt das vollständig aufgebaute Student-Objekt zurück, bevorzugt aus dem Cache.
+
+        :param student_code: Code des Studenten.
+        :return: Instanz von Student oder None, falls der Student nicht existiert.
+        """
+        eintrag = self._eintrag(student_code)
+        return eintrag["student"] if eintrag is not None else None
+
+    def get_aggregate(self, student_code: str):
+        """
+        Gibt die zwischengespeicherten Kennzahlen eines Studenten zurück.
+
+        :param student_code: Code des Studenten.
+        :return: Dictionary mit total_credits, average_grade und missing_credits oder None.
+        """
+        eintrag = self._eintrag(student_code)
+        return eintrag["aggregate"] if eintrag is not None else None
+
+    def get_viewmodel(self, student_code: str):
+        """
+        Gibt das zwischengespeicherte DashboardViewModel eines Studenten zurück.
+
+        :param student_code: Code des Studenten.
+        :return: DashboardViewModel oder None, falls der Student nicht existiert.
+        """
+        eintrag = self._eintrag(student_code)
+        return eintrag["viewmodel"] if eintrag is not None else None
+
+    def leeren(self):
+        """
+        Entfernt alle Einträge aus dem Speicher und alle Cache-Dateien (einschließlich des Datenstands) aus dem Verzeichnis.
+        """
+        self.eintraege = {}
+        self._abgeglichen = None
+        self._ungueltig = {}
+        if os.path.isdir(self.cache_dir):
+            for datei_name in os.listdir(self.cache_dir):
+                if (datei_name.startswith("student_") and datei_name.endswith(".pkl")) or datei_name == "datenstand.pkl":
+                    os.remove(os.path.join(self.cache_dir, datei_name))
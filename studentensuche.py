@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# studentensuche.py
+
+# Importiere notwendige Module und Klassen
+import unicodedata  # Für das Entfernen von Akzenten und Umlautpunkten
+import numpy as np  # Für sortierte Arrays und Binärsuche
+import pandas as pd  # Für Datenverarbeitung
+
+# Höchstes Unicode-Zeichen; begrenzt den Bereich einer Präfixsuche nach oben
+_PRAEFIX_ENDE = "\U0010ffff"
+
+
+def normalisieren(text: str):
+    """
+    Normalisiert einen Namen für die Suche: Kleinschreibung, ohne Akzente (ü -> u, ß -> ss),
+    mehrfache Leerzeichen zusammengefasst.
+
+    :param text: Der zu normalisierende Text.
+    :return: Normalisierter Text.
+    """
+    text = str(text).casefold()
+    if text.isascii():
+        # Reine ASCII-Namen enthalten keine Akzente
+        return " ".join(text.split())
+    zerlegt = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(zeichen for zeichen in zerlegt if not unicodedata.combining(zeichen)).split())
+
+
+def _trigramme(token: str):
+    """
+    Zerlegt ein Wort in Trigramme, mit Randmarkierungen für Wortanfang und -ende.
+
+    :param token: Ein normalisiertes Wort.
+    :return: Menge der Trigramme.
+    """
+    markiert = f"^{token}$"
+    return {markiert[i:i + 3] for i in range(len(markiert) - 2)}
+
+
+def _zeichen_je_eintrag(sortiert: np.ndarray):
+    """
+    Gibt die feste Länge der Einträge eines NumPy-Unicode-Arrays in Zeichen zurück.
+
+    :param sortiert: Array vom Typ str.
+    :return: Anzahl Zeichen je Eintrag.
+    """
+    return sortiert.dtype.itemsize // np.dtype("U1").itemsize
+
+
+class Studentensuche:
+    """
+    Suchindex über student.csv für die Autovervollständigung in Dashboard und Kommandozeile.
+    Studenten-Codes, normalisierte vollständige Namen und einzelne Namensbestandteile liegen in
+    sortierten Arrays, sodass eine Präfixsuche zwei Binärsuchen kostet. Für Tippfehler gibt es eine
+    unscharfe Suche über einen Trigramm-Index, der zusammen mit dem Präfixindex aufgebaut wird.
+    """
+    def __init__(self, student_data: pd.DataFrame, max_kandidaten: int = 1024):
+        """
+        Baut den Suchindex auf.
+
+        :param student_data: DataFrame aus student.csv mit den Spalten student_code und student_name.
+        :param max_kandidaten: Anzahl der ähnlichsten Wörter je Anfragewort, deren Studenten die unscharfe
+                               Suche bewertet.
+        """
+        self.max_kandidaten = max_kandidaten
+        daten = student_data[["student_code", "student_name"]].drop_duplicates("student_code")
+        self.codes = daten["student_code"].astype(str).to_numpy(dtype=str)
+        self.namen = daten["student_name"].fillna("").astype(str).to_numpy(dtype=str)
+
+        # Studenten-Codes sortiert, mit Zeilennummer je Eintrag
+        self._codes_zeile = np.argsort(self.codes, kind="stable")
+        self._codes_sortiert = self.codes[self._codes_zeile]
+
+        # Vollständige Namen und einzelne Namensbestandteile, normalisiert und sortiert
+        normalisiert = pd.Series(self.namen).map(normalisieren)
+        bestandteile = normalisiert.str.split().explode().dropna()
+        bestandteile = bestandteile[bestandteile != ""]
+        eintraege = pd.concat([normalisiert[normalisiert != ""], bestandteile])
+        reihenfolge = np.argsort(eintraege.to_numpy(dtype=str), kind="stable")
+        self._namen_sortiert = eintraege.to_numpy(dtype=str)[reihenfolge]
+        self._namen_zeile = eintraege.index.to_numpy()[reihenfolge]
+
+        # Unscharfe Suche: Wortschatz der Namensbestandteile und je Wort die Zeilen, in denen es vorkommt
+        # (CSR-Format: Abschnitt von _wort_offsets[w] bis _wort_offsets[w + 1] in _wort_zeilen)
+        self._woerter, bestandteil_wort = np.unique(bestandteile.to_numpy(dtype=str), return_inverse=True)
+        self._wort_zeilen = bestandteile.index.to_numpy()[np.argsort(bestandteil_wort, kind="stable")]
+        self._wort_offsets = np.concatenate([[0], np.cumsum(np.bincount(bestandteil_wort, minlength=len(self._woerter)))])
+        self._trigramme_aufbauen()
+
+    @staticmethod
+    def _bereich(sortiert: np.ndarray, praefix: str):
+        """
+        Ermittelt per Binärsuche den Bereich eines sortierten Arrays, dessen Einträge mit dem Präfix beginnen.
+
+        :param sortiert: Sortiertes Array von Zeichenketten.
+        :param praefix: Das gesuchte Präfix.
+        :return: Tupel (Anfang, Ende) des Bereichs.
+        """
+        # Suchwerte, die länger als die Einträge sind, würden das ganze Array in einen breiteren Typ kopieren
+        laenge = _zeichen_je_eintrag(sortiert)
+        if len(praefix) > laenge:
+            return 0, 0
+        anfang = int(np.searchsorted(sortiert, praefix, side="left"))
+        if len(praefix) == laenge:
+            return anfang, int(np.searchsorted(sortiert, praefix, side="right"))
+        return anfang, int(np.searchsorted(sortiert, praefix + _PRAEFIX_ENDE, side="left"))
+
+    def _trigramme_aufbauen(self):
+        """
+        Baut den Trigramm-Index des Wortschatzes auf: Trigramm -> Positionen in _woerter.
+        """
+        # Trigramme aller Wörter spaltenweise ausschneiden: Durchlauf i liefert das i-te Trigramm jedes
+        # Wortes, das lang genug ist (wie _trigramme, nur ohne Schleife über die Wörter)
+        markiert = "^" + pd.Series(self._woerter, dtype="str") + "$"
+        laengen = markiert.str.len().to_numpy()
+        woerter, trigramme = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=object)]
+        for i in range(int(laengen.max(initial=0)) - 2):
+            lang_genug = np.flatnonzero(laengen >= i + 3)
+            woerter.append(lang_genug)
+            trigramme.append(markiert.iloc[lang_genug].str.slice(i, i + 3).to_numpy(dtype=object))
+        codes, schluessel = pd.factorize(np.concatenate(trigramme))
+
+        # Je Wort zählt jedes Trigramm nur einmal (wie bei der Menge aus _trigramme); nach Trigramm gruppiert
+        paare = np.sort(codes * max(len(self._woerter), 1) + np.concatenate(woerter))
+        erstes = np.ones(len(paare), dtype=bool)
+        erstes[1:] = paare[1:] != paare[:-1]
+        paare = paare[erstes]
+        trigramm, wort = np.divmod(paare, max(len(self._woerter), 1))
+        self._anzahl_trigramme = np.bincount(wort, minlength=len(self._woerter))
+        vorhanden, anfaenge = np.unique(trigramm, return_index=True)
+        self._trigramm_index = dict(zip(schluessel[vorhanden].tolist(), np.split(wort, anfaenge[1:])))
+
+    def _unscharf(self, text: str, limit: int, schwelle: float):
+        """
+        Unscharfe Suche: Jedes Wort der Anfrage wird per Trigramm-Ähnlichkeit (Dice-Koeffizient) mit dem
+        Wortschatz verglichen; je Student zählt der ähnlichste Namensbestandteil, summiert über die Wörter.
+
+        :param text: Normalisierte Anfrage.
+        :param limit: Maximale Anzahl der Treffer.
+        :param schwelle: Mindestähnlichkeit je Wort (0 bis 1).
+        :return: Array von Zeilennummern, absteigend nach Ähnlichkeit.
+        """
+        if not len(self._woerter):
+            return np.empty(0, dtype=np.intp)
+
+        bewertung = np.zeros(len(self.codes))
+        for wort in text.split():
+            anfrage = _trigramme(wort)
+            postings = [self._trigramm_index[trigramm] for trigramm in anfrage if trigramm in self._trigramm_index]
+            if not postings:
+                continue
+            gemeinsam = np.bincount(np.concatenate(postings), minlength=len(self._woerter))
+            dice = 2.0 * gemeinsam / (len(anfrage) + self._anzahl_trigramme)
+
+            # Nur die ähnlichsten Wörter werden bis auf die Studenten aufgelöst
+            woerter = np.flatnonzero(dice >= schwelle)
+            if len(woerter) > self.max_kandidaten:
+                woerter = woerter[np.argpartition(-dice[woerter], self.max_kandidaten - 1)[:self.max_kandidaten]]
+            anzahl = self._wort_offsets[woerter + 1] - self._wort_offsets[woerter]
+            innerhalb = np.arange(anzahl.sum()) - np.repeat(np.cumsum(anzahl) - anzahl, anzahl)
+            zeilen = self._wort_zeilen[np.repeat(self._wort_offsets[woerter], anzahl) + innerhalb]
+
+            # Je Student zählt der ähnlichste seiner Namensbestandteile
+            beste = np.zeros(len(self.codes))
+            np.maximum.at(beste, zeilen, np.repeat(dice[woerter], anzahl))
+            bewertung += beste
+
+        kandidaten = np.flatnonzero(bewertung)
+        if len(kandidaten) > limit:
+            kandidaten = kandidaten[np.argpartition(-bewertung[kandidaten], limit - 1)[:limit]]
+        return kandidaten[np.lexsort((self.namen[kandidaten], -bewertung[kandidaten]))]
+
+    def suchen(self, text: str, limit: int = 10, unscharf: bool = True, schwelle: float = 0.4):
+        """
+        Sucht Studenten nach Code oder Name. Reihenfolge der Treffer: exakter Code, Code-Präfix,
+        Namenspräfix (vollständiger Name oder einzelner Namensbestandteil), danach unscharfe Treffer.
+
+        :param text: Die Eingabe (Code, Anfang eines Codes oder Namens).
+        :param limit: Maximale Anzahl der Treffer.
+        :param unscharf: Ob bei zu wenigen Präfixtreffern unscharf gesucht wird.
+        :param schwelle: Mindestähnlichkeit der unscharfen Suche (0 bis 1).
+        :return: Liste von Tupeln (student_code, student_name).
+        """
+        text = str(text).strip()
+        if not text or limit <= 0:
+            return []
+
+        zeilen = {}  # Zeilennummern in Trefferreihenfolge (dict als geordnete Menge)
+
+        # Code-Präfix; ein exakter Treffer steht als kleinster Eintrag am Anfang des Bereichs
+        anfang, ende = self._bereich(self._codes_sortiert, text)
+        for zeile in self._codes_zeile[anfang:min(ende, anfang + limit)]:
+            zeilen.setdefault(int(zeile))
+
+        # Namenspräfix
+        anfrage = normalisieren(text)
+        if anfrage and len(zeilen) < limit:
+            anfang, ende = self._bereich(self._namen_sortiert, anfrage)
+            for zeile in self._namen_zeile[anfang:ende]:
+                zeilen.setdefault(int(zeile))
+                if len(zeilen) >= limit:
+                    break
+
+        # Unscharfe Suche für Tippfehler
+        if unscharf and anfrage and len(zeilen) < limit:
+            for zeile in self._unscharf(anfrage, limit, schwelle):
+                zeilen.setdefault(int(zeile))
+                if len(zeilen) >= limit:
+                    break
+
+        return [(str(self.codes[zeile]), str(self.namen[zeile])) for zeile in zeilen]
+
+    def ist_code(self, text: str):
+        """
+        Prüft, ob die Eingabe exakt einem Studenten-Code entspricht.
+
+        :param text: Die Eingabe.
+        :return: True, falls ein Student mit diesem Code existiert.
+        """
+        text = str(text).strip()
+        if len(text) > _zeichen_je_eintrag(self._codes_sortiert):
+            return False
+        anfang = int(np.searchsorted(self._codes_sortiert, text, side="left"))
+        return anfang < len(self._codes_sortiert) and self._codes_sortiert[anfang] == text
@@ -8,7 +8,6 @@
 
 # Importiere notwendige Module und Klassen
 from dbzugriff import DBZugriff # Klasse zur Verwaltung der Datenbankzugriffe
-from semester import Semester # Import von Semestern
 
 class Studiengang:
     """
@@ -30,29 +29,14 @@ class Studiengang:
 
     def get_semester(self, dbzugriff: DBZugriff):
         """
-        Lädt alle Semester des Studiengangs und gibt sie als Liste von Semester-Objekten zurück.
+        Gibt alle Semester des Studiengangs als Liste von Semester-Objekten zurück.
+        Die Semester stammen aus dem gemeinsam genutzten Lehrplan des Studiengangs
+        und enthalten ihre Module bereits.
 
         :param dbzugriff: Instanz von DBZugriff, um auf die Semester-Daten zuzugreifen.
         :return: Liste von Semester-Objekten.
         """
-        semester_list = []
-        
-        # Hole die Semester-Daten für den Studiengang über DBZugriff
-        studiengang_semester_daten = dbzugriff.get_studiengang_semester(self.studiengang_code)
-        
-        if studiengang_semester_daten is not None:
-            for index, semester_info in studiengang_semester_daten.iterrows():
-                semester_code = semester_info["semester_code"]
-                semester_name = semester_info["semester_name"]
-                semester = Semester(semester_code, semester_name)
-                
-                # Lade die Module für dieses Semester
-                semester.load_moduls(dbzugriff)  # Methode zum Laden der Module für das Semester
-                
-                # Füge das Semester zur Liste hinzu
-                semester_list.append(semester)
-        
-        return semester_list
+        return list(dbzugriff.get_lehrplan(self.studiengang_code).semester)
 
     def __str__(self):
         """
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# tabellenpuffer.py
+
+# Importiere notwendige Module und Klassen
+import numpy as np  # Für die vorab reservierten Spaltenpuffer
+import pandas as pd  # Für Datenverarbeitung
+import pyarrow as pa  # Für Zeichenkettenspalten ohne Kopie der Puffer
+
+class Tabellenpuffer:
+    """
+    Spaltenweiser Speicher einer Tabelle mit vorab reservierter Kapazität. Neue Zeilen werden in die
+    freie Kapazität geschrieben, ohne die vorhandenen Zeilen zu kopieren; erst wenn sie erschöpft ist,
+    wird sie verdoppelt. Zahlen- und Datumsspalten liegen in NumPy-Arrays, Zeichenkettenspalten in den
+    Offset- und Datenpuffern eines Arrow-Arrays. tabelle() setzt daraus einen DataFrame zusammen, der
+    die Puffer ohne Kopie verwendet (Zeichenketten bleiben dabei ein einzelner Arrow-Chunk).
+    """
+    def __init__(self, tabelle: pd.DataFrame, reserve: float = 0.25):
+        """
+        Übernimmt die Zeilen einer geladenen Tabelle in die Puffer.
+
+        :param tabelle: Die geladene Tabelle (z. B. aus modulbuchung.csv).
+        :param reserve: Anteil zusätzlicher Kapazität, die für neue Zeilen reserviert wird.
+        """
+        self.laenge = len(tabelle)
+        kapazitaet = self.laenge + max(int(self.laenge * reserve), 1024)
+        self.spalten = {spalte: _spalte_anlegen(tabelle[spalte], kapazitaet) for spalte in tabelle.columns}
+
+    def anhaengen(self, neu: pd.DataFrame):
+        """
+        Hängt Zeilen an die Tabelle an (amortisiert proportional zur Anzahl der neuen Zeilen).
+
+        :param neu: DataFrame mit denselben Spalten und Datentypen wie die Tabelle.
+        """
+        for spalte, puffer in self.spalten.items():
+            puffer.anhaengen(neu[spalte], self.laenge)
+        self.laenge += len(neu)
+
+    def setzen(self, spalte: str, positionen, werte: list):
+        """
+        Überschreibt einzelne Zellen einer Spalte.
+
+        :param spalte: Name der Spalte.
+        :param positionen: Zeilenpositionen (ohne Duplikate).
+        :param werte: Neue Werte in der Reihenfolge der Positionen.
+        """
+        self.spalten[spalte].setzen(np.asarray(positionen, dtype=np.intp), werte, self.laenge)
+
+    def tabelle(self):
+        """
+        Gibt den aktuellen Stand als DataFrame zurück, ohne die Puffer zu kopieren.
+        Der DataFrame ist nur lesend zu verwenden; spätere Änderungen über setzen sind darin sichtbar.
+
+        :return: Pandas DataFrame mit fortlaufendem Index.
+        """
+        return pd.DataFrame({spalte: puffer.array(self.laenge) for spalte, puffer in self.spalten.items()}, copy=False)
+
+
+def _spalte_anlegen(array, kapazitaet: int):
+    """
+    Wählt den Puffer passend zum Datentyp einer Spalte.
+
+    :param array: Die Werte der Spalte als pandas-Array oder Series.
+    :param kapazitaet: Anfangskapazität in Zeilen.
+    :return: Der Spaltenpuffer.
+    """
+    if isinstance(array.dtype, pd.StringDtype) and array.dtype.storage == "pyarrow":
+        return _Zeichenkettenspalte(array, kapazitaet)
+    if isinstance(array.dtype, np.dtype):
+        return _NumPySpalte(array, kapazitaet)
+    return _Erweiterungsspalte(array)
+
+
+def _kapazitaet(aktuell: int, benoetigt: int):
+    """
+    Berechnet die neue Kapazität eines Puffers (mindestens Verdopplung).
+
+    :param aktuell: Bisherige Kapazität.
+    :param benoetigt: Mindestens benötigte Kapazität.
+    :return: Neue Kapazität.
+    """
+    return max(2 * aktuell, benoetigt)
+
+
+class _NumPySpalte:
+    """
+    Spalte mit NumPy-Datentyp (Zahlen, Wahrheitswerte, Datumswerte) in einem vorab reservierten Array.
+    """
+    def __init__(self, array, kapazitaet: int):
+        self.dtype = array.dtype
+        werte = np.asarray(array)
+        self.werte = np.empty(max(kapazitaet, len(werte)), dtype=werte.dtype)
+        self.werte[:len(werte)] = werte
+
+    def anhaengen(self, array, laenge: int):
+        neu = np.asarray(array)
+        ende = laenge + len(neu)
+        if ende > len(self.werte):
+            werte = np.empty(_kapazitaet(len(self.werte), ende), dtype=self.werte.dtype)
+            werte[:laenge] = self.werte[:laenge]
+            self.werte = werte
+        self.werte[laenge:ende] = neu
+
+    def setzen(self, positionen, werte: list, laenge: int):
+        self.werte[positionen] = np.asarray(pd.array(werte, dtype=self.dtype))
+
+    def array(self, laenge: int):
+        return self.werte[:laenge]
+
+
+class _Zeichenkettenspalte:
+    """
+    Zeichenkettenspalte als Offset-, Daten- und Gültigkeitspuffer eines Arrow-Arrays (large_string).
+    Angehängte Zeichenketten werden hinter die bisherigen Bytes geschrieben. Geänderte Zellen verschieben
+    die folgenden Bytes; dafür werden neue Puffer angelegt, damit zuvor ausgegebene Arrays gültig bleiben.
+    """
+    def __init__(self, array, kapazitaet: int):
+        self.dtype = array.dtype
+        offsets, daten, gueltig = self._puffer(array)
+        laenge = len(gueltig)
+        self.offsets = np.zeros(max(kapazitaet, laenge) + 1, dtype=np.int64)
+        self.offsets[:laenge + 1] = offsets
+        self.daten = np.empty(max(len(daten) * kapazitaet // max(laenge, 1), len(daten), 1024), dtype=np.uint8)
+        self.daten[:len(daten)] = daten
+        self.gueltig = np.ones(len(self.offsets) - 1, dtype=bool)
+        self.gueltig[:laenge] = gueltig
+        self.fehlend = laenge - int(np.count_nonzero(gueltig))
+
+    @staticmethod
+    def _puffer(werte):
+        """
+        Zerlegt Zeichenketten in Offsets (beginnend bei 0), Bytes und Gültigkeit.
+
+        :param werte: pandas-Array oder Liste von Zeichenketten (fehlende Werte als None oder NaN).
+        :return: Tupel (Offsets, Bytes, Gültigkeit) als NumPy-Arrays.
+        """
+        if isinstance(werte, list):
+            werte = pa.array(werte, type=pa.large_string(), from_pandas=True)
+        else:
+            werte = pa.array(werte)
+            if isinstance(werte, pa.ChunkedArray):
+                werte = werte.combine_chunks()
+            werte = werte.cast(pa.large_string())
+        _, offset_puffer, daten_puffer = werte.buffers()
+        offsets = np.frombuffer(offset_puffer, dtype=np.int64)[werte.offset:werte.offset + len(werte) + 1] \
+            if offset_puffer is not None else np.zeros(len(werte) + 1, dtype=np.int64)
+        daten = np.frombuffer(daten_puffer, dtype=np.uint8)[offsets[0]:offsets[-1]] \
+            if daten_puffer is not None else np.empty(0, dtype=np.uint8)
+        gueltig = werte.is_valid().to_numpy(zero_copy_only=False)
+        return offsets - offsets[0], daten, gueltig
+
+    def _reservieren(self, zeilen: int, bytes_anzahl: int, laenge: int):
+        """
+        Vergrößert die Puffer, falls die reservierte Kapazität nicht ausreicht.
+
+        :param zeilen: Benötigte Anzahl Zeilen.
+        :param bytes_anzahl: Benötigte Anzahl Bytes.
+        :param laenge: Anzahl der belegten Zeilen.
+        """
+        if zeilen + 1 > len(self.offsets):
+            offsets = np.zeros(_kapazitaet(len(self.offsets), zeilen + 1), dtype=np.int64)
+            offsets[:laenge + 1] = self.offsets[:laenge + 1]
+            self.offsets = offsets
+            gueltig = np.ones(len(offsets) - 1, dtype=bool)
+            gueltig[:laenge] = self.gueltig[:laenge]
+            self.gueltig = gueltig
+        if bytes_anzahl > len(self.daten):
+            daten = np.empty(_kapazitaet(len(self.daten), bytes_anzahl), dtype=np.uint8)
+            daten[:self.offsets[laenge]] = self.daten[:self.offsets[laenge]]
+            self.daten = daten
+
+    def anhaengen(self, array, laenge: int):
+        offsets, daten, gueltig = self._puffer(array)
+        ende = laenge + len(gueltig)
+        beginn = int(self.offsets[laenge])
+        self._reservieren(ende, beginn + len(daten), laenge)
+        self.offsets[laenge + 1:ende + 1] = beginn + offsets[1:]
+        self.daten[beginn:beginn + len(daten)] = daten
+        self.gueltig[laenge:ende] = gueltig
+        self.fehlend += len(gueltig) - int(np.count_nonzero(gueltig))
+
+    def setzen(self, positionen, werte: list, laenge: int):
+        reihenfolge = np.argsort(positionen, kind="stable")
+        positionen = positionen[reihenfolge]
+        neue_offsets, neue_daten, neue_gueltig = self._puffer([werte[i] for i in reihenfolge])
+
+        # Verschiebung der Offsets hinter jeder geänderten Zelle
+        differenz = np.zeros(laenge + 1, dtype=np.int64)
+        differenz[positionen + 1] = np.diff(neue_offsets) - (self.offsets[positionen + 1] - self.offsets[positionen])
+        offsets = np.zeros(len(self.offsets), dtype=np.int64)
+        offsets[:laenge + 1] = self.offsets[:laenge + 1] + np.cumsum(differenz)
+        daten = np.empty(max(len(self.daten), int(offsets[laenge])), dtype=np.uint8)
+
+        # Unveränderte Abschnitte und neue Werte abwechselnd in die neuen Puffer kopieren
+        zeile = 0
+        for i, position in enumerate(positionen):
+            daten[offsets[zeile]:offsets[position]] = self.daten[self.offsets[zeile]:self.offsets[position]]
+            daten[offsets[position]:offsets[position + 1]] = neue_daten[neue_offsets[i]:neue_offsets[i + 1]]
+            zeile = position + 1
+        daten[offsets[zeile]:offsets[laenge]] = self.daten[self.offsets[zeile]:self.offsets[laenge]]
+
+        self.fehlend += int(np.count_nonzero(self.gueltig[positionen])) - int(np.count_nonzero(neue_gueltig))
+        self.gueltig[positionen] = neue_gueltig
+        self.offsets, self.daten = offsets, daten
+
+    def array(self, laenge: int):
+        gueltig = pa.py_buffer(np.packbits(self.gueltig[:laenge], bitorder="little")) if self.fehlend else None
+        werte = pa.LargeStringArray.from_buffers(
+            laenge, pa.py_buffer(self.offsets[:laenge + 1]), pa.py_buffer(self.daten[:self.offsets[laenge]]),
+            gueltig, self.fehlend
+        )
+        return pd.array(werte, dtype=self.dtype)
+
+
+class _Erweiterungsspalte:
+    """
+    Spalte mit einem sonstigen pandas-Datentyp; neue Zeilen werden angehängt, indem das Array kopiert wird.
+    """
+    def __init__(self, array):
+        self.werte = array.array
+
+    def anhaengen(self, array, laenge: int):
+        self.werte = type(self.werte)._concat_same_type([self.werte[:laenge], array.array])
+
+    def setzen(self, positionen, werte: list, laenge: int):
+        self.werte = self.werte.copy()
+        self.werte[positionen] = werte
+
+    def array(self, laenge: int):
+        return self.werte[:laenge]
@@ -0,0 +1,7 @@
+# conftest.py
+
+# Die Module des Dashboards liegen im Wurzelverzeichnis des Repositorys
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
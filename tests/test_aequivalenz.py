@@ -0,0 +1,78 @@
+# test_aequivalenz.py
+
+# Äquivalenz- und Laufzeittests der optimierten Datenpfade gegen die Referenz (siehe aequivalenz.py)
+import contextlib
+import io
+import numpy as np
+import pytest
+from aequivalenz import (Referenz, UNBEKANNTER_STUDENT, datensatz_erzeugen, export_pruefen,
+                         journal_nachspielen_pruefen, schreibvorgaenge_ausfuehren, student_codes_ziehen,
+                         tabellen_vergleichen, vergleichen, zu_langsam)
+from dbzugriff import DBZugriff
+
+# Geforderte Beschleunigung je Abfrage
+MINDESTFAKTOR = 1.0
+
+
+@pytest.fixture(params=[0, 1], ids=lambda seed: f"seed_{seed}")
+def datenbestand(request, tmp_path):
+    """
+    Erzeugt einen zufälligen Datenbestand und lädt ihn über DBZugriff.
+
+    :return: Tupel (Verzeichnis, eingelesene Referenztabellen, DBZugriff, Seed).
+    """
+    verzeichnis = str(tmp_path / f"seed_{request.param}")
+    datensatz_erzeugen(verzeichnis, 60, request.param)
+    tabellen = tabellen_vergleichen(verzeichnis)
+    assert tabellen["abweichungen"] == {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        dbhandler = DBZugriff(verzeichnis)
+        dbhandler.read_data()
+    return verzeichnis, tabellen["referenz"], dbhandler, request.param
+
+
+def _abweichungen(ergebnisse):
+    return {eintrag["abfrage"]: eintrag["beispiele"] for eintrag in ergebnisse if eintrag["abweichungen"]}
+
+
+def test_abfragen_gleich_und_schneller(datenbestand):
+    _, referenz_tabellen, dbhandler, _ = datenbestand
+    ergebnisse = vergleichen(Referenz(referenz_tabellen), dbhandler)
+    assert _abweichungen(ergebnisse) == {}
+    assert zu_langsam(ergebnisse, MINDESTFAKTOR) == []
+
+
+def test_abfragen_nach_schreibvorgaengen(datenbestand):
+    _, _, dbhandler, seed = datenbestand
+    schreibvorgaenge_ausfuehren(dbhandler, 50, seed)
+    referenz = Referenz({file_name: data.copy() for file_name, data in dbhandler.read_data().items()})
+    ergebnisse = vergleichen(referenz, dbhandler)
+    assert _abweichungen(ergebnisse) == {}
+    assert zu_langsam(ergebnisse, MINDESTFAKTOR) == []
+
+
+def test_journal_nach_unterbrochener_kompaktierung(datenbestand):
+    verzeichnis = datenbestand[0]
+    assert journal_nachspielen_pruefen(verzeichnis) is None
+
+
+def test_export_json_zeilen(datenbestand):
+    verzeichnis = datenbestand[0]
+    anzahl_zeilen, beanstandungen = export_pruefen(verzeichnis)
+    assert beanstandungen == []
+    assert anzahl_zeilen == 60
+
+
+def test_student_codes_fuer_grosse_bestaende():
+    codes = student_codes_ziehen(np.random.default_rng(0), 150000)
+    assert len(set(codes)) == 150000
+    assert UNBEKANNTER_STUDENT not in codes
+
+
+def test_zu_langsam():
+    ergebnisse = [
+        {"abfrage": "schnell", "zeit_referenz": 1.0, "zeit_optimiert": 0.1},
+        {"abfrage": "langsam", "zeit_referenz": 0.1, "zeit_optimiert": 1.0},
+        {"abfrage": "kurz", "zeit_referenz": 0.001, "zeit_optimiert": 0.01},
+    ]
+    assert zu_langsam(ergebnisse, 1.0) == [("langsam", pytest.approx(0.1))]